@@ -0,0 +1,329 @@
+# This module runs analyses non-interactively from a job file (JSON or TOML).
+# For every input file it works out which columns the requested analyses need, parses the file once,
+# runs all of them over the shared in-memory columns and returns machine-readable results.
+#
+# Example job file (JSON):
+# {
+#   "jobs": [
+#     {
+#       "file": "input_data.csv",
+#       "descriptive": {"columns": ["Math Score"], "statistics": ["mean", "median", "std"]},
+#       "group_by": {"by": "Gender", "columns": ["Math Score", "English Score"]},
+#       "correlations": [["Math Score", "English Score"], {"columns": "*", "method": "spearman"}],
+#       "tests": [
+#         {"type": "one_sample", "column": "Math Score", "popmean": 70},
+#         {"type": "welch", "columns": ["Math Score", "English Score"]},
+#         {"type": "paired", "columns": ["Math Score", "English Score"]},
+#         {"type": "chi_square", "column": "Gender", "expected": {"M": 0.5, "F": 0.5}},
+#         {"type": "chi_square", "columns": ["Gender", "Passed"]},
+#         {"type": "bootstrap", "column": "Math Score", "method": "median", "seed": 1},
+#         {"type": "permutation", "columns": ["Math Score", "English Score"], "method": "correlation"},
+#         {"type": "t_tests", "test": "welch", "columns": "*", "group_column": "Gender", "correction": "bh"}
+#       ],
+#       "report": {"path": "reports/input_data.txt", "format": "text"}
+#     }
+#   ]
+# }
+# Relative file and report paths are resolved against the directory of the job file.
+# "report" may also be just a path; the format then follows its extension (.txt, .json, .npz).
+
+import json
+import math
+import os
+
+STATISTICS = {
+    "count": lambda s: s.moments.count,
+    "mean": lambda s: s.mean(),
+    "median": lambda s: s.median(),
+    "mode": lambda s: s.mode(),
+    "std": lambda s: s.standard_deviation(),
+    "variance": lambda s: s.variance(),
+    "skewness": lambda s: s.skewness(),
+    "kurtosis": lambda s: s.kurtosis(),
+    "min": lambda s: s.moments.minimum,
+    "max": lambda s: s.moments.maximum,
+    "q1": lambda s: s.quantile(0.25),
+    "q3": lambda s: s.quantile(0.75),
+    "iqr": lambda s: s.iqr(),
+}
+
+TEST_TYPES = ("one_sample", "welch", "paired", "chi_square", "t_tests", "bootstrap", "permutation")
+
+def load_job_spec(path):
+    """
+    Reads a job file. Files ending in .toml are parsed as TOML, everything else as JSON.
+    """
+    if path.endswith(".toml"):
+        import tomllib
+        with open(path, "rb") as f:
+            spec = tomllib.load(f)
+    else:
+        with open(path) as f:
+            spec = json.load(f)
+
+    if isinstance(spec, dict) and "jobs" not in spec and "file" in spec:
+        spec = {"jobs": [spec]}
+    if not isinstance(spec, dict) or not isinstance(spec.get("jobs"), list):
+        raise ValueError("Job file must contain a list of jobs under 'jobs'.")
+    base = os.path.dirname(os.path.abspath(path))
+    for job in spec["jobs"]:
+        if "file" not in job:
+            raise ValueError("Every job needs a 'file'.")
+        job["file"] = os.path.join(base, job["file"])
+        if "report" in job:
+            job["report"] = _report_target(job["report"], base)
+    return spec
+
+def _report_target(target, base):
+    """
+    Normalizes a job's "report" entry to {"path": absolute path, "format": name or None}.
+    """
+    from report_writer import FORMATS
+
+    if isinstance(target, str):
+        target = {"path": target}
+    if not isinstance(target, dict) or not isinstance(target.get("path"), str):
+        raise ValueError("A job's 'report' must be a path or {\"path\": ..., \"format\": ...}.")
+    if target.get("format") not in (None,) + FORMATS:
+        raise ValueError(f"Unknown report format '{target['format']}'; use one of {', '.join(FORMATS)}.")
+    return {"path": os.path.join(base, target["path"]), "format": target.get("format")}
+
+def plan_columns(job, header):
+    """
+    Returns (numeric_columns, text_columns) needed by all analyses of one job,
+    so the file can be parsed a single time. "*" stands for every column.
+    A column needed both ways is only kept as text; numeric analyses parse it from there.
+    """
+    numeric, text = [], []
+
+    def need(names, into):
+        for name in (header if names == "*" else names):
+            if name not in into:
+                into.append(name)
+
+    descriptive = job.get("descriptive")
+    if descriptive:
+        need(descriptive if isinstance(descriptive, (list, str)) else descriptive.get("columns", "*"), numeric)
+    group_by = job.get("group_by")
+    if group_by:
+        need([name for name in (header if group_by.get("columns", "*") == "*" else group_by["columns"])
+              if name != group_by["by"]], numeric)
+        need([group_by["by"]], text)
+    for item in job.get("correlations", []):
+        need(item if isinstance(item, list) else item.get("columns", "*"), numeric)
+    for test in job.get("tests", []):
+        if test.get("type") not in TEST_TYPES:
+            raise ValueError(f"Unknown test type '{test.get('type')}'.")
+        names = test["columns"] if "columns" in test else [test["column"]]
+        if test["type"] == "t_tests":
+            if names == "*":
+                names = [name for name in header if name not in (test.get("group_column"), test.get("against"))]
+            need([test["against"]] if test.get("against") else [], numeric)
+            need([test["group_column"]] if test.get("group_column") else [], text)
+        need(names, text if test["type"] == "chi_square" else numeric)
+    return [name for name in numeric if name not in text], text
+
+def run_job(job, cache=None):
+    """
+    Runs every analysis of one job over a single parse of its file.
+    Failures of individual analyses are recorded under "errors" instead of aborting the job.
+    """
+    from file_handler import CSVReader
+
+    filepath = job["file"]
+    header = CSVReader.read_header(filepath)
+    numeric, text = plan_columns(job, header)
+    if cache is not None and not text:
+        data = cache.load_columns(filepath, numeric)
+    else:
+        data = CSVReader.load_columns(filepath, numeric, text_columns=text)
+    return run_analyses(job, header, data)
+
+def run_analyses(job, header, data):
+    """
+    Runs the analyses of one job over columns that are already loaded
+    (data as returned by CSVReader.load_columns() for plan_columns(job, header)).
+    """
+    filepath = job["file"]
+    result = {"file": filepath, "descriptive": {}, "correlations": [], "tests": [], "errors": []}
+    if job.get("descriptive"):
+        _run_descriptive(job["descriptive"], header, data, result)
+    if job.get("group_by"):
+        _run_group_by(job["group_by"], header, data, result)
+    for item in job.get("correlations", []):
+        _run_correlation(item, header, data, result)
+    for test in job.get("tests", []):
+        _run_test(test, data, result)
+    return result
+
+def run_job_spec(spec, cache=None):
+    """
+    Runs all jobs and returns {"results": [...], "ok": bool}.
+    """
+    results = []
+    for job in spec["jobs"]:
+        try:
+            result = run_job(job, cache)
+        except Exception as e:
+            result = {"file": job.get("file"), "errors": [str(e)]}
+        if job.get("report"):
+            _write_job_report(job["report"], result)
+        results.append(result)
+    ok = not any(r["errors"] for r in results)
+    return to_jsonable({"results": results, "ok": ok})
+
+def _write_job_report(target, result):
+    """
+    Writes the job's report target from its result; the path written is recorded under "report".
+    """
+    from report_writer import Report, write_report
+
+    try:
+        result["report"] = write_report(Report.from_batch_result(to_jsonable(result)), target["path"],
+                                        target.get("format"))
+    except Exception as e:
+        result["errors"].append(f"report {target['path']}: {e}")
+
+def _run_descriptive(spec, header, data, result):
+    from file_handler import CSVReader
+    from stats_module import StatisticsCalculator
+
+    if isinstance(spec, dict):
+        columns, names = spec.get("columns", "*"), spec.get("statistics", list(STATISTICS))
+    else:
+        columns, names = spec, list(STATISTICS)
+    unknown = [name for name in names if name not in STATISTICS]
+    if unknown:
+        result["errors"].append(f"Unknown statistics: {', '.join(unknown)}")
+        names = [name for name in names if name in STATISTICS]
+
+    for column in (header if columns == "*" else columns):
+        values, valid = CSVReader.as_numeric(data[column])
+        if not valid.any():
+            if columns != "*":
+                result["errors"].append(f"Column '{column}' has no numeric data.")
+            continue
+        stats = StatisticsCalculator(values[valid].tolist())
+        row = {}
+        for name in names:
+            try:
+                row[name] = STATISTICS[name](stats)
+            except (ValueError, ZeroDivisionError) as e:
+                row[name] = None
+                result["errors"].append(f"{column}.{name}: {e}")
+        result["descriptive"][column] = row
+
+def _run_group_by(spec, header, data, result):
+    from file_handler import CSVReader
+    from groupby_module import describe_groups
+
+    try:
+        columns = spec.get("columns", "*")
+        if columns == "*":
+            columns = [name for name in header
+                       if name != spec["by"] and CSVReader.as_numeric(data[name])[1].any()]
+        grouped = describe_groups(data, spec["by"], columns, spec.get("quantiles", True))
+        result["group_by"] = dict(grouped, by=spec["by"])
+    except Exception as e:
+        result["errors"].append(f"group_by {spec.get('by')}: {e}")
+
+def _run_correlation(spec, header, data, result):
+    from correlation_module import CorrelationAnalyzer, CorrelationMatrix
+    from file_handler import CSVReader
+
+    try:
+        if isinstance(spec, list) and len(spec) == 2:
+            value = CorrelationAnalyzer(data, spec[0], spec[1]).pearson_correlation()
+            result["correlations"].append({"columns": spec, "method": "pearson", "value": value})
+            return
+        columns = spec if isinstance(spec, list) else spec.get("columns", "*")
+        method = "pearson" if isinstance(spec, list) else spec.get("method", "pearson")
+        if columns == "*":
+            columns = [name for name in header if CSVReader.as_numeric(data[name])[1].any()]
+        values = CorrelationMatrix(data, columns).correlation(method)
+        result["correlations"].append({"columns": columns, "method": method, "matrix": values.tolist()})
+    except Exception as e:
+        result["errors"].append(f"correlation {spec}: {e}")
+
+def _run_test(spec, data, result):
+    from hypothesis_module import HypothesisTester
+
+    tester = HypothesisTester(data)
+    kind = spec["type"]
+    try:
+        if kind == "one_sample":
+            stat, p = tester.one_sample_t_test(spec["column"], popmean=spec.get("popmean", 0))
+        elif kind == "welch":
+            stat, p = tester.two_sample_t_test(*spec["columns"])
+        elif kind == "paired":
+            stat, p = tester.paired_t_test(*spec["columns"])
+        elif kind == "t_tests":
+            columns = spec["columns"]
+            if columns == "*":
+                skip = (spec.get("group_column"), spec.get("against"))
+                columns = [name for name in data if name not in skip
+                           and not isinstance(data[name], list) and data[name][1].any()]
+            rows = tester.batch_t_tests(
+                columns, test=spec.get("test", "one_sample"), popmean=spec.get("popmean", 0),
+                against=spec.get("against"), group_column=spec.get("group_column"),
+                groups=spec.get("groups"), correction=spec.get("correction", "bh"),
+                alpha=spec.get("alpha", 0.05))
+            result["tests"].append(dict(spec, columns=columns, results=rows))
+            return
+        elif kind in ("bootstrap", "permutation"):
+            result["tests"].append(dict(spec, **_run_resampling(spec, data)))
+            return
+        elif "columns" in spec:
+            stat, p, dof = tester.chi_square_independence(tuple(spec["columns"]))
+            result["tests"].append(dict(spec, statistic=stat, p_value=p, dof=dof))
+            return
+        else:
+            table = tester.contingency_table(spec["column"])
+            stat, p = tester.chi_square_test(table, spec.get("expected"))
+        result["tests"].append(dict(spec, statistic=stat, p_value=p))
+    except Exception as e:
+        result["errors"].append(f"{kind} test: {e}")
+
+def _run_resampling(spec, data):
+    import resampling_module
+
+    options = {"resamples": spec.get("resamples", resampling_module.DEFAULT_RESAMPLES), "seed": spec.get("seed")}
+    method = spec.get("method", "mean")
+    if spec["type"] == "bootstrap":
+        confidence = spec.get("confidence", 0.95)
+        if method == "correlation":
+            x, y = (data[name] for name in spec["columns"])
+            return resampling_module.bootstrap_correlation_ci(x, y, confidence=confidence, **options)
+        return resampling_module.bootstrap_ci(data[spec["column"]], method, confidence=confidence, **options)
+
+    x, y = (data[name] for name in spec["columns"])
+    options["alternative"] = spec.get("alternative", "two-sided")
+    if method == "correlation":
+        stat, p = resampling_module.permutation_correlation_test(x, y, **options)
+    else:
+        stat, p = resampling_module.permutation_test(x, y, **options)
+    return {"statistic": stat, "p_value": p}
+
+def to_jsonable(value):
+    """
+    Converts NumPy scalars/arrays to plain Python and NaN/inf to None for strict JSON.
+    """
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if hasattr(value, "tolist"):
+        return to_jsonable(value.tolist())
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+# What This File Covers
+# Function	Use
+# load_job_spec()	Reads a JSON/TOML job file and resolves file paths
+# plan_columns()	Collects the numeric and text columns every analysis of a job needs
+# run_job()	Parses the file once and runs descriptive stats, group-by, correlations and tests over it
+# run_analyses()	Runs a job's analyses over already loaded columns (used by the warm server)
+# run_job_spec()	Runs all jobs, writes their "report" targets and returns JSON-ready results
+# to_jsonable()	Makes results safe for json.dumps (no NumPy types, no NaN)
@@ -0,0 +1,328 @@
+# This file benchmarks the calculator. It is a script, not a unit test; run it from this folder:
+#   python benchmark.py startup            -> import cost of each module and CLI start-up time
+#   python benchmark.py startup --json out.json
+#   python benchmark.py run --rows 1000 100000 --json current.json
+#                                          -> time and peak memory of loaders, statistics and tests
+#   python benchmark.py run --baseline benchmarks/baseline.json --threshold 0.25
+#   python benchmark.py compare current.json [benchmarks/baseline.json]
+#   python benchmark.py generate data.csv --rows 100000000 --shape wide --dirty 0.05
+# Start-up matters because the tool is called thousands of times from scripts, so heavy
+# dependencies (SciPy, NumPy) must only be imported when an analysis actually needs them.
+# Synthetic CSVs are written in chunks, so even 10^8-row files can be generated; the
+# list-based loaders (load_csv_as_dict) need several GB of RAM at that size.
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Committed reference run (`run --rows 1000 100000 --json benchmarks/baseline.json`); regenerate it
+# on the CI machine when the hardware changes, since timings are only comparable on one machine.
+DEFAULT_BASELINE = os.path.join(HERE, "benchmarks", "baseline.json")
+
+STARTUP_MODULES = [
+    "cli_calculator",
+    "file_handler",
+    "stats_module",
+    "correlation_module",
+    "hypothesis_module",
+    "report_writer",
+]
+
+# Modules that must not be loaded just by importing the given module.
+FORBIDDEN_AT_IMPORT = {
+    "cli_calculator": ["numpy", "scipy"],
+    "stats_module": ["numpy", "scipy"],
+    "correlation_module": ["scipy"],
+    "hypothesis_module": ["scipy"],
+}
+
+def import_time(module, repeat=5):
+    """
+    Runs `python -X importtime -c "import module"` in fresh interpreters and returns
+    the median cumulative import time of the module in milliseconds, plus the
+    heavy packages that got imported along the way.
+    """
+    samples = []
+    loaded = set()
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=HERE, capture_output=True, text=True, check=True)
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            _, cumulative, name = [part.strip() for part in line[len("import time:"):].split("|")]
+            if name == module:
+                samples.append(int(cumulative) / 1000)
+            if name in ("numpy", "scipy", "scipy.stats"):
+                loaded.add(name)
+    return statistics.median(samples), sorted(loaded)
+
+def cli_help_time(repeat=5):
+    """
+    Median wall time in milliseconds of `python cli_calculator.py --help`.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "cli_calculator.py", "--help"],
+                       cwd=HERE, capture_output=True, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def run_startup(repeat=5):
+    results = {"imports": {}, "cli_help_ms": cli_help_time(repeat), "violations": []}
+    for module in STARTUP_MODULES:
+        ms, loaded = import_time(module, repeat)
+        results["imports"][module] = {"cumulative_ms": round(ms, 2), "heavy_imports": loaded}
+        for package in FORBIDDEN_AT_IMPORT.get(module, []):
+            if package in loaded:
+                results["violations"].append(f"importing {module} loads {package}")
+    return results
+
+def print_startup(results):
+    print(f"{'Module':<22}{'Import (ms)':>12}  Heavy imports")
+    for module, row in results["imports"].items():
+        print(f"{module:<22}{row['cumulative_ms']:>12.1f}  {', '.join(row['heavy_imports']) or '-'}")
+    print(f"\ncli_calculator.py --help: {results['cli_help_ms']:.1f} ms")
+    for violation in results["violations"]:
+        print(f"WARNING: {violation}")
+
+# Dataset shapes: number of numeric columns. Every dataset also has a "group" column with
+# `categories` levels and a two-level "label" column for the categorical tests.
+SHAPES = {"narrow": 3, "wide": 50}
+
+def generate_csv(path, rows, shape="narrow", dirty=0.0, categories=5, seed=0, chunk_rows=1_000_000):
+    """
+    Writes a synthetic CSV chunk by chunk: normally distributed numeric columns x0..xN
+    (x1 correlated with x0), a categorical "group" and a two-level "label".
+    dirty is the fraction of numeric cells replaced by blanks or non-numeric junk.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    width = SHAPES[shape]
+    with open(path, "w") as f:
+        f.write(",".join([f"x{i}" for i in range(width)] + ["group", "label"]) + "\n")
+        for start in range(0, rows, chunk_rows):
+            n = min(chunk_rows, rows - start)
+            values = rng.normal(50, 10, (n, width))
+            if width > 1:
+                values[:, 1] = 0.6 * values[:, 0] + rng.normal(20, 8, n)
+            cells = np.char.mod("%.3f", np.round(values, 3))
+            if dirty:
+                junk = rng.random((n, width)) < dirty
+                cells[junk] = rng.choice(np.array(["", "n/a", "?"], dtype=cells.dtype), junk.sum())
+            group = np.char.add("g", rng.integers(0, categories, n).astype(str))
+            label = np.where(rng.random(n) < 0.5, "A", "B")
+            table = np.column_stack([cells, group, label])
+            f.write("\n".join(",".join(row) for row in table.tolist()) + "\n")
+    return path
+
+def dataset_path(data_dir, rows, shape, dirty):
+    """
+    Generated files are kept in data_dir and reused by later runs.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"{shape}_{rows}_{dirty:g}.csv")
+    if not os.path.exists(path):
+        generate_csv(path + ".tmp", rows, shape, dirty)
+        os.replace(path + ".tmp", path)
+    return path
+
+def measure(run, setup=None, repeat=3):
+    """
+    Median wall time of run(setup()) over `repeat` calls (setup is not timed) and the
+    peak traced memory of one extra call. NumPy reports its buffers to tracemalloc,
+    so array allocations are included. One untimed warm-up call comes first, so lazy
+    imports (SciPy on the first test) are not counted as the operation's cost.
+    """
+    run(setup() if setup else None)
+    samples = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        run(state)
+        samples.append(time.perf_counter() - start)
+    state = setup() if setup else None
+    tracemalloc.start()
+    try:
+        run(state)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": statistics.median(samples), "peak_bytes": peak}
+
+STATISTICS_METHODS = ["mean", "median", "mode", "standard_deviation", "variance", "skewness",
+                      "kurtosis", "iqr", "frequency_distribution", "text_histogram", "summary"]
+
+def benchmark_cases(path):
+    """
+    Yields (name, run, setup) for every benchmarked operation on one dataset.
+    """
+    from correlation_module import CorrelationAnalyzer
+    from file_handler import CSVReader
+    from hypothesis_module import HypothesisTester
+    from stats_module import StatisticsCalculator
+
+    data = CSVReader.load_columns(path, ["x0", "x1"], text_columns=["group", "label"])
+    values, valid = data["x0"]
+    column = values[valid].tolist()
+    numeric = [name for name in CSVReader.read_header(path) if name.startswith("x")]
+
+    yield "CSVReader.load_csv", lambda _: CSVReader.load_csv(path), None
+    yield "CSVReader.load_csv_as_dict", lambda _: CSVReader.load_csv_as_dict(path), None
+    yield "CSVReader.load_columns", lambda _: CSVReader.load_columns(path), None
+    yield "StatisticsCalculator.__init__", lambda _: StatisticsCalculator(column), None
+    for method in STATISTICS_METHODS:
+        # A fresh calculator per call, so memoized results never hide the real cost
+        yield (f"StatisticsCalculator.{method}", lambda stats, m=method: getattr(stats, m)(),
+               lambda: StatisticsCalculator(column))
+    yield "CorrelationAnalyzer.pearson_correlation", \
+        lambda _: CorrelationAnalyzer(data, "x0", "x1").pearson_correlation(), None
+
+    tester = HypothesisTester(data)
+    yield "HypothesisTester.one_sample_t_test", lambda _: tester.one_sample_t_test("x0", 50), None
+    yield "HypothesisTester.two_sample_t_test", lambda _: tester.two_sample_t_test("x0", "x1"), None
+    yield "HypothesisTester.paired_t_test", lambda _: tester.paired_t_test("x0", "x1"), None
+    yield "HypothesisTester.chi_square_test", \
+        lambda _: tester.chi_square_test(tester.contingency_table("group")), None
+    yield "HypothesisTester.chi_square_independence", \
+        lambda _: tester.chi_square_independence(("group", "label")), None
+    yield "HypothesisTester.batch_t_tests", \
+        lambda t: t.batch_t_tests(numeric, test="welch", group_column="label"), \
+        lambda: HypothesisTester(CSVReader.load_columns(path, numeric, text_columns=["label"]))
+
+def run_benchmarks(rows, shapes, dirty_levels, repeat=3, pattern=None, data_dir=None):
+    data_dir = data_dir or os.path.join(tempfile.gettempdir(), "cli_stat_calculator_bench")
+    results = {}
+    for n in rows:
+        for shape in shapes:
+            for dirty in dirty_levels:
+                path = dataset_path(data_dir, n, shape, dirty)
+                key = f"{shape}/{n}/dirty={dirty:g}"
+                results[key] = {}
+                for name, run, setup in benchmark_cases(path):
+                    if pattern and not re.search(pattern, name):
+                        continue
+                    results[key][name] = measure(run, setup, repeat)
+                    print(f"{key:<28}{name:<45}{results[key][name]['seconds'] * 1000:>12.2f} ms"
+                          f"{results[key][name]['peak_bytes'] / 2 ** 20:>10.1f} MiB", flush=True)
+    return {"meta": environment(), "results": results}
+
+def environment():
+    import numpy
+    import scipy
+
+    return {"date": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+            "numpy": numpy.__version__, "scipy": scipy.__version__, "machine": platform.machine(),
+            "cpus": os.cpu_count()}
+
+def compare(current, baseline, threshold=0.25, memory_threshold=None, min_seconds=0.001):
+    """
+    Lists cases that got slower than baseline by more than `threshold` (0.25 = 25 %),
+    or whose peak memory grew by more than memory_threshold (default: same as threshold).
+    Timings below min_seconds in both runs are treated as noise.
+    """
+    memory_threshold = threshold if memory_threshold is None else memory_threshold
+    regressions = []
+    for dataset, cases in current["results"].items():
+        for name, now in cases.items():
+            before = baseline["results"].get(dataset, {}).get(name)
+            if before is None:
+                continue
+            if max(now["seconds"], before["seconds"]) >= min_seconds \
+                    and now["seconds"] > before["seconds"] * (1 + threshold):
+                regressions.append(f"{dataset} {name}: time {before['seconds'] * 1000:.2f} -> "
+                                   f"{now['seconds'] * 1000:.2f} ms (x{now['seconds'] / before['seconds']:.2f})")
+            if before["peak_bytes"] and now["peak_bytes"] > before["peak_bytes"] * (1 + memory_threshold):
+                regressions.append(f"{dataset} {name}: peak memory {before['peak_bytes'] / 2 ** 20:.1f} -> "
+                                   f"{now['peak_bytes'] / 2 ** 20:.1f} MiB")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for the CLI Statistical Calculator.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    startup = commands.add_parser("startup", help="measure module import and CLI start-up cost")
+    startup.add_argument("--repeat", type=int, default=5, help="runs per measurement (median is reported)")
+    startup.add_argument("--json", help="also write the results to this JSON file")
+
+    run = commands.add_parser("run", help="time loaders, statistics and tests on synthetic data")
+    run.add_argument("--rows", type=int, nargs="+", default=[1000, 100000], help="dataset sizes")
+    run.add_argument("--shapes", nargs="+", choices=list(SHAPES), default=["narrow"])
+    run.add_argument("--dirty", type=float, nargs="+", default=[0.0], help="fractions of bad cells")
+    run.add_argument("--repeat", type=int, default=3, help="runs per measurement (median is reported)")
+    run.add_argument("--cases", help="only run cases whose name matches this regular expression")
+    run.add_argument("--data-dir", help="where generated CSVs are kept (default: system temp dir)")
+    run.add_argument("--json", help="write the results (usable as a baseline) to this JSON file")
+    run.add_argument("--baseline", help="compare against this JSON baseline; exit 1 on regressions")
+    run.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown (0.25 = 25%%)")
+
+    comparison = commands.add_parser("compare", help="compare two saved benchmark runs")
+    comparison.add_argument("current")
+    comparison.add_argument("baseline", nargs="?", default=DEFAULT_BASELINE,
+                            help="baseline JSON (default: benchmarks/baseline.json)")
+    comparison.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown (0.25 = 25%%)")
+
+    generate = commands.add_parser("generate", help="write a synthetic CSV")
+    generate.add_argument("path")
+    generate.add_argument("--rows", type=int, default=100000)
+    generate.add_argument("--shape", choices=list(SHAPES), default="narrow")
+    generate.add_argument("--dirty", type=float, default=0.0)
+    generate.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.command == "startup":
+        results = run_startup(args.repeat)
+        print_startup(results)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(results, f, indent=2)
+        return 1 if results["violations"] else 0
+
+    if args.command == "generate":
+        generate_csv(args.path, args.rows, args.shape, args.dirty, seed=args.seed)
+        return 0
+
+    if args.command == "run":
+        current = run_benchmarks(args.rows, args.shapes, args.dirty, args.repeat, args.cases, args.data_dir)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(current, f, indent=2)
+        if not args.baseline:
+            return 0
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    else:
+        with open(args.current) as f:
+            current = json.load(f)
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    regressions = compare(current, baseline, args.threshold)
+    for line in regressions:
+        print(f"REGRESSION: {line}")
+    if not regressions:
+        print("No regressions beyond the threshold.")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+# What This File Covers
+# Command	Measures
+# startup	-X importtime cost per module, `--help` wall time, and heavy imports that leak into start-up
+# run	Median time and tracemalloc peak of loaders, every StatisticsCalculator method, Pearson and each test
+# compare	Flags cases slower (or hungrier) than a saved JSON baseline by more than --threshold
+# generate	Synthetic CSVs: narrow/wide, clean/dirty, numeric plus categorical columns, any row count
@@ -0,0 +1,208 @@
+# This module keeps an on-disk cache of parsed CSV columns so that running a second analysis on the same file does not re-read and re-parse it.
+# Columns are stored as binary .npy arrays (values + validity mask) and loaded back memory-mapped,
+# which takes milliseconds even for very large files.
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from file_handler import CSVReader, new_file_mode
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "CLI_STATS_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "cli_stat_calculator"),
+)
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+class ColumnCache:
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Initializes the cache in the given directory (created on first write).
+        Once the cache grows beyond max_bytes, the least recently used entries are evicted.
+        """
+        self.directory = directory or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def fingerprint(filepath, sample_bytes=1 << 20):
+        """
+        Returns a key identifying the current contents of a file.
+        The key combines the absolute path, size, modification time and a hash of
+        the first, middle and last sample_bytes of the file, so it changes whenever
+        the file is rewritten without having to hash gigabytes of data.
+        """
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"File '{filepath}' does not exist.")
+
+        info = os.stat(filepath)
+        digest = hashlib.sha256()
+        digest.update(os.path.abspath(filepath).encode())
+        digest.update(f"{info.st_size}:{info.st_mtime_ns}".encode())
+        with open(filepath, 'rb') as f:
+            for offset in (0, max(0, info.st_size // 2 - sample_bytes // 2), max(0, info.st_size - sample_bytes)):
+                f.seek(offset)
+                digest.update(f.read(sample_bytes))
+        return digest.hexdigest()
+
+    def load_columns(self, filepath, columns=None):
+        """
+        Same contract as CSVReader.load_columns(): returns {column_name: (values, valid)}.
+        Columns already cached for the file's current fingerprint are memory-mapped
+        from disk; the rest are parsed once and added to the cache.
+        """
+        key = self.fingerprint(filepath)
+        entry = os.path.join(self.directory, key)
+        meta = self._read_meta(entry)
+
+        if columns is None:
+            columns = meta["header"] if meta else CSVReader.read_header(filepath)
+        columns = list(columns)
+
+        result = {}
+        missing = []
+        for name in columns:
+            if meta and name in meta["columns"]:
+                stem = os.path.join(entry, meta["columns"][name])
+                try:
+                    result[name] = (np.load(stem + ".values.npy", mmap_mode='r'),
+                                    np.load(stem + ".valid.npy", mmap_mode='r'))
+                    continue
+                except (OSError, ValueError):
+                    pass  # Entry was evicted or damaged; parse again
+            missing.append(name)
+
+        if missing:
+            parsed = CSVReader.load_columns(filepath, missing)
+            result.update(parsed)
+            try:
+                self._store(filepath, entry, meta, parsed)
+            except OSError:
+                pass  # Caching is best effort; the parsed data is still returned
+        elif meta:
+            self._touch(entry)
+
+        return {name: result[name] for name in columns}
+
+    def clear(self):
+        """
+        Removes every cached entry.
+        """
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def size(self):
+        """
+        Total bytes currently used by the cache.
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def _store(self, filepath, entry, meta, parsed):
+        os.makedirs(entry, exist_ok=True)
+        if meta is None:
+            meta = {"path": os.path.abspath(filepath), "header": CSVReader.read_header(filepath), "columns": {}}
+            self._drop_stale(meta["path"], entry)
+
+        for name, (values, valid) in parsed.items():
+            stem = hashlib.sha1(name.encode()).hexdigest()[:16]
+            self._atomic_save(os.path.join(entry, stem + ".values.npy"), values)
+            self._atomic_save(os.path.join(entry, stem + ".valid.npy"), valid)
+            meta["columns"][name] = stem
+
+        self._atomic_write(os.path.join(entry, "meta.json"), json.dumps(meta))
+        self._evict(keep=entry)
+
+    def _drop_stale(self, abspath, current):
+        """
+        Deletes entries recorded for the same path under an older fingerprint.
+        """
+        for path, _, meta in self._entries():
+            if path != current and meta is not None and meta.get("path") == abspath:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _evict(self, keep=None):
+        """
+        Removes least recently used entries until the cache fits in max_bytes.
+        Entries without meta.json (left by an interrupted store) count as the oldest.
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        entries.sort(key=lambda item: self._last_used(item[0]))
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def _entries(self):
+        """
+        Lists (path, size_in_bytes, meta) for every entry directory in the cache directory;
+        meta is None for an entry whose store never finished.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not os.path.isdir(path):
+                continue
+            try:
+                size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+            except OSError:
+                continue  # Removed while we were listing it
+            entries.append((path, size, self._read_meta(path)))
+        return entries
+
+    @staticmethod
+    def _read_meta(entry):
+        try:
+            with open(os.path.join(entry, "meta.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _touch(entry):
+        try:
+            os.utime(os.path.join(entry, "meta.json"))
+        except OSError:
+            pass
+
+    @staticmethod
+    def _last_used(entry):
+        try:
+            return os.path.getmtime(os.path.join(entry, "meta.json"))
+        except OSError:
+            return 0.0
+
+    @staticmethod
+    def _atomic_save(path, array):
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            os.fchmod(fd, new_file_mode())  # Keep a shared cache directory readable
+            np.save(f, np.asarray(array))
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _atomic_write(path, text):
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, 'w') as f:
+            os.fchmod(fd, new_file_mode())
+            f.write(text)
+        os.replace(tmp, path)
+
+
+# What This File Covers
+# Function	Use
+# fingerprint()	Identifies a file version by path, size, mtime and sampled content hash
+# load_columns()	Drop-in replacement for CSVReader.load_columns() backed by the cache
+# clear() / size()	Cache maintenance
+# _evict()	Least-recently-used eviction once the cache exceeds max_bytes (unfinished entries first)
+
+# Invalidation
+# A changed file gets a new fingerprint, so stale entries are never read;
+# they are deleted the next time the same path is cached.
@@ -1,9 +1,27 @@
 # This file is the main entry point of the program. It acts as the user interface (via command line), guiding the user through selecting what they want to analyze, reading the file, and printing results or saving reports.
 
-from file_handler import CSVReader
-from stats_module import StatisticsCalculator
-from correlation_module import CorrelationAnalyzer
-from hypothesis_module import HypothesisTester
+# The analysis modules pull in NumPy/SciPy, so they are imported inside the handlers that
+# use them; `--help` and the batch argument parsing start without loading them.
+
+import argparse
+import json
+import sys
+
+_column_cache = None
+DEFAULT_REPORT = "results/analysis_report.txt"
+# Quantile sketch size for descriptive statistics: exact up to about this many values,
+# then a median within ~0.3% of its rank, in constant memory.
+DESCRIPTIVE_SKETCH_K = 1000
+
+def column_cache():
+    """
+    Parsed columns are reused across menu actions (and runs) on the same file.
+    """
+    global _column_cache
+    if _column_cache is None:
+        from cache_module import ColumnCache
+        _column_cache = ColumnCache()
+    return _column_cache
 
 def print_menu():
     print("\nCLI Statistical Calculator")
@@ -11,39 +29,120 @@ def print_menu():
     print("1. Descriptive Statistics (Mean, Median, etc.)")
     print("2. Correlation Analysis")
     print("3. Hypothesis Testing")
-    print("4. Exit")
+    print("4. Per-Column Summary (all numeric columns, parallel)")
+    print("5. Group-by Statistics (per category)")
+    print("6. Exit")
+
+def handle_descriptive_stats(file_path):
+    """
+    Streams the numeric cells of the file into a ColumnSummary, one chunk at a time,
+    so memory stays constant however long the file is.
+    """
+    from file_handler import CSVReader
+    from stats_module import ColumnSummary
 
-def handle_descriptive_stats(data):
-    stats = StatisticsCalculator(data)
+    stats = ColumnSummary.from_chunks(CSVReader.iter_numeric_chunks(file_path), k=DESCRIPTIVE_SKETCH_K)
+    if stats.count == 0:
+        raise ValueError("No numeric data found in the CSV.")
+    summary = stats.summary()
     print("\nDescriptive Statistics:")
-    print(f"Mean: {stats.mean():.2f}")
-    print(f"Median: {stats.median()}")
-    print(f"Mode: {stats.mode()}")
-    print(f"Standard Deviation: {stats.standard_deviation():.2f}")
-    print(f"Variance: {stats.variance():.2f}")
-    print(f"Skewness: {stats.skewness():.2f}")
-    print(f"Kurtosis: {stats.kurtosis():.2f}")
+    print(f"Mean: {summary['mean']:.2f}")
+    print(f"Median: {summary['median']}")
+    print(f"Mode: {summary['mode']}")
+    print(f"Standard Deviation: {summary['std']:.2f}")
+    print(f"Variance: {summary['variance']:.2f}")
+    print(f"Skewness: {summary['skewness']:.2f}")
+    print(f"Kurtosis: {summary['kurtosis']:.2f}")
+    if not stats.quantiles.is_exact:
+        print(f"(Median is approximate: within {stats.quantiles.rank_error():.2%} of its rank)")
     print("\nFrequency Distribution:")
-    for k, v in stats.frequency_distribution().items():
+    frequencies = stats.frequencies.distribution()
+    for k, v in frequencies.items():
         print(f"  {k}: {v}")
     print("\nHistogram:\n")
     print(stats.text_histogram())
 
     save = input("Save this report to file? (y/n): ").strip().lower()
     if save == 'y':
-        stats.generate_report("results/analysis_report.txt")
-        print("Report saved to results/analysis_report.txt")
+        from report_writer import Report, write_report
+
+        path = input(f"Report path (.txt, .json or .npz) [{DEFAULT_REPORT}]: ").strip() or DEFAULT_REPORT
+        report = Report().add_descriptive(None, summary, frequencies, stats.text_histogram())
+        write_report(report, path)
+        print(f"Report saved to {path}")
 
 def handle_correlation():
     file_path = input("Enter CSV path: ")
-    column1 = input("Enter first column name: ")
+    column1 = input("Enter first column name (leave blank for a full correlation matrix): ").strip()
+    if not column1:
+        handle_correlation_matrix(file_path)
+        return
     column2 = input("Enter second column name: ")
+    method = input("Method - pearson, spearman or kendall [pearson]: ").strip().lower() or "pearson"
 
     try:
-        data = CSVReader.load_csv_as_dict(file_path)
+        from correlation_module import CorrelationAnalyzer
+
+        data = column_cache().load_columns(file_path, [column1, column2])
         corr = CorrelationAnalyzer(data, column1, column2)
-        value = corr.pearson_correlation()
-        print(f"\nPearson Correlation Coefficient between '{column1}' and '{column2}': {value:.4f}")
+        value = corr.correlation(method)
+        print(f"\n{method.capitalize()} Correlation Coefficient between '{column1}' and '{column2}': {value:.4f}")
+    except Exception as e:
+        print(f"Error: {e}")
+
+def handle_correlation_matrix(file_path):
+    method = input("Method - pearson, spearman or kendall [pearson]: ").strip().lower() or "pearson"
+    try:
+        from correlation_module import CorrelationMatrix
+
+        data = column_cache().load_columns(file_path)
+        numeric = {name: column for name, column in data.items() if column[1].any()}
+        matrix = CorrelationMatrix(numeric)
+        values = matrix.correlation(method)
+        width = max(10, max(len(name) for name in matrix.columns) + 2)
+        print(f"\n{method.capitalize()} Correlation Matrix:")
+        print(" " * width + "".join(f"{name:>{width}}" for name in matrix.columns))
+        for name, row in zip(matrix.columns, values):
+            print(f"{name:<{width}}" + "".join(f"{value:>{width}.4f}" for value in row))
+    except Exception as e:
+        print(f"Error: {e}")
+
+def print_column_summaries(summaries):
+    print(f"\n{'Column':<20}{'Count':>10}{'Missing':>9}{'Mean':>12}{'Median':>12}{'Std Dev':>12}{'Min':>12}{'Max':>12}")
+    for name, summary in summaries.items():
+        if summary.count == 0:
+            continue  # Non-numeric column
+        row = summary.as_dict()
+        print(f"{name:<20}{row['count']:>10}{row['missing']:>9}{row['mean']:>12.2f}{row['median']:>12.2f}"
+              f"{row['std']:>12.2f}{row['min']:>12.2f}{row['max']:>12.2f}")
+
+def handle_column_summary():
+    file_path = input("Enter CSV path: ")
+    try:
+        from parallel_module import describe_columns
+
+        print_column_summaries(describe_columns(file_path))
+    except Exception as e:
+        print(f"Error: {e}")
+
+def handle_group_by():
+    file_path = input("Enter CSV path: ")
+    by = input("Enter the categorical column to group by: ").strip()
+    try:
+        from file_handler import CSVReader
+        from groupby_module import describe_groups
+
+        columns = [name for name in CSVReader.read_header(file_path) if name != by]
+        data = CSVReader.load_columns(file_path, columns, text_columns=[by])
+        columns = [name for name in columns if data[name][1].any()]
+        result = describe_groups(data, by, columns)
+        for name in columns:
+            stats = result["columns"][name]
+            print(f"\n{name} by {by}:")
+            print(f"{'Group':<20}{'Count':>10}{'Mean':>12}{'Median':>12}{'Std Dev':>12}{'Min':>12}{'Max':>12}")
+            for i, key in enumerate(result["keys"]):
+                print(f"{key:<20}{stats['count'][i]:>10}{stats['mean'][i]:>12.2f}{stats['median'][i]:>12.2f}"
+                      f"{stats['std'][i]:>12.2f}{stats['min'][i]:>12.2f}{stats['max'][i]:>12.2f}")
     except Exception as e:
         print(f"Error: {e}")
 
@@ -52,8 +151,8 @@ def handle_hypothesis_testing():
     column = input("Enter column name to test: ")
 
     try:
-        data = CSVReader.load_csv_as_dict(file_path)
-        tester = HypothesisTester(data)
+        from hypothesis_module import ContingencyTable, HypothesisTester
+
         print("\n1. One-sample t-test")
         print("2. Independent two-sample t-test")
         print("3. Chi-square test (categorical data)")
@@ -61,22 +160,30 @@ def handle_hypothesis_testing():
         choice = input("Choose a test: ")
 
         if choice == "1":
+            tester = HypothesisTester(column_cache().load_columns(file_path, [column]))
             t_stat, p_val = tester.one_sample_t_test(column, popmean=0)
             print(f"t-statistic: {t_stat:.4f}, p-value: {p_val:.4f}")
         elif choice == "2":
             col2 = input("Enter second column name: ")
+            tester = HypothesisTester(column_cache().load_columns(file_path, [column, col2]))
             t_stat, p_val = tester.two_sample_t_test(column, col2)
             print(f"t-statistic: {t_stat:.4f}, p-value: {p_val:.4f}")
         elif choice == "3":
-            observed = tester.extract_observed_frequencies(column)
-            chi2, p_val = tester.chi_square_test(observed)
-            print(f"Chi-square: {chi2:.4f}, p-value: {p_val:.4f}")
+            col2 = input("Enter second categorical column (blank for goodness-of-fit): ").strip()
+            table = ContingencyTable.from_csv(file_path, column, col2 or None)
+            tester = HypothesisTester({})
+            if col2:
+                chi2, p_val, dof = tester.chi_square_independence(table)
+                print(f"Chi-square: {chi2:.4f}, df: {dof}, p-value: {p_val:.4f}")
+            else:
+                chi2, p_val = tester.chi_square_test(table)
+                print(f"Chi-square: {chi2:.4f}, p-value: {p_val:.4f}")
         else:
             print("Invalid selection.")
     except Exception as e:
         print(f"Error: {e}")
 
-def main():
+def interactive():
     while True:
         print_menu()
         choice = input("Enter your choice: ")
@@ -84,8 +191,7 @@ def main():
         if choice == "1":
             file_path = input("Enter CSV path: ")
             try:
-                data = CSVReader.load_csv(file_path)
-                handle_descriptive_stats(data)
+                handle_descriptive_stats(file_path)
             except Exception as e:
                 print(f"Error: {e}")
 
@@ -96,23 +202,265 @@ def main():
             handle_hypothesis_testing()
 
         elif choice == "4":
+            handle_column_summary()
+
+        elif choice == "5":
+            handle_group_by()
+
+        elif choice == "6":
             print("Exiting program.")
             break
 
         else:
             print("Invalid input. Please try again.")
 
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="cli_calculator.py",
+        description="CLI Statistical Calculator. Runs the interactive menu when no command is given.")
+    parser.add_argument("--profile", action="store_true",
+                        help="print a per-stage breakdown (wall/CPU time, rows, bytes, peak memory) to stderr")
+    parser.add_argument("--profile-out", metavar="PATH",
+                        help="also run cProfile and write its stats here (implies --profile)")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("interactive", help="menu-driven mode (default)")
+    batch = commands.add_parser("batch", help="run the analyses listed in a JSON/TOML job file")
+    batch.add_argument("jobfile", help="path to the job file")
+    batch.add_argument("-o", "--output", help="write the JSON results here instead of stdout")
+    batch.add_argument("--no-cache", action="store_true", help="do not use the parsed-column cache")
+    batch.add_argument("--report-dir", help="also write one report per job into this directory")
+    batch.add_argument("--report-format", choices=("text", "json", "npz"), default="text",
+                       help="format of the per-job reports (default: text)")
+    incremental = commands.add_parser(
+        "incremental", help="per-column statistics of a growing CSV, parsing only rows appended since the last run")
+    incremental.add_argument("file", help="path to the CSV file")
+    incremental.add_argument("--columns", nargs="+", help="columns to track (default: all)")
+    incremental.add_argument("--no-correlations", action="store_true", help="do not track Pearson r between columns")
+    incremental.add_argument("--checkpoint", help="checkpoint path (default: next to the file)")
+    incremental.add_argument("--reset", action="store_true", help="discard the checkpoint and rescan the file")
+    incremental.add_argument("--final", action="store_true",
+                             help="also count a last row without a line break (it is not checkpointed)")
+    follow = commands.add_parser("follow", help="watch a CSV as it is written and refresh statistics (like tail -f)")
+    follow.add_argument("file", help="path to the CSV file")
+    follow.add_argument("column", help="numeric column to follow")
+    follow.add_argument("--with", dest="other", help="second column: also report Pearson r")
+    follow.add_argument("--window", type=int, help="only use the last N rows (default: the whole stream)")
+    follow.add_argument("--interval", type=float, default=1.0, help="seconds between refreshes (default: 1)")
+    follow.add_argument("--new-only", action="store_true", help="ignore rows already in the file")
+    serve = commands.add_parser("serve", help="keep files parsed and results cached in a local server for `client`")
+    serve.add_argument("--host", default="127.0.0.1", help="address to bind (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8765, help="port (default: 8765)")
+    serve.add_argument("--workers", type=int, help="worker threads answering queries (default: CPUs, at most 8)")
+    serve.add_argument("--memory-mb", type=int, default=1024,
+                       help="budget for resident columns and results; least recently used are evicted (default: 1024)")
+    serve.add_argument("--preload", nargs="+", default=[], metavar="FILE", help="parse these files before serving")
+    serve.add_argument("--token-file", help="where to write the access token "
+                       "(default: ~/.cache/cli_stat_calculator-server/token-<port>)")
+    client = commands.add_parser("client", help="send a job file to a running `serve` process")
+    client.add_argument("jobfile", nargs="?", help="path to the job file (same format as batch)")
+    client.add_argument("-o", "--output", help="write the JSON results here instead of stdout")
+    client.add_argument("--host", default="127.0.0.1", help="server address (default: 127.0.0.1)")
+    client.add_argument("--port", type=int, default=8765, help="server port (default: 8765)")
+    client.add_argument("--status", action="store_true", help="print the server's memory and cache status")
+    client.add_argument("--shutdown", action="store_true", help="stop the server")
+    client.add_argument("--token-file", help="the server's token file (default: the one `serve` writes for --port)")
+    return parser
+
+def write_job_reports(results, directory, fmt):
+    """
+    One report per job, named after the job's data file (job number first, so names never clash).
+    """
+    import os
+    from report_writer import Report, write_report
+
+    extension = {"text": ".txt", "json": ".json", "npz": ".npz"}[fmt]
+    for number, result in enumerate(results["results"], 1):
+        stem = os.path.splitext(os.path.basename(result.get("file") or "job"))[0]
+        write_report(Report.from_batch_result(result), os.path.join(directory, f"{number:04d}_{stem}{extension}"), fmt)
+
+def run_batch(args):
+    """
+    Runs a job file and emits JSON results. Returns the process exit code:
+    0 when every analysis succeeded, 1 when some failed, 2 when the job file is invalid.
+    """
+    from batch_module import load_job_spec, run_job_spec
+
+    try:
+        spec = load_job_spec(args.jobfile)
+    except Exception as e:
+        print(f"Error: invalid job file: {e}", file=sys.stderr)
+        return 2
+    results = run_job_spec(spec, cache=None if args.no_cache else column_cache())
+    if args.report_dir:
+        write_job_reports(results, args.report_dir, args.report_format)
+    if args.profile or args.profile_out:
+        import profile_module
+        results["profile"] = profile_module.active().as_dict()  # Stages so far: everything but printing
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0 if results["ok"] else 1
+
+def run_incremental(args):
+    """
+    Updates the checkpointed statistics of a growing file and prints them.
+    """
+    import math
+    from incremental_module import IncrementalStats
+
+    try:
+        stats = IncrementalStats(args.file, args.columns, [] if args.no_correlations else None, args.checkpoint)
+        if args.reset:
+            stats.reset()
+        mode = stats.update(final=args.final)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"{mode} update: {stats.bytes_read} new bytes parsed")
+    print_column_summaries(stats.summaries)
+    correlations = {pair: r for pair, r in stats.correlations().items() if not math.isnan(r)}
+    if correlations:
+        print("\nPearson Correlations:")
+        for (a, b), r in correlations.items():
+            print(f"  {a} / {b}: {r:.4f}")
+    return 0
+
+def run_follow(args):
+    """
+    Follows a growing file until interrupted with Ctrl+C.
+    """
+    import asyncio
+    from follow_module import Follower, follow
+
+    try:
+        follower = Follower(args.file, args.column, args.other, args.window, from_start=not args.new_only)
+        asyncio.run(follow(follower, interval=args.interval))
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+def run_serve(args):
+    from server_module import serve
+
+    try:
+        serve(args.host, args.port, args.workers, args.memory_mb * 1024 ** 2, args.preload, args.token_file)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+def run_client(args):
+    """
+    Sends a job file (or a status/shutdown request) to the server. Exit codes match batch;
+    3 means the server could not be reached.
+    """
+    from batch_module import load_job_spec
+    from server_module import default_token_file, read_token, request
+
+    if args.status or args.shutdown:
+        path, payload = ("/status", None) if args.status else ("/shutdown", {})
+    elif args.jobfile:
+        try:
+            path, payload = "/query", load_job_spec(args.jobfile)
+        except Exception as e:
+            print(f"Error: invalid job file: {e}", file=sys.stderr)
+            return 2
+    else:
+        print("Error: give a job file, --status or --shutdown.", file=sys.stderr)
+        return 2
+
+    token_file = args.token_file or default_token_file(args.port)
+    try:
+        token = read_token(token_file)
+    except OSError as e:
+        print(f"Error: cannot read the server token ({e}); start the server with `serve`.", file=sys.stderr)
+        return 3
+    try:
+        status, body = request(path, payload, args.host, args.port, token=token)
+    except OSError as e:
+        print(f"Error: cannot reach the server at {args.host}:{args.port} ({e}); start it with `serve`.",
+              file=sys.stderr)
+        return 3
+    if status != 200:
+        print(f"Error: {body.decode(errors='replace')}", file=sys.stderr)
+        return 2
+    text = body.decode()
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0 if path != "/query" or json.loads(body)["ok"] else 1
+
+def run_profiled(args):
+    """
+    Runs the command with stage instrumentation on and prints the breakdown to stderr
+    (stdout stays clean for batch JSON). With --profile-out, cProfile stats are dumped too.
+    """
+    import profile_module
+
+    with profile_module.profiling(cprofile=bool(args.profile_out)) as profiler:
+        code = dispatch(args)
+    print("\nProfile:\n" + profile_module.format_profile(profiler), file=sys.stderr)
+    if args.profile_out:
+        profiler.dump_stats(args.profile_out)
+        print(f"\n{profiler.top_functions()}cProfile stats written to {args.profile_out} "
+              f"(inspect with: python -m pstats {args.profile_out})", file=sys.stderr)
+    return code
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.profile_out and args.command == "serve":
+        parser.error("--profile-out cannot be used with serve: cProfile only sees the main thread, "
+                     "not the worker threads answering queries (use --profile)")
+    if args.profile or args.profile_out:
+        return run_profiled(args)
+    return dispatch(args)
+
+def dispatch(args):
+    if args.command == "batch":
+        return run_batch(args)
+    if args.command == "incremental":
+        return run_incremental(args)
+    if args.command == "follow":
+        return run_follow(args)
+    if args.command == "serve":
+        return run_serve(args)
+    if args.command == "client":
+        return run_client(args)
+    interactive()
+    return 0
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
 
 
 # What This File Covers
 # Section	Purpose
 # print_menu()	Displays user options
-# handle_descriptive_stats()	Calls StatisticsCalculator for numeric analysis
+# handle_descriptive_stats()	Streams the file into a ColumnSummary for constant-memory descriptive statistics
 # handle_correlation()	Calls CorrelationAnalyzer to calculate correlation
+# handle_correlation_matrix()	Prints the full Pearson/Spearman matrix across all numeric columns
+# handle_column_summary()	Per-column statistics computed over a process pool
+# handle_group_by()	Per-group statistics of every numeric column by a categorical column
 # handle_hypothesis_testing()	Uses HypothesisTester for t-tests or chi-square
-# main()	Manages user interaction loop
+# interactive()	Manages user interaction loop
+# main()	Parses command-line arguments and dispatches to interactive or batch mode
+# run_batch()	Runs a JSON/TOML job file and prints machine-readable results
+# run_profiled()	--profile / --profile-out: stage breakdown and optional cProfile dump
+# run_serve() / run_client()	Warm-dataset server and the thin client that sends it job files
+# write_job_reports()	Writes one text/JSON/npz report per batch job (--report-dir)
+# run_incremental()	Updates checkpointed statistics of a growing CSV from its new rows only
+# run_follow()	tail -f style live statistics over the whole stream or a sliding window
+# column_cache	Reuses parsed numeric columns between analyses of the same file
 
 # Input Validation
 # Checks that the CSV file is provided
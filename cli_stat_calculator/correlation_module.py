@@ -1,6 +1,104 @@
 # This module computes Pearson’s correlation coefficient between two numerical columns in a CSV file, which helps determine the strength and direction of a linear relationship.
+# Rank methods (Spearman and Kendall tau-b) are available for skewed data where a linear fit is misleading.
 
-from scipy.stats import pearsonr
+import numpy as np
+from file_handler import CSVReader
+from profile_module import count, profiled
+
+def dense_codes(values):
+    """
+    Order-preserving integer codes: equal values share a code, smaller values get smaller codes.
+    """
+    return np.unique(values, return_inverse=True)[1].ravel().astype(np.int64)
+
+def average_ranks(values):
+    """
+    1-based ranks with ties given the average of their positions (same as scipy.stats.rankdata).
+    """
+    values = np.asarray(values)
+    order = np.argsort(values, kind='stable')
+    ordered = values[order]
+    starts = np.flatnonzero(np.concatenate([[True], ordered[1:] != ordered[:-1]]))
+    counts = np.diff(np.append(starts, len(values)))
+    ranks = np.empty(len(values))
+    ranks[order] = np.repeat(starts + (counts + 1) / 2, counts)
+    return ranks
+
+def _tied_pairs(codes):
+    """
+    Number of pairs sharing a code: sum of t * (t - 1) / 2 over tie groups.
+    """
+    counts = np.bincount(codes).astype(np.int64)
+    return int((counts * (counts - 1) // 2).sum())
+
+def _merge_blocks(blocks, width):
+    """
+    Merges rows of a 2-D array whose first `width` and remaining items are each sorted,
+    in place, and returns how many (left, right) pairs in the rows are inverted.
+    Each value is tagged with the half it came from (left sorts before an equal right),
+    so after sorting, the sum of the positions of right items gives how many left items
+    precede them. The stable sort (timsort) finds the two sorted runs and merges them
+    in linear time, which keeps the whole count at O(n log n).
+    """
+    rows, span = blocks.shape
+    right = span - width
+    tagged = blocks << 1
+    tagged[:, width:] |= 1
+    tagged.sort(axis=1, kind="stable")
+    positions = int(((tagged & 1) * np.arange(span, dtype=np.int64)).sum())
+    left_not_greater = positions - rows * (right * (right - 1) // 2)
+    blocks[...] = tagged >> 1
+    return rows * width * right - left_not_greater
+
+def count_inversions(codes):
+    """
+    Number of pairs i < j with codes[i] > codes[j] (codes are non-negative integers),
+    by a bottom-up merge sort in O(n log n). Every level merges all block pairs at
+    once with NumPy instead of a Python-level merge.
+    """
+    v = np.array(codes, dtype=np.int64)
+    n = len(v)
+    if n < 2:
+        return 0
+    # First level: compare-and-swap neighbours
+    pairs = v[:n - n % 2].reshape(-1, 2)
+    swapped = pairs[:, 0] > pairs[:, 1]
+    inversions = int(swapped.sum())
+    pairs[swapped] = pairs[swapped][:, ::-1]
+
+    width = 2
+    while width < n:
+        span = 2 * width
+        full = n - n % span
+        if full:
+            inversions += _merge_blocks(v[:full].reshape(-1, span), width)
+        if n - full > width:
+            inversions += _merge_blocks(v[full:].reshape(1, -1), width)
+        width = span
+    return inversions
+
+def kendall_tau_b(x, y, x_codes=None, y_codes=None):
+    """
+    Kendall's tau-b with tie correction (Knight's O(n log n) algorithm).
+    Pass precomputed dense codes to skip re-encoding the columns.
+    """
+    x_codes = dense_codes(x) if x_codes is None else x_codes
+    y_codes = dense_codes(y) if y_codes is None else y_codes
+    n = len(x_codes)
+    if n < 2:
+        return float('nan')
+    n0 = n * (n - 1) // 2
+    n1 = _tied_pairs(x_codes)
+    n2 = _tied_pairs(y_codes)
+    if n0 == n1 or n0 == n2:
+        return float('nan')
+
+    y_base = int(y_codes.max()) + 1
+    joint = np.sort(x_codes * y_base + y_codes)  # Sort by x, then y within ties of x
+    n3 = _tied_pairs(dense_codes(joint))
+    swaps = count_inversions(joint % y_base)
+    score = n0 - n1 - n2 + n3 - 2 * swaps
+    return float(np.clip(score / np.sqrt(float(n0 - n1) * float(n0 - n2)), -1.0, 1.0))
 
 class CorrelationAnalyzer:
     def __init__(self, data: dict, col1: str, col2: str):
@@ -10,38 +108,213 @@ class CorrelationAnalyzer:
         if col1 not in data or col2 not in data:
             raise ValueError(f"Columns '{col1}' or '{col2}' not found in data.")
 
-        self.x = self._clean_column(data[col1])
-        self.y = self._clean_column(data[col2])
+        # Rows where either value is missing are dropped from both columns together
+        self.x, self.y = CSVReader.paired_numeric(data, [col1, col2])
 
-        if len(self.x) != len(self.y):
-            raise ValueError("The two columns must have the same number of valid numerical entries.")
         if len(self.x) < 2:
             raise ValueError("Not enough data for correlation analysis.")
 
     def _clean_column(self, column):
         """
         Converts column values to float, ignoring non-numeric entries.
+        Columns loaded by CSVReader.load_columns() are already parsed and are only masked.
         """
-        cleaned = []
-        for val in column:
-            try:
-                cleaned.append(float(val))
-            except ValueError:
-                continue
-        return cleaned
+        values, valid = CSVReader.as_numeric(column)
+        return values[valid]
 
+    @profiled
     def pearson_correlation(self):
         """
         Computes and returns the Pearson correlation coefficient.
+        Uses a two-pass NumPy computation on the aligned arrays (no SciPy import);
+        pearson_test() also returns the p-value.
+        """
+        count(rows=len(self.x))
+        dx = self.x - self.x.mean()
+        dy = self.y - self.y.mean()
+        denominator = np.sqrt(np.dot(dx, dx) * np.dot(dy, dy))
+        if denominator == 0:
+            return float('nan')
+        return float(np.clip(np.dot(dx, dy) / denominator, -1.0, 1.0))
+
+    @profiled
+    def spearman_correlation(self):
         """
-        corr, _ = pearsonr(self.x, self.y)
-        return corr
+        Spearman's rho: Pearson's r of the average ranks (ties handled like scipy.stats.spearmanr).
+        """
+        count(rows=len(self.x))
+        dx = average_ranks(self.x)
+        dy = average_ranks(self.y)
+        dx -= dx.mean()
+        dy -= dy.mean()
+        denominator = np.sqrt(np.dot(dx, dx) * np.dot(dy, dy))
+        if denominator == 0:
+            return float('nan')
+        return float(np.clip(np.dot(dx, dy) / denominator, -1.0, 1.0))
+
+    @profiled
+    def kendall_correlation(self):
+        """
+        Kendall's tau-b (tie-corrected) in O(n log n).
+        """
+        count(rows=len(self.x))
+        return kendall_tau_b(self.x, self.y)
+
+    def correlation(self, method="pearson"):
+        methods = {"pearson": self.pearson_correlation, "spearman": self.spearman_correlation,
+                   "kendall": self.kendall_correlation}
+        if method not in methods:
+            raise ValueError(f"Unknown correlation method '{method}'.")
+        return methods[method]()
+
+    @profiled
+    def pearson_test(self):
+        """
+        Returns (r, p_value) from scipy.stats.pearsonr.
+        """
+        count(rows=len(self.x))
+        from scipy.stats import pearsonr
+
+        corr, p_val = pearsonr(self.x, self.y)
+        return corr, p_val
+
+class CorrelationMatrix:
+    def __init__(self, data: dict, columns=None, tile_rows=65536, tile_bytes=64 * 2 ** 20):
+        """
+        Prepares a full correlation matrix over many columns.
+        data maps column names to columns in any form CSVReader.as_numeric() accepts;
+        columns defaults to every key. Rows are processed in tiles of at most tile_rows
+        rows, fewer for wide inputs so that a tile's working arrays stay within about
+        tile_bytes; beyond that, memory is four column-by-column accumulators the size
+        of the result.
+        """
+        self.columns = list(data) if columns is None else list(columns)
+        missing = [name for name in self.columns if name not in data]
+        if missing:
+            raise ValueError(f"Columns not found in data: {', '.join(missing)}")
+        if len(self.columns) < 2:
+            raise ValueError("At least two columns are needed for a correlation matrix.")
+
+        parsed = [CSVReader.as_numeric(data[name]) for name in self.columns]
+        lengths = {len(values) for values, _ in parsed}
+        if len(lengths) != 1:
+            raise ValueError("All columns must have the same number of rows.")
+        self.values = [np.asarray(values, dtype=float) for values, _ in parsed]
+        self.valid = [np.asarray(valid, dtype=bool) for _, valid in parsed]
+        self.tile_rows = tile_rows
+        self.tile_bytes = tile_bytes
+        self._ranks = None
+        self._codes = None
+
+    @profiled
+    def pearson(self):
+        """
+        Returns the Pearson correlation matrix as a 2-D array ordered like self.columns.
+        Each pair uses the rows where both columns are valid (pairwise-complete).
+        """
+        count(rows=len(self.values[0]))
+        return self._matrix(self.values)
+
+    @profiled
+    def spearman(self):
+        """
+        Returns the Spearman rank correlation matrix.
+        Each column is ranked once over its own valid values (ties get average ranks)
+        and the ranks go through the same matrix product as pearson(). With missing
+        values this is the usual single-ranking approximation; it is exact for
+        complete columns.
+        """
+        count(rows=len(self.values[0]))
+        if self._ranks is None:
+            self._ranks = []
+            for values, valid in zip(self.values, self.valid):
+                ranked = np.full(len(values), np.nan)
+                ranked[valid] = average_ranks(values[valid])
+                self._ranks.append(ranked)
+        return self._matrix(self._ranks)
+
+    @profiled
+    def kendall(self):
+        """
+        Returns the Kendall tau-b matrix. Each column is encoded to order-preserving
+        codes once; every pair then only sorts and counts inversions over its
+        pairwise-complete rows.
+        """
+        count(rows=len(self.values[0]))
+        if self._codes is None:
+            self._codes = []
+            for values, valid in zip(self.values, self.valid):
+                codes = np.full(len(values), -1, dtype=np.int64)
+                codes[valid] = dense_codes(values[valid])
+                self._codes.append(codes)
+
+        p = len(self.columns)
+        r = np.full((p, p), np.nan)
+        for i in range(p):
+            for j in range(i, p):
+                both = self.valid[i] & self.valid[j]
+                if i == j:
+                    r[i, i] = 1.0 if len(np.unique(self._codes[i][both])) > 1 else np.nan
+                    continue
+                r[i, j] = r[j, i] = kendall_tau_b(None, None, self._codes[i][both], self._codes[j][both])
+        return r
+
+    def correlation(self, method="pearson"):
+        methods = {"pearson": self.pearson, "spearman": self.spearman, "kendall": self.kendall}
+        if method not in methods:
+            raise ValueError(f"Unknown correlation method '{method}'.")
+        return methods[method]()
+
+    def _matrix(self, arrays):
+        """
+        Accumulates pairwise-complete sums with matrix products, one row tile at a time.
+        For each pair (i, j) over the rows where both are valid:
+        N = count, S = sum of column i, Q = sum of squares of column i, P = sum of products.
+        Values are shifted by their first-tile mean to keep the sums well conditioned.
+        """
+        p = len(arrays)
+        n_rows = len(arrays[0])
+        # About six rows-by-p temporaries live at once (X, M, Mf, Z, Z * Z and np.where's output)
+        tile = max(1, min(self.tile_rows, self.tile_bytes // (48 * p)))
+        N = np.zeros((p, p))
+        S = np.zeros((p, p))
+        Q = np.zeros((p, p))
+        P = np.zeros((p, p))
+        shift = None
+
+        for lo in range(0, n_rows, tile):
+            hi = min(lo + tile, n_rows)
+            X = np.column_stack([values[lo:hi] for values in arrays])
+            M = np.column_stack([valid[lo:hi] for valid in self.valid]) & ~np.isnan(X)
+            if shift is None:
+                counts = M.sum(axis=0)
+                shift = np.where(counts > 0, np.where(M, X, 0).sum(axis=0) / np.maximum(counts, 1), 0)
+            Mf = M.astype(float)
+            Z = np.where(M, X - shift, 0.0)
+            N += Mf.T @ Mf
+            S += Z.T @ Mf
+            Q += (Z * Z).T @ Mf
+            P += Z.T @ Z
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = P - S * S.T / N
+            var_i = Q - S * S / N
+            var_j = var_i.T
+            r = cov / np.sqrt(var_i * var_j)
+        r[N < 2] = np.nan
+        r = np.clip(r, -1.0, 1.0)
+        diagonal = np.diag(N) >= 2
+        r[np.diag_indices(p)] = np.where(diagonal & (np.diag(var_i) > 0), 1.0, np.nan)
+        return r
 
 # What This File Does
 # Function	Purpose
-# __init__()	Validates column names and prepares data
+# __init__()	Validates column names and prepares row-aligned data
 # _clean_column()	Converts strings to floats and filters out invalid values
-# pearson_correlation()	Uses SciPy to compute Pearson’s r
+# pearson_correlation()	Computes Pearson’s r with NumPy (SciPy is only loaded for pearson_test())
+# spearman_correlation()	Spearman’s rho from average ranks (tie-aware)
+# kendall_correlation()	Kendall’s tau-b via Knight’s O(n log n) merge-sort inversion count (vectorized per level)
+# CorrelationMatrix	Pearson / Spearman / Kendall matrices; ranks and codes computed once per column
 
 
 # Features Demonstrated:
@@ -49,7 +322,7 @@ class CorrelationAnalyzer:
 
 # Data cleaning
 
-# Pearson correlation (via scipy.stats)
+# Pearson correlation (NumPy fast path; p-values via scipy.stats, imported on demand)
 
-# Error handling for mismatched or missing data
+# Error handling for mismatched or missing data (rows with a blank cell are dropped as a pair)
 
@@ -5,32 +5,87 @@
 # Handling errors such as file not found, invalid values, or wrong format
 
 import csv
+import mmap
 import os
+from itertools import islice
+
+import numpy as np
+
+from profile_module import count, profiled
+
+# Files at least this large are loaded through the memory-mapped path by default.
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+# Widest field (in bytes) the vectorized parser handles; wider cells use float().
+_MAX_FIELD_WIDTH = 32
+
+_new_file_mode = None
+
+def new_file_mode():
+    """
+    The mode open() gives a new file under the process umask (0666 minus the umask), for
+    files written through tempfile.mkstemp (0600) and renamed into place. Computed once;
+    on Linux the umask is read from /proc so it is never changed, even for a moment.
+    """
+    global _new_file_mode
+    if _new_file_mode is None:
+        umask = None
+        try:
+            with open("/proc/self/status") as f:
+                for line in f:
+                    if line.startswith("Umask:"):
+                        umask = int(line.split()[1], 8)
+        except (OSError, ValueError):
+            pass
+        if umask is None:
+            umask = os.umask(0o022)
+            os.umask(umask)
+        _new_file_mode = 0o666 & ~umask
+    return _new_file_mode
 
 class CSVReader:
     @staticmethod
+    @profiled
     def load_csv(filepath):
         """
         Loads a single column of numeric data from a CSV file.
         Returns a flat list of values (for statistics like mean, median).
         """
+        data = []
+        for chunk in CSVReader.iter_numeric_chunks(filepath):
+            data.extend(chunk)
+        if not data:
+            raise ValueError("No numeric data found in the CSV.")
+        count(rows=len(data), nbytes=os.path.getsize(filepath))
+        return data
+
+    @staticmethod
+    def iter_numeric_chunks(filepath, chunk_size=65536):
+        """
+        Streams the numeric cells of a CSV file as lists of at most chunk_size floats.
+        Only one chunk is held at a time, so consumers such as
+        MomentAccumulator.from_chunks() run in constant memory.
+        """
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"File '{filepath}' does not exist.")
 
-        data = []
+        chunk = []
         with open(filepath, 'r', newline='') as file:
             reader = csv.reader(file)
             for row in reader:
                 for item in row:
                     try:
-                        data.append(float(item))
+                        chunk.append(float(item))
                     except ValueError:
                         continue  # Skip non-numeric values
-        if not data:
-            raise ValueError("No numeric data found in the CSV.")
-        return data
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
 
     @staticmethod
+    @profiled
     def load_csv_as_dict(filepath):
         """
         Loads the entire CSV file as a dictionary.
@@ -49,13 +104,343 @@ class CSVReader:
             for row in reader:
                 for key in row:
                     data[key].append(row[key])
+        count(rows=reader.line_num - 1, nbytes=os.path.getsize(filepath))
         return data
 
+    @staticmethod
+    def read_header(filepath):
+        """
+        Returns the list of column names from the first row of a CSV file.
+        """
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"File '{filepath}' does not exist.")
+
+        with open(filepath, 'r', newline='') as file:
+            header = next(csv.reader(file), None)
+        if not header:
+            raise ValueError("CSV file must contain a header row.")
+        return header
+
+    @staticmethod
+    @profiled
+    def load_columns(filepath, columns=None, chunk_rows=65536, use_mmap=None, text_columns=()):
+        """
+        Loads selected columns as typed NumPy arrays, reading chunk_rows rows at a time.
+        Returns {column_name: (values, valid)} where values is a float64 array
+        (NaN where the cell is missing or non-numeric) and valid is a boolean mask.
+        Each cell is parsed exactly once, and only the requested columns are kept.
+        Columns named in text_columns are returned as lists of raw strings instead
+        (e.g. categories for chi-square), collected in the same pass over the file.
+        Files of MMAP_THRESHOLD bytes or more go through load_columns_mmap() unless
+        use_mmap is set explicitly or text columns are requested.
+        """
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"File '{filepath}' does not exist.")
+        if use_mmap is None:
+            use_mmap = not text_columns and os.path.getsize(filepath) >= MMAP_THRESHOLD
+        if use_mmap:
+            return CSVReader.load_columns_mmap(filepath, columns)
+
+        with open(filepath, 'r', newline='') as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if not header:
+                raise ValueError("CSV file must contain a header row.")
+
+            names, indices = CSVReader._select_columns(header, columns)
+            text_names, text_indices = CSVReader._select_columns(header, text_columns)
+
+            parts = {name: [] for name in names}
+            texts = {name: [] for name in text_names}
+            n_rows = 0
+            while True:
+                rows = list(islice(reader, chunk_rows))
+                if not rows:
+                    break
+                rows = [row for row in rows if row]  # Skip blank lines
+                n_rows += len(rows)
+                for name, idx in zip(names, indices):
+                    cells = [row[idx] if idx < len(row) else '' for row in rows]
+                    parts[name].append(CSVReader._parse_numeric(cells))
+                for name, idx in zip(text_names, text_indices):
+                    texts[name].extend(row[idx] if idx < len(row) else '' for row in rows)
+
+        result = dict(texts)
+        for name in names:
+            chunks = parts.pop(name)
+            if chunks:
+                values = np.concatenate([values for values, _ in chunks])
+                valid = np.concatenate([valid for _, valid in chunks])
+            else:
+                values, valid = np.empty(0), np.empty(0, dtype=bool)
+            result[name] = (values, valid)
+        count(rows=n_rows, nbytes=os.path.getsize(filepath))
+        return result
+
+    @staticmethod
+    def iter_text_chunks(filepath, columns, chunk_rows=65536):
+        """
+        Yields {column_name: list of stripped strings} for chunk_rows rows at a time,
+        so categorical columns of any length can be counted without holding them in memory.
+        """
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"File '{filepath}' does not exist.")
+
+        with open(filepath, 'r', newline='') as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if not header:
+                raise ValueError("CSV file must contain a header row.")
+
+            names, indices = CSVReader._select_columns(header, columns)
+            while True:
+                rows = list(islice(reader, chunk_rows))
+                if not rows:
+                    break
+                rows = [row for row in rows if row]  # Skip blank lines
+                yield {name: [row[idx].strip() if idx < len(row) else '' for row in rows]
+                       for name, idx in zip(names, indices)}
+
+    @staticmethod
+    @profiled
+    def load_columns_mmap(filepath, columns=None, window_bytes=64 * 1024 * 1024):
+        """
+        Memory-mapped variant of load_columns() for files larger than RAM.
+        The file is mapped read-only (so concurrent analyses share the OS page cache)
+        and scanned in windows of about window_bytes that end on a line break.
+        Row and field boundaries are located in bulk with NumPy, and numeric fields
+        are decoded straight from the mapped bytes without building per-line strings.
+        Fields are assumed not to contain embedded line breaks.
+        """
+        names, _ = CSVReader._select_columns(CSVReader.read_header(filepath), columns)
+        parts = {name: [] for name in names}
+        for window in CSVReader.iter_mapped_windows(filepath, names, window_bytes=window_bytes):
+            for name, pair in window.items():
+                parts[name].append(pair)
+
+        result = {}
+        for name in names:
+            chunks = parts.pop(name)
+            if chunks:
+                values = np.concatenate([values for values, _ in chunks])
+                valid = np.concatenate([valid for _, valid in chunks])
+            else:
+                values, valid = np.empty(0), np.empty(0, dtype=bool)
+            result[name] = (values, valid)
+        count(rows=len(result[names[0]][0]) if names else 0, nbytes=os.path.getsize(filepath))
+        return result
+
+    @staticmethod
+    def iter_mapped_windows(filepath, columns=None, start=None, end=None, window_bytes=64 * 1024 * 1024):
+        """
+        Memory-maps the file and yields {column_name: (values, valid)} for each window
+        of about window_bytes between byte offsets start and end (default: all data rows).
+        start and end must fall on line starts, e.g. from split_byte_ranges().
+        Windows that contain quote characters or ragged rows fall back to the csv module.
+        """
+        header = CSVReader.read_header(filepath)
+        names, indices = CSVReader._select_columns(header, columns)
+
+        with open(filepath, 'rb') as file:
+            mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            buf = np.frombuffer(mm, dtype=np.uint8)
+            try:
+                pos = CSVReader._data_offset(mm) if start is None else start
+                stop = len(mm) if end is None else min(end, len(mm))
+                while pos < stop:
+                    cut = min(pos + window_bytes, stop)
+                    if cut < stop:
+                        newline = mm.rfind(b'\n', pos, cut)
+                        if newline == -1:
+                            newline = mm.find(b'\n', cut, stop)
+                        cut = stop if newline == -1 else newline + 1
+
+                    fields = None
+                    if mm.find(b'"', pos, cut) == -1:
+                        fields = CSVReader._locate_fields(buf, pos, cut, len(header))
+                    window = {}
+                    if fields is None:
+                        text = mm[pos:cut].decode('utf-8')
+                        rows = [row for row in csv.reader(text.splitlines()) if row]
+                        for name, idx in zip(names, indices):
+                            cells = [row[idx] if idx < len(row) else '' for row in rows]
+                            window[name] = CSVReader._parse_numeric(cells)
+                    else:
+                        field_starts, field_ends = fields
+                        for name, idx in zip(names, indices):
+                            window[name] = CSVReader._parse_fields(buf, field_starts[:, idx], field_ends[:, idx])
+                    yield window
+                    pos = cut
+            finally:
+                del buf  # Release the exported buffer so the map can be closed
+                mm.close()
+
+    @staticmethod
+    def split_byte_ranges(filepath, parts):
+        """
+        Splits the data rows of a file into about `parts` contiguous (start, end)
+        byte ranges, each starting at the beginning of a line.
+        """
+        size = os.path.getsize(filepath)
+        with open(filepath, 'rb') as file:
+            file.readline()
+            first = file.tell()
+            bounds = [first]
+            step = max(1, (size - first) // max(1, parts))
+            for offset in range(first + step, size, step):
+                if offset <= bounds[-1]:
+                    continue
+                file.seek(offset - 1)
+                file.readline()  # Move to the start of the next line
+                if file.tell() >= size:
+                    break
+                if file.tell() > bounds[-1]:
+                    bounds.append(file.tell())
+        bounds.append(size)
+        return [(lo, hi) for lo, hi in zip(bounds, bounds[1:]) if hi > lo]
+
+    @staticmethod
+    def _data_offset(mm):
+        """
+        Byte offset of the first data row (just past the header line).
+        """
+        newline = mm.find(b'\n')
+        return len(mm) if newline == -1 else newline + 1
+
+    @staticmethod
+    def _select_columns(header, columns):
+        names = list(header) if columns is None else list(columns)
+        missing = [name for name in names if name not in header]
+        if missing:
+            raise ValueError(f"Columns not found in CSV: {', '.join(missing)}")
+        return names, [header.index(name) for name in names]
+
+    @staticmethod
+    def _locate_fields(buf, start, end, n_fields):
+        """
+        Finds the byte range of every field in buf[start:end] using vectorized scans.
+        Returns (starts, ends) arrays of shape (rows, n_fields), or None when the rows
+        do not all have n_fields fields.
+        """
+        window = buf[start:end]
+        newlines = np.flatnonzero(window == 10) + start
+        row_starts = np.concatenate(([start], newlines + 1))
+        row_ends = np.concatenate((newlines, [end]))
+        keep = row_ends > row_starts
+        keep &= ~((row_ends - row_starts == 1) & (buf[np.minimum(row_starts, end - 1)] == 13))
+        row_starts, row_ends = row_starts[keep], row_ends[keep]
+
+        commas = np.flatnonzero(window == 44) + start
+        per_row = np.searchsorted(commas, row_ends) - np.searchsorted(commas, row_starts)
+        if per_row.size and not np.all(per_row == n_fields - 1):
+            return None
+        commas = commas.reshape(len(row_starts), n_fields - 1)
+        starts = np.column_stack((row_starts, commas + 1))
+        ends = np.column_stack((commas, row_ends))
+        return starts, ends
+
+    @staticmethod
+    def _parse_fields(buf, starts, ends, batch_rows=1 << 18):
+        """
+        Decodes numeric fields directly from byte ranges of buf.
+        Each batch of fields is gathered into a fixed-width byte array (no Python
+        objects) and converted by NumPy's C float parser in one call; only batches
+        containing blank or text cells fall back to converting those cells one by one.
+        """
+        values = np.full(len(starts), np.nan)
+        for lo in range(0, len(starts), batch_rows):
+            s = starts[lo:lo + batch_rows]
+            e = ends[lo:lo + batch_rows]
+            out = values[lo:lo + batch_rows]
+            widths = e - s
+            if widths.size == 0 or widths.max() <= 0:
+                continue
+            width = int(min(widths.max(), _MAX_FIELD_WIDTH))
+            cols = np.arange(width)
+            inside = cols < widths[:, None]
+            chars = np.where(inside, buf[np.where(inside, s[:, None] + cols, 0)], 0).astype(np.uint8)
+            cells = chars.view(f'S{width}').ravel()
+
+            filled = (widths > 0) & (widths <= width)
+            try:
+                out[filled] = cells[filled].astype(float)
+            except ValueError:
+                for i in np.flatnonzero(filled):
+                    try:
+                        out[i] = float(cells[i])
+                    except ValueError:
+                        continue  # Leave as NaN / invalid
+            for i in np.flatnonzero(widths > width):
+                try:
+                    out[i] = float(bytes(buf[s[i]:e[i]]))
+                except ValueError:
+                    continue
+        return values, ~np.isnan(values)
+
+    @staticmethod
+    def as_numeric(column):
+        """
+        Returns (values, valid) for a column in any of the forms the loaders produce:
+        a (values, valid) pair from load_columns(), a float array, or a list of raw cells.
+        """
+        if isinstance(column, tuple) and len(column) == 2:
+            return column
+        if isinstance(column, np.ndarray) and column.dtype.kind == 'f':
+            return column, ~np.isnan(column)
+        return CSVReader._parse_numeric(list(column))
+
+    @staticmethod
+    @profiled
+    def paired_numeric(data, columns):
+        """
+        Returns row-aligned float arrays for the given columns of data, keeping only
+        the rows where every column holds a valid number (one joint validity mask).
+        Each column is parsed at most once; columns from load_columns() are only masked.
+        """
+        missing = [name for name in columns if name not in data]
+        if missing:
+            raise ValueError(f"Columns not found in data: {', '.join(missing)}")
+
+        parsed = [CSVReader.as_numeric(data[name]) for name in columns]
+        if len({len(values) for values, _ in parsed}) > 1:
+            raise ValueError("Paired columns must have the same number of rows.")
+        joint = np.logical_and.reduce([np.asarray(valid, dtype=bool) for _, valid in parsed])
+        count(rows=len(joint))
+        return [np.asarray(values, dtype=float)[joint] for values, _ in parsed]
+
+    @staticmethod
+    def _parse_numeric(cells):
+        """
+        Converts a chunk of raw cells to float64 with a validity mask.
+        Clean chunks are converted by NumPy in one call; only chunks that contain
+        blanks or text fall back to converting their remaining cells one by one.
+        """
+        values = np.full(len(cells), np.nan)
+        try:
+            values[:] = np.asarray(cells, dtype=float)
+        except (ValueError, TypeError):
+            for i, cell in enumerate(cells):
+                try:
+                    values[i] = float(cell)
+                except (ValueError, TypeError):
+                    continue  # Leave as NaN / invalid
+        return values, ~np.isnan(values)
+
 
 # What This File Covers
 # Function	Use
 # load_csv()	Loads CSV as a flat list of floats (for univariate stats)
+# iter_numeric_chunks()	Streams numeric values in bounded chunks (for single-pass statistics)
 # load_csv_as_dict()	Loads CSV into a dictionary ({column_name: list}) for multi-column analysis
+# read_header()	Returns the column names without reading the data rows
+# load_columns()	Chunked columnar loader returning NumPy values plus a validity mask per column
+# iter_text_chunks()	Streams categorical columns as stripped strings in bounded chunks (for contingency tables)
+# load_columns_mmap()	Memory-mapped loader that parses numeric fields directly from the mapped bytes
+# iter_mapped_windows()	Yields parsed columns window by window over a byte range (bounded memory)
+# split_byte_ranges()	Splits the data rows into line-aligned byte ranges for parallel workers
+# as_numeric()	Normalizes any column form to (values, valid) without re-parsing loaded arrays
+# paired_numeric()	Row-aligned arrays over a joint validity mask (for correlation and paired tests)
+# new_file_mode()	Permissions for files written atomically (mkstemp + rename) that respect the umask
 # Error Handling	Missing file, empty file, non-numeric values, no headers
 
 # Error Handling Built In
@@ -0,0 +1,320 @@
+# This module implements follow mode: like `tail -f`, it watches a CSV file that is being written
+# and keeps statistics of one column (and optionally its correlation with a second column) up to date,
+# either over everything read so far or over a sliding window of the most recent rows.
+# Reading runs on an asyncio loop: while the file is not growing the loop just sleeps, and a
+# separate task prints a refreshed snapshot at a fixed interval.
+
+import asyncio
+import csv
+import heapq
+import math
+import os
+import sys
+from collections import deque
+
+from file_handler import CSVReader
+
+class RollingWindow:
+    """
+    Statistics of the last `size` rows, updated in O(1) per row: the mean, sum of squared
+    deviations and co-moment are added and removed with Welford updates, min/max come
+    from monotonic deques. The window is re-summed every `size` removals so rounding
+    errors from the removals cannot build up. The median comes from two heaps (lower and
+    upper half) with lazy deletion, O(log size) per row.
+    """
+    def __init__(self, size, paired=False):
+        if size < 1:
+            raise ValueError("Window size must be at least 1.")
+        self.size = size
+        self.paired = paired
+        self.rows = deque()
+        # Lower half as a max-heap of (-x, -seq), upper half as a min-heap of (x, seq); entries
+        # of rows that left the window (seq < self._start) are dropped when they reach the top
+        self._low = []
+        self._high = []
+        self._low_live = self._high_live = 0
+        self._start = 0
+        self._min = deque()
+        self._max = deque()
+        self._seen = 0
+        self._removed = 0
+        self._reset()
+
+    def _reset(self):
+        self.count = 0
+        self.mean_x = self.mean_y = 0.0
+        self.m2_x = self.m2_y = self.c_xy = 0.0
+
+    def add(self, x, y=0.0):
+        self.rows.append((x, y))
+        self._add(x, y)
+        self._median_add(x, self._seen)
+        while self._min and self._min[-1][1] >= x:
+            self._min.pop()
+        self._min.append((self._seen, x))
+        while self._max and self._max[-1][1] <= x:
+            self._max.pop()
+        self._max.append((self._seen, x))
+        self._seen += 1
+        if len(self.rows) > self.size:
+            self._evict()
+
+    def _add(self, x, y):
+        self.count += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.count
+        self.m2_x += dx * (x - self.mean_x)
+        if self.paired:
+            dy = y - self.mean_y
+            self.mean_y += dy / self.count
+            self.m2_y += dy * (y - self.mean_y)
+            self.c_xy += dx * (y - self.mean_y)
+
+    def _evict(self):
+        x, y = self.rows.popleft()
+        oldest = self._seen - len(self.rows) - 1
+        if self._min[0][0] == oldest:
+            self._min.popleft()
+        if self._max[0][0] == oldest:
+            self._max.popleft()
+        self._median_remove(x, oldest)
+
+        self._removed += 1
+        if self._removed % self.size == 0:
+            self._reset()
+            for row in self.rows:
+                self._add(*row)
+            return
+        # Inverse of _add(): undo the contribution of the oldest row
+        mean_x, mean_y = self.mean_x, self.mean_y
+        self.count -= 1
+        self.mean_x -= (x - mean_x) / self.count
+        self.m2_x -= (x - self.mean_x) * (x - mean_x)
+        if self.paired:
+            self.mean_y -= (y - mean_y) / self.count
+            self.m2_y -= (y - self.mean_y) * (y - mean_y)
+            self.c_xy -= (x - self.mean_x) * (y - mean_y)
+
+    def _median_add(self, x, seq):
+        if not self._low_live or (x, seq) <= (-self._low[0][0], -self._low[0][1]):
+            heapq.heappush(self._low, (-x, -seq))
+            self._low_live += 1
+        else:
+            heapq.heappush(self._high, (x, seq))
+            self._high_live += 1
+        self._rebalance()
+
+    def _median_remove(self, x, seq):
+        # (x, seq) orders the rows totally, so the lower half holds exactly the keys up to its top
+        if self._low_live and (x, seq) <= (-self._low[0][0], -self._low[0][1]):
+            self._low_live -= 1
+        else:
+            self._high_live -= 1
+        self._start = seq + 1  # Rows leave in order, so everything before this is stale
+        self._prune()
+        if len(self._low) + len(self._high) > 2 * self.size:
+            # Stale entries buried below the tops: rebuild, amortized O(1) per row
+            self._low = [item for item in self._low if -item[1] >= self._start]
+            self._high = [item for item in self._high if item[1] >= self._start]
+            heapq.heapify(self._low)
+            heapq.heapify(self._high)
+        self._rebalance()
+
+    def _prune(self):
+        while self._low and -self._low[0][1] < self._start:
+            heapq.heappop(self._low)
+        while self._high and self._high[0][1] < self._start:
+            heapq.heappop(self._high)
+
+    def _rebalance(self):
+        # Keeps the lower half equal to the upper half or one larger
+        while self._low_live > self._high_live + 1:
+            x, seq = heapq.heappop(self._low)
+            heapq.heappush(self._high, (-x, -seq))
+            self._low_live -= 1
+            self._high_live += 1
+            self._prune()
+        while self._high_live > self._low_live:
+            heapq.heappush(self._low, tuple(-part for part in heapq.heappop(self._high)))
+            self._high_live -= 1
+            self._low_live += 1
+            self._prune()
+
+    def median(self):
+        if not self._low_live:
+            return math.nan
+        if self._low_live > self._high_live:
+            return -self._low[0][0]
+        return (-self._low[0][0] + self._high[0][0]) / 2
+
+    def snapshot(self):
+        n = self.count
+        result = {
+            "count": n,
+            "mean": self.mean_x if n else math.nan,
+            "std": math.sqrt(max(self.m2_x, 0.0) / (n - 1)) if n > 1 else math.nan,
+            "min": self._min[0][1] if n else math.nan,
+            "max": self._max[0][1] if n else math.nan,
+            "median": self.median(),
+        }
+        if self.paired:
+            denominator = math.sqrt(max(self.m2_x, 0.0) * max(self.m2_y, 0.0))
+            result["r"] = self.c_xy / denominator if n > 1 and denominator > 0 else math.nan
+        return result
+
+class StreamStats:
+    """
+    Statistics over every row read so far, in constant memory (ColumnSummary sketches
+    for the column, CoMomentAccumulator for the correlation).
+    """
+    def __init__(self, paired=False):
+        from stats_module import ColumnSummary, CoMomentAccumulator
+
+        self.summary = ColumnSummary()
+        self.comoment = CoMomentAccumulator() if paired else None
+
+    def update_arrays(self, x, x_valid, y=None, y_valid=None):
+        self.summary.update(x, x_valid)
+        if self.comoment is not None:
+            joint = x_valid & y_valid
+            self.comoment.update_arrays(x[joint], y[joint])
+
+    def snapshot(self):
+        row = self.summary.as_dict()
+        result = {name: row[name] for name in ("count", "mean", "std", "min", "max", "median")}
+        if self.comoment is not None:
+            result["r"] = self.comoment.pearson()
+        return result
+
+class Follower:
+    def __init__(self, filepath, column, other=None, window=None, from_start=True):
+        """
+        Follows `column` (and `other` for a correlation) of a CSV file.
+        window=None aggregates the whole stream; otherwise only the last `window` rows.
+        from_start=False skips the rows already in the file, like `tail -f -n 0`.
+        """
+        self.filepath = filepath
+        self.column = column
+        self.other = other
+        self.window = window
+        self.from_start = from_start
+        header = CSVReader.read_header(filepath)
+        _, self._indices = CSVReader._select_columns(header, [column] + ([other] if other else []))
+        self._reset_stats()
+        self.offset = None
+        self._pending = b""
+
+    def _reset_stats(self):
+        paired = self.other is not None
+        self.stats = RollingWindow(self.window, paired) if self.window else StreamStats(paired)
+        self.rows = 0
+
+    def _start_offset(self):
+        with open(self.filepath, 'rb') as f:
+            f.readline()
+            return f.tell() if self.from_start else os.fstat(f.fileno()).st_size
+
+    def poll(self, max_bytes=16 * 1024 * 1024):
+        """
+        Reads whatever complete lines were appended since the last call and folds them in.
+        Returns the number of bytes consumed. A file that shrank is treated as rotated or
+        truncated: the statistics restart from its beginning.
+        """
+        size = os.path.getsize(self.filepath)
+        if self.offset is None or size < self.offset:
+            if self.offset is not None:
+                self.from_start = True
+                self._reset_stats()
+            self.offset = self._start_offset()
+            self._pending = b""
+        if size <= self.offset:
+            return 0
+
+        with open(self.filepath, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(min(size - self.offset, max_bytes))
+        self.offset += len(data)
+        data = self._pending + data
+        cut = data.rfind(b'\n') + 1
+        self._pending = data[cut:]  # Partial last line waits for the rest
+        if cut:
+            self._feed(data[:cut].decode('utf-8', errors='replace'))
+        return len(data) - len(self._pending)
+
+    def _feed(self, text):
+        rows = [row for row in csv.reader(text.splitlines()) if row]
+        if not rows:
+            return
+        columns = [CSVReader._parse_numeric([row[idx] if idx < len(row) else '' for row in rows])
+                   for idx in self._indices]
+        self.rows += len(rows)
+        if isinstance(self.stats, StreamStats):
+            self.stats.update_arrays(*columns[0], *(columns[1] if len(columns) > 1 else (None, None)))
+            return
+        x, x_valid = columns[0]
+        if len(columns) > 1:
+            y, y_valid = columns[1]
+            for a, b in zip(x[x_valid & y_valid].tolist(), y[x_valid & y_valid].tolist()):
+                self.stats.add(a, b)
+        else:
+            for a in x[x_valid].tolist():
+                self.stats.add(a)
+
+    def snapshot(self):
+        return self.stats.snapshot()
+
+def format_snapshot(snapshot, column, other=None):
+    """
+    One status line, e.g. "Score: n=120 mean=71.20 std=8.05 min=52.00 median=71.00 max=93.00".
+    """
+    parts = [f"n={snapshot['count']}"]
+    for name in ("mean", "std", "min", "median", "max"):
+        parts.append(f"{name}={snapshot[name]:.2f}")
+    if other is not None:
+        parts.append(f"r({other})={snapshot['r']:.4f}")
+    return f"{column}: " + " ".join(parts)
+
+async def follow(follower, interval=1.0, poll_interval=0.2, output=None, refreshes=None):
+    """
+    Runs until cancelled (or after `refreshes` snapshots): one task reads new rows every
+    poll_interval seconds, another prints a snapshot every `interval` seconds.
+    Between polls the loop is idle, so waiting for the file to grow costs no CPU.
+    """
+    output = output or sys.stdout
+
+    async def read():
+        while True:
+            while follower.poll():
+                await asyncio.sleep(0)  # Let the printer run between large reads
+            await asyncio.sleep(poll_interval)
+
+    reader = asyncio.create_task(read())
+    try:
+        printed = 0
+        while refreshes is None or printed < refreshes:
+            await asyncio.sleep(interval)
+            if reader.done():
+                reader.result()  # Surface errors from the reader
+            print(format_snapshot(follower.snapshot(), follower.column, follower.other), file=output, flush=True)
+            printed += 1
+    finally:
+        reader.cancel()
+        try:
+            await reader
+        except asyncio.CancelledError:
+            pass
+
+
+# What This File Covers
+# Class / Function	Use
+# RollingWindow	O(1)-per-row add/remove statistics (mean, std, min, max, r) over the last N rows;
+#	median from two lazily pruned heaps in O(log N) per row
+# StreamStats	Constant-memory statistics over the whole stream
+# Follower.poll()	Reads newly appended complete lines; restarts when the file is truncated
+# follow()	asyncio loop: a reader task and a fixed-interval printer
+# format_snapshot()	Formats one refresh line
+
+# Notes
+# A line without its trailing line break is held back until the writer finishes it.
+# The window median is the only part whose per-row cost grows with the window size, and only
+# logarithmically; its heaps hold at most twice the window before stale entries are cleared.
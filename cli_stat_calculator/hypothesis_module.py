@@ -1,11 +1,159 @@
 ## This module, which performs:
 #  One-sample t-test
 # Independent two-sample t-test
-# Chi-square test (for categorical/frequency data)
+# Chi-square goodness-of-fit and two-way independence tests (for categorical/frequency data)
 # These are foundational for drawing inferences from data, especially in real-world decision-making scenarios.
 
-from scipy.stats import ttest_1samp, ttest_ind, chi2_contingency
+# scipy.stats is imported inside each test, so loading this module stays cheap.
 import numpy as np
+from file_handler import CSVReader
+from profile_module import count, profiled
+from sketch_module import FrequencyCounter
+
+def adjust_p_values(p_values, method="bh"):
+    """
+    Multiple-comparison correction for a list of p-values.
+    method: "bonferroni" (family-wise error), "bh" (Benjamini-Hochberg false discovery
+    rate) or None (no correction). NaN p-values are left as NaN and not counted.
+    """
+    p = np.asarray(p_values, dtype=float)
+    adjusted = np.full(p.shape, np.nan)
+    finite = np.flatnonzero(~np.isnan(p))
+    m = len(finite)
+    if m == 0 or method is None:
+        return p.copy() if method is None else adjusted
+    values = p[finite]
+    if method == "bonferroni":
+        adjusted[finite] = np.minimum(values * m, 1.0)
+    elif method == "bh":
+        order = np.argsort(values)
+        scaled = values[order] * m / np.arange(1, m + 1)
+        scaled = np.minimum.accumulate(scaled[::-1])[::-1]
+        result = np.empty(m)
+        result[order] = np.minimum(scaled, 1.0)
+        adjusted[finite] = result
+    else:
+        raise ValueError(f"Unknown correction method '{method}'.")
+    return adjusted
+
+def _t_summary(matrix):
+    """
+    Per-column count, mean and sample variance of a 2-D array, ignoring NaN.
+    """
+    n = np.sum(~np.isnan(matrix), axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nansum(matrix, axis=0) / n
+        var = np.nansum((matrix - mean) ** 2, axis=0) / (n - 1)
+    return n, mean, var
+
+class ContingencyTable:
+    def __init__(self, max_categories=10000):
+        """
+        Streaming one- or two-way table of category counts.
+        Categories are encoded to integer codes as they are first seen and counts are
+        accumulated with np.bincount, so only the table itself is kept in memory.
+        A variable with more than max_categories levels is rejected.
+        """
+        self.max_categories = max_categories
+        self.row_codes = {}
+        self.col_codes = {}
+        self.counts = np.zeros((0, 1), dtype=np.int64)
+
+    @property
+    def row_labels(self):
+        return list(self.row_codes)
+
+    @property
+    def col_labels(self):
+        return list(self.col_codes)
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def _encode(self, codes, labels):
+        """
+        Maps an array of labels to integer codes, adding unseen labels to `codes`.
+        """
+        uniques, inverse = np.unique(labels, return_inverse=True)
+        for label in uniques.tolist():
+            if label not in codes:
+                if len(codes) >= self.max_categories:
+                    raise ValueError(f"More than {self.max_categories} categories.")
+                codes[label] = len(codes)
+        mapping = np.array([codes[label] for label in uniques.tolist()], dtype=np.int64)
+        return mapping[inverse.ravel()]
+
+    def update(self, rows, cols=None):
+        """
+        Adds one chunk of observations. rows (and cols for a two-way table) are
+        equal-length sequences of labels; pairs with a blank label are skipped.
+        """
+        rows = np.asarray(rows, dtype=str)
+        keep = rows != ""
+        if cols is not None:
+            cols = np.asarray(cols, dtype=str)
+            if len(cols) != len(rows):
+                raise ValueError("Row and column labels must have the same length.")
+            keep &= cols != ""
+        elif self.col_codes:
+            raise ValueError("This is a two-way table; pass cols.")
+        if not keep.any():
+            return
+
+        r = self._encode(self.row_codes, rows[keep])
+        c = self._encode(self.col_codes, cols[keep]) if cols is not None else np.zeros(len(r), dtype=np.int64)
+        n_rows, n_cols = len(self.row_codes), max(1, len(self.col_codes))
+        self._grow(n_rows, n_cols)
+        self.counts += np.bincount(r * n_cols + c, minlength=n_rows * n_cols).reshape(n_rows, n_cols)
+
+    def merge(self, other):
+        """
+        Adds the counts of another table (e.g. built over a different part of a file).
+        """
+        if other.total == 0:
+            return self
+        r = self._encode(self.row_codes, np.array(other.row_labels, dtype=str))
+        if other.col_codes:
+            c = self._encode(self.col_codes, np.array(other.col_labels, dtype=str))
+        elif self.col_codes:
+            raise ValueError("Cannot merge a one-way table into a two-way table.")
+        else:
+            c = np.zeros(1, dtype=np.int64)
+        self._grow(len(self.row_codes), max(1, len(self.col_codes)))
+        np.add.at(self.counts, (r[:, None], c[None, :]), other.counts)
+        return self
+
+    def _grow(self, n_rows, n_cols):
+        extra_rows, extra_cols = n_rows - self.counts.shape[0], n_cols - self.counts.shape[1]
+        if extra_rows or extra_cols:
+            self.counts = np.pad(self.counts, ((0, extra_rows), (0, extra_cols)))
+
+    def frequencies(self):
+        """
+        {category: count} of a one-way table (row totals of a two-way table).
+        """
+        return dict(zip(self.row_labels, self.counts.sum(axis=1).tolist()))
+
+    @classmethod
+    def from_columns(cls, rows, cols=None, max_categories=10000):
+        table = cls(max_categories)
+        table.update([str(val).strip() if val is not None else "" for val in rows],
+                     None if cols is None else [str(val).strip() if val is not None else "" for val in cols])
+        return table
+
+    @classmethod
+    @profiled
+    def from_csv(cls, filepath, row_column, col_column=None, chunk_rows=65536, max_categories=10000):
+        """
+        Builds the table by streaming the CSV chunk_rows rows at a time.
+        """
+        table = cls(max_categories)
+        columns = [row_column] if col_column is None else [row_column, col_column]
+        for chunk in CSVReader.iter_text_chunks(filepath, columns, chunk_rows):
+            table.update(chunk[row_column], None if col_column is None else chunk[col_column])
+        count(rows=table.total)
+        return table
 
 class HypothesisTester:
     def __init__(self, data: dict):
@@ -15,35 +163,39 @@ class HypothesisTester:
         """
         self.data = data
 
+    @profiled
     def _clean_column(self, column_name):
         """
         Converts column values to float and removes non-numerics.
+        Columns loaded by CSVReader.load_columns() are already parsed and are only masked.
         """
         column = self.data.get(column_name, [])
-        cleaned = []
-        for val in column:
-            try:
-                cleaned.append(float(val))
-            except (ValueError, TypeError):
-                continue
-        return cleaned
+        values, valid = CSVReader.as_numeric(column)
+        count(rows=len(valid))
+        return values[valid]
 
+    @profiled
     def one_sample_t_test(self, column_name, popmean=0):
         """
         Performs one-sample t-test.
         Compares sample mean to population mean (default = 0).
         """
+        from scipy.stats import ttest_1samp
+
         sample = self._clean_column(column_name)
         if len(sample) < 2:
             raise ValueError("Not enough data for one-sample t-test.")
         t_stat, p_val = ttest_1samp(sample, popmean)
         return t_stat, p_val
 
+    @profiled
     def two_sample_t_test(self, col1, col2):
         """
         Performs independent two-sample t-test.
         Compares the means of two independent groups.
         """
+        from scipy.stats import ttest_ind
+
         sample1 = self._clean_column(col1)
         sample2 = self._clean_column(col2)
 
@@ -52,37 +204,198 @@ class HypothesisTester:
         t_stat, p_val = ttest_ind(sample1, sample2, equal_var=False)
         return t_stat, p_val
 
-    def extract_observed_frequencies(self, column_name):
+    @profiled
+    def paired_t_test(self, col1, col2):
+        """
+        Performs paired (related-samples) t-test.
+        Rows where either column is missing are dropped from both, keeping pairs aligned.
+        """
+        from scipy.stats import ttest_rel
+
+        sample1, sample2 = CSVReader.paired_numeric(self.data, [col1, col2])
+        if len(sample1) < 2:
+            raise ValueError("Need at least 2 complete pairs for a paired t-test.")
+        t_stat, p_val = ttest_rel(sample1, sample2)
+        return t_stat, p_val
+
+    def _numeric_matrix(self, columns):
+        """
+        Stacks columns into a (rows, columns) float array with NaN for invalid cells.
+        """
+        missing = [name for name in columns if name not in self.data]
+        if missing:
+            raise ValueError(f"Columns not found in data: {', '.join(missing)}")
+        parsed = [CSVReader.as_numeric(self.data[name]) for name in columns]
+        if len({len(values) for values, _ in parsed}) > 1:
+            raise ValueError("All columns must have the same number of rows.")
+        return np.column_stack([np.where(valid, values, np.nan) for values, valid in parsed])
+
+    def _group_masks(self, group_column, groups):
+        """
+        Row masks for the two groups of a categorical column.
+        """
+        if group_column not in self.data:
+            raise ValueError(f"Column '{group_column}' not found in data.")
+        column = self.data[group_column]
+        if isinstance(column, tuple):
+            values, valid = column
+            labels = np.where(valid, np.asarray(values).astype(str), "")
+        else:
+            labels = np.array([str(val).strip() if val is not None else "" for val in column])
+        if groups is None:
+            groups = sorted(set(labels.tolist()) - {""})
+            if len(groups) != 2:
+                raise ValueError(f"Column '{group_column}' must have exactly two groups (found {len(groups)}); pass groups=.")
+        first, second = (str(g) for g in groups)
+        return first, second, labels == first, labels == second
+
+    @profiled
+    def batch_t_tests(self, columns, test="one_sample", popmean=0, against=None,
+                      group_column=None, groups=None, correction="bh", alpha=0.05):
+        """
+        Runs the same t-test on many columns at once with vectorized NumPy/SciPy calls.
+        test="one_sample": each column against popmean.
+        test="welch": each column split by the two groups of group_column (or compared
+                      with the column `against`), unequal variances.
+        test="paired": each column against the column `against` on the same rows.
+        Returns one dict per column with the statistic, p-value, p-value adjusted with
+        `correction` ("bh", "bonferroni" or None) and whether it is significant at alpha.
+        """
+        from scipy.stats import t as t_dist
+
+        columns = list(columns)
+        X = self._numeric_matrix(columns)
+        rows = [{"column": name, "test": test} for name in columns]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if test in ("one_sample", "paired"):
+                if test == "paired":
+                    if against is None:
+                        raise ValueError("Paired t-tests need an `against` column.")
+                    X = X - self._numeric_matrix([against])
+                    popmean = 0
+                n, mean, var = _t_summary(X)
+                stat = (mean - popmean) / np.sqrt(var / n)
+                df = n - 1.0
+                for row, count, m in zip(rows, n, mean):
+                    row.update(n=int(count), mean=m)
+            elif test == "welch":
+                if group_column is not None:
+                    label1, label2, mask1, mask2 = self._group_masks(group_column, groups)
+                    X1, X2 = X[mask1], X[mask2]
+                elif against is not None:
+                    X1, X2 = X, np.repeat(self._numeric_matrix([against]), X.shape[1], axis=1)
+                    label1, label2 = "column", against
+                else:
+                    raise ValueError("Welch t-tests need a group_column or an `against` column.")
+                n1, m1, v1 = _t_summary(X1)
+                n2, m2, v2 = _t_summary(X2)
+                se1, se2 = v1 / n1, v2 / n2
+                stat = (m1 - m2) / np.sqrt(se1 + se2)
+                df = (se1 + se2) ** 2 / (se1 ** 2 / (n1 - 1) + se2 ** 2 / (n2 - 1))
+                for row, a, b, ma, mb in zip(rows, n1, n2, m1, m2):
+                    row.update(groups=[label1, label2], n=[int(a), int(b)], mean=[ma, mb])
+            else:
+                raise ValueError(f"Unknown test '{test}'.")
+            p_values = 2 * t_dist.sf(np.abs(stat), df)
+
+        p_values = np.where(np.isfinite(stat), p_values, np.nan)
+        adjusted = adjust_p_values(p_values, correction)
+        for row, s, p, q in zip(rows, stat, p_values, adjusted):
+            row.update(statistic=float(s), p_value=float(p), p_adjusted=float(q),
+                       significant=bool(q < alpha))
+        return rows
+
+    def extract_observed_frequencies(self, column_name, max_categories=10000):
         """
         Returns a dictionary of category: count from a column.
-        Used for chi-square test.
+        Used for chi-square test. Chi-square needs exact counts, so a column with
+        more than max_categories distinct values is rejected instead of being counted.
         """
         column = self.data.get(column_name, [])
-        freq = {}
-        for val in column:
-            val = str(val).strip()
-            if val:
-                freq[val] = freq.get(val, 0) + 1
-        return freq
+        counter = FrequencyCounter(threshold=max_categories)
+        counter.update_many(val for val in (str(val).strip() for val in column) if val)
+        if counter.approximate:
+            raise ValueError(f"Column '{column_name}' has more than {max_categories} categories.")
+        return counter.exact
+
+    def contingency_table(self, row_column, col_column=None, max_categories=10000):
+        """
+        Builds a ContingencyTable from one column (one-way) or two columns (two-way).
+        """
+        for name in (row_column, col_column):
+            if name is not None and name not in self.data:
+                raise ValueError(f"Column '{name}' not found in data.")
+        return ContingencyTable.from_columns(
+            self.data[row_column], None if col_column is None else self.data[col_column], max_categories)
 
-    def chi_square_test(self, observed_freq_dict):
+    @profiled
+    def chi_square_test(self, observed_freq_dict, expected_proportions=None):
         """
         Performs chi-square goodness-of-fit test.
-        Takes a dictionary of observed frequencies.
+        Takes a dictionary of observed frequencies (or a one-way ContingencyTable) and
+        optional expected proportions per category (dict, or a sequence in the same order);
+        without them every category is expected equally often.
         """
-        observed = np.array(list(observed_freq_dict.values()))
-        if len(observed) < 2:
+        from scipy.stats import chisquare
+
+        if isinstance(observed_freq_dict, ContingencyTable):
+            observed_freq_dict = observed_freq_dict.frequencies()
+        observed = dict(observed_freq_dict)
+        if expected_proportions is None:
+            if len(observed) < 2:
+                raise ValueError("Need at least two categories for chi-square test.")
+            chi2, p_val = chisquare(np.array(list(observed.values()), dtype=float))
+            return float(chi2), float(p_val)
+
+        if not isinstance(expected_proportions, dict):
+            expected_proportions = dict(zip(observed, expected_proportions))
+        unexpected = [key for key in observed if key not in expected_proportions]
+        if unexpected:
+            raise ValueError(f"No expected proportion for categories: {', '.join(map(str, unexpected))}")
+        categories = list(expected_proportions)
+        if len(categories) < 2:
             raise ValueError("Need at least two categories for chi-square test.")
-        chi2, p_val, _, _ = chi2_contingency([observed])
-        return chi2, p_val
+        f_obs = np.array([observed.get(key, 0) for key in categories], dtype=float)
+        proportions = np.array([expected_proportions[key] for key in categories], dtype=float)
+        if (proportions <= 0).any():
+            raise ValueError("Expected proportions must be positive.")
+        f_exp = proportions / proportions.sum() * f_obs.sum()
+        chi2, p_val = chisquare(f_obs, f_exp)
+        return float(chi2), float(p_val)
+
+    @profiled
+    def chi_square_independence(self, table, correction=True):
+        """
+        Chi-square test of independence on a two-way table.
+        table is a ContingencyTable, a 2-D array of counts or a (row_column, col_column)
+        pair of columns in the data. Rows/columns with no observations are dropped.
+        Returns (chi2, p_value, degrees_of_freedom).
+        """
+        from scipy.stats import chi2_contingency
+
+        if isinstance(table, tuple):
+            table = self.contingency_table(*table)
+        counts = table.counts if isinstance(table, ContingencyTable) else np.asarray(table)
+        counts = counts[counts.sum(axis=1) > 0][:, counts.sum(axis=0) > 0]
+        if counts.ndim != 2 or min(counts.shape) < 2:
+            raise ValueError("Need at least two categories in each variable for an independence test.")
+        chi2, p_val, dof, _ = chi2_contingency(counts, correction=correction)
+        return float(chi2), float(p_val), int(dof)
 
 
 # What’s in This Module?
 # Method	Purpose
 # one_sample_t_test()	Test if sample mean is significantly different from population mean
 # two_sample_t_test()	Compare two groups’ means
+# paired_t_test()	Compare two measurements taken on the same rows
+# batch_t_tests()	One-sample / Welch / paired t-tests over many columns with Bonferroni or BH correction
+# adjust_p_values()	Multiple-comparison correction for a list of p-values
 # extract_observed_frequencies()	Get counts for categories (for chi-square test)
-# chi_square_test()	Test whether observed frequencies differ from expected
+# chi_square_test()	Goodness-of-fit: do observed frequencies match expected proportions (uniform by default)?
+# chi_square_independence()	Two-way test: are two categorical variables associated?
+# contingency_table()	Builds a ContingencyTable from in-memory columns
+# ContingencyTable	Streaming category-code encoding + np.bincount counts; from_csv() for files of any size
 
 #  Sample Outputs
 #  One-Sample T-Test:
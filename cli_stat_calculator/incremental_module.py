@@ -0,0 +1,250 @@
+# This module keeps statistics of a growing (append-only) CSV file up to date without rescanning it.
+# A checkpoint stored next to the file records how many bytes have been processed, the mergeable
+# per-column summaries (moments, quantile and frequency sketches) and the co-moments of column pairs,
+# as plain NumPy arrays (.npz read with allow_pickle=False, so a planted checkpoint cannot run code).
+# The next run parses only the rows appended since then; if the file was truncated or rewritten,
+# the checkpoint no longer matches and the whole file is scanned again.
+
+import hashlib
+import os
+import stat
+import tempfile
+import zipfile
+from itertools import combinations
+
+import numpy as np
+
+from file_handler import CSVReader, new_file_mode
+from stats_module import ColumnSummary, CoMomentAccumulator
+
+CHECKPOINT_SUFFIX = ".stats-checkpoint"
+CHECKPOINT_VERSION = 3
+# Bytes hashed at the start of the file and just before the processed offset to detect rewrites.
+GUARD_BYTES = 64 * 1024
+
+def checkpoint_path(filepath):
+    return filepath + CHECKPOINT_SUFFIX
+
+def _data_start(filepath):
+    with open(filepath, 'rb') as f:
+        f.readline()
+        return f.tell()
+
+def _complete_end(filepath, size, block=1 << 16):
+    """
+    Offset just past the last line break, so a row that is still being written is left for later.
+    """
+    with open(filepath, 'rb') as f:
+        pos = size
+        while pos > 0:
+            start = max(0, pos - block)
+            f.seek(start)
+            newline = f.read(pos - start).rfind(b'\n')
+            if newline != -1:
+                return start + newline + 1
+            pos = start
+    return 0
+
+def _guard(filepath, offset):
+    """
+    Hash of the first and last GUARD_BYTES before offset; changes if that part of the file is rewritten.
+    """
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        digest.update(f.read(min(GUARD_BYTES, offset)))
+        tail = max(0, offset - GUARD_BYTES)
+        f.seek(tail)
+        digest.update(f.read(offset - tail))
+    return digest.hexdigest()
+
+def _strings(values):
+    return np.array(list(values), dtype=str)
+
+def _encode_state(state):
+    """
+    Flattens the checkpoint into {name: array}: metadata, then summary.<i>.* per column
+    and comoment.<j>.* per pair.
+    """
+    arrays = {
+        "version": np.int64(state["version"]),
+        "path": np.str_(state["path"]),
+        "header": _strings(state["header"]),
+        "columns": _strings(state["columns"]),
+        "pairs": _strings(name for pair in state["pairs"] for name in pair),
+        "offset": np.int64(state["offset"]),
+        "guard": np.str_(state["guard"]),
+    }
+    for i, name in enumerate(state["columns"]):
+        arrays.update({f"summary.{i}.{key}": value for key, value in state["summaries"][name].get_state().items()})
+    for j, pair in enumerate(state["pairs"]):
+        arrays.update({f"comoment.{j}.{key}": value for key, value in state["comoments"][pair].get_state().items()})
+    return arrays
+
+def _decode_state(arrays):
+    def part(prefix):
+        return {key[len(prefix):]: arrays[key] for key in arrays if key.startswith(prefix)}
+
+    columns = arrays["columns"].tolist()
+    names = arrays["pairs"].tolist()
+    pairs = list(zip(names[::2], names[1::2]))
+    return {
+        "version": int(arrays["version"]),
+        "path": str(arrays["path"]),
+        "header": arrays["header"].tolist(),
+        "columns": columns,
+        "pairs": pairs,
+        "offset": int(arrays["offset"]),
+        "guard": str(arrays["guard"]),
+        "summaries": {name: ColumnSummary.from_state(part(f"summary.{i}.")) for i, name in enumerate(columns)},
+        "comoments": {pair: CoMomentAccumulator.from_state(part(f"comoment.{j}.")) for j, pair in enumerate(pairs)},
+    }
+
+def load_checkpoint(path):
+    """
+    Returns the saved state, or None if there is no usable checkpoint.
+    The file is read with allow_pickle=False: it can only hold arrays, never code.
+    """
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            arrays = {key: npz[key] for key in npz.files}
+        if int(arrays["version"]) != CHECKPOINT_VERSION:
+            return None
+        return _decode_state(arrays)
+    except (OSError, ValueError, KeyError, TypeError, zipfile.BadZipFile):
+        return None
+
+def save_checkpoint(path, state, mode=None):
+    """
+    Writes the checkpoint atomically, so an interrupted run never leaves a half-written file.
+    mode sets its permission bits (the data file's, by default those of a newly created file).
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **_encode_state(state))
+        os.chmod(tmp, new_file_mode() if mode is None else mode)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+class IncrementalStats:
+    def __init__(self, filepath, columns=None, pairs=None, checkpoint=None):
+        """
+        Tracks per-column summaries of `columns` (default: all) and Pearson co-moments
+        of `pairs` (default: every pair of the selected columns) for filepath.
+        The checkpoint defaults to the file path plus CHECKPOINT_SUFFIX.
+        """
+        self.filepath = filepath
+        self.checkpoint = checkpoint or checkpoint_path(filepath)
+        self.header = CSVReader.read_header(filepath)
+        self.columns = list(self.header) if columns is None else list(columns)
+        self.pairs = list(combinations(self.columns, 2)) if pairs is None else [tuple(p) for p in pairs]
+        needed = list(dict.fromkeys(self.columns + [name for pair in self.pairs for name in pair]))
+        self._needed, _ = CSVReader._select_columns(self.header, needed)
+
+        self.offset = 0
+        self.summaries = {}
+        self.comoments = {}
+        self.mode = None
+        self.bytes_read = 0
+
+    def update(self, save=True, final=False):
+        """
+        Brings the statistics up to date with the file and returns how:
+        "append" (only new rows were parsed), "unchanged" (nothing new) or
+        "full" (no usable checkpoint, or the file was truncated/rewritten).
+        A last row without a line break may still be being written, so it is left
+        for the next run unless final=True; even then it only enters the returned
+        statistics, not the checkpoint, so a later append that completes it is not double counted.
+        """
+        size = os.path.getsize(self.filepath)
+        state = load_checkpoint(self.checkpoint)
+        if self._resumable(state, size):
+            self.offset = state["offset"]
+            self.summaries = state["summaries"]
+            self.comoments = state["comoments"]
+            self.mode = "append"
+        else:
+            self.offset = _data_start(self.filepath)
+            self.summaries = {name: ColumnSummary() for name in self.columns}
+            self.comoments = {pair: CoMomentAccumulator() for pair in self.pairs}
+            self.mode = "full"
+
+        end = max(self.offset, _complete_end(self.filepath, size))
+        self.bytes_read = end - self.offset
+        if self.bytes_read:
+            self._scan(self.offset, end)
+        elif self.mode == "append":
+            self.mode = "unchanged"
+        self.offset = end
+
+        if save:
+            save_checkpoint(self.checkpoint, {
+                "version": CHECKPOINT_VERSION,
+                "path": os.path.abspath(self.filepath),
+                "header": self.header,
+                "columns": self.columns,
+                "pairs": self.pairs,
+                "offset": self.offset,
+                "guard": _guard(self.filepath, self.offset),
+                "summaries": self.summaries,
+                "comoments": self.comoments,
+            }, stat.S_IMODE(os.stat(self.filepath).st_mode))
+
+        if final and size > end:
+            self._scan(end, size)
+            self.bytes_read += size - end
+            if self.mode == "unchanged":
+                self.mode = "append"
+        return self.mode
+
+    def _resumable(self, state, size):
+        return (state is not None
+                and state["header"] == self.header
+                and state["columns"] == self.columns
+                and state["pairs"] == self.pairs
+                and state["offset"] <= size
+                and state["guard"] == _guard(self.filepath, state["offset"]))
+
+    def _scan(self, start, end):
+        """
+        Parses the rows between two line-aligned offsets and folds them into the state.
+        """
+        for window in CSVReader.iter_mapped_windows(self.filepath, self._needed, start, end):
+            for name in self.columns:
+                self.summaries[name].update(*window[name])
+            for a, b in self.pairs:
+                (x, x_valid), (y, y_valid) = window[a], window[b]
+                joint = x_valid & y_valid
+                self.comoments[(a, b)].update_arrays(x[joint], y[joint])
+
+    def correlations(self):
+        """
+        {(column_a, column_b): Pearson r} over pairwise-complete rows.
+        """
+        return {pair: acc.pearson() for pair, acc in self.comoments.items()}
+
+    def reset(self):
+        """
+        Deletes the checkpoint so the next update() rescans the whole file.
+        """
+        try:
+            os.remove(self.checkpoint)
+        except FileNotFoundError:
+            pass
+
+
+# What This File Covers
+# Function	Use
+# IncrementalStats.update()	Parses only the bytes appended since the checkpoint, or everything if the file changed
+# IncrementalStats.correlations()	Pearson r of every tracked pair from the streamed co-moments
+# load_checkpoint() / save_checkpoint()	Atomic .npz of offset, summaries and co-moments (no pickle), with the data file's mode
+# _guard()	Hash of the head of the file and of the bytes just before the offset
+
+# Change Detection
+# A checkpoint is reused only if the header and selected columns are the same, the file is at least
+# as long as the processed offset and the guarded bytes still hash the same. Anything else
+# (truncation, rewrite, different columns) falls back to a full rescan.
+# A trailing row without a line break is left for the next run, since it may still be written;
+# update(final=True) / --final counts it in the output without checkpointing it.
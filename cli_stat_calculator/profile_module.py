@@ -0,0 +1,282 @@
+# This module is the instrumentation layer behind `--profile`. Coarse entry points of the analysis
+# modules (loading a file, cleaning a column, computing a summary, a correlation or a test, writing
+# a report) are marked as stages; while profiling is on, each stage records wall time, CPU time,
+# rows and bytes processed and its peak traced memory, nested under the stage that called it.
+# While profiling is off a stage is a single global check, so the markers can stay in the code.
+
+import functools
+import io
+import threading
+import time
+import tracemalloc
+
+_active = None
+
+class _NullStage:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+class StageStats:
+    """
+    Totals for one stage path: number of calls, wall and CPU seconds, rows and bytes
+    reported with count(), and the largest peak of traced memory above the stage's start.
+    """
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.peak_bytes = 0
+
+    def as_dict(self):
+        return {"calls": self.calls, "wall_seconds": self.wall, "cpu_seconds": self.cpu,
+                "rows": self.rows, "bytes": self.bytes, "peak_bytes": self.peak_bytes}
+
+class _Frame:
+    def __init__(self, profiler, name, root=False):
+        self.profiler = profiler
+        self.name = name
+        self.root = root
+
+    def __enter__(self):
+        profiler = self.profiler
+        stack = profiler.stack
+        parent = stack[-1] if stack else None
+        if self.root:
+            # The whole profiled run
+            self.path, self.stats = (), profiler.total
+        else:
+            self.path = (parent.path if parent else ()) + (self.name,)
+            self.stats = profiler.stages.get(self.path)
+            if self.stats is None:
+                with profiler.lock:
+                    self.stats = profiler.stages.setdefault(self.path, StageStats())
+        # tracemalloc peaks are process-wide, so only the thread that started profiling resets them
+        self.memory = profiler.memory and threading.get_ident() == profiler.owner
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if parent:
+                parent.peak = max(parent.peak, peak)
+            tracemalloc.reset_peak()
+            self.start_memory = self.peak = current
+        stack.append(self)
+        self.start_cpu = time.thread_time()
+        self.start_wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.start_wall
+        cpu = time.thread_time() - self.start_cpu
+        profiler = self.profiler
+        stack = profiler.stack
+        stack.pop()
+        stats = self.stats
+        if self.memory:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            if stack:
+                # reset_peak() cleared the parent's peak, so hand it back
+                stack[-1].peak = max(stack[-1].peak, self.peak)
+        with profiler.lock:
+            stats.calls += 1
+            stats.wall += wall
+            stats.cpu += cpu
+            if self.memory:
+                stats.peak_bytes = max(stats.peak_bytes, self.peak - self.start_memory)
+        return False
+
+class Profiler:
+    def __init__(self, memory=True, cprofile=False):
+        """
+        Collects stage statistics. memory=True traces allocations with tracemalloc
+        (NumPy buffers included), which slows allocation-heavy code down somewhat;
+        cprofile=True also runs cProfile for a per-function breakdown.
+        """
+        self.memory = memory
+        self.stages = {}
+        self.lock = threading.Lock()
+        self.owner = None
+        self._local = threading.local()
+        self.cprofile = None
+        if cprofile:
+            import cProfile
+            self.cprofile = cProfile.Profile()
+        self._started_tracing = False
+        self.total = StageStats()
+
+    @property
+    def stack(self):
+        """
+        Open stages of the calling thread. Each thread nests its own stages; stages with
+        the same path are merged across threads in self.stages.
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def stage(self, name):
+        return _Frame(self, name)
+
+    def start(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self.owner = threading.get_ident()
+        self._start_process_time = time.process_time()
+        _Frame(self, "(total)", root=True).__enter__()
+        if self.cprofile:
+            self.cprofile.enable()
+
+    def stop(self):
+        if self.cprofile:
+            self.cprofile.disable()
+        while self.stack:
+            self.stack[-1].__exit__(None, None, None)  # Closes the root frame
+        self.total.cpu = time.process_time() - self._start_process_time
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def ordered(self):
+        """
+        Stage paths in tree order: each stage directly after its parent, siblings in first-call order.
+        """
+        first_seen = {path: i for i, path in enumerate(self.stages)}
+        return sorted(self.stages, key=lambda path: [first_seen[path[:i + 1]] for i in range(len(path))])
+
+    def as_dict(self):
+        return {
+            "total": self.total.as_dict(),
+            "stages": [dict(self.stages[path].as_dict(), stage=path[-1], path=list(path))
+                       for path in self.ordered()],
+        }
+
+    def dump_stats(self, path):
+        """
+        Writes the cProfile data (readable with `python -m pstats <path>` or snakeviz).
+        """
+        if self.cprofile is None:
+            raise ValueError("cProfile was not enabled for this profiler.")
+        self.cprofile.dump_stats(path)
+        return path
+
+    def top_functions(self, limit=15, sort="cumulative"):
+        import pstats
+
+        stream = io.StringIO()
+        pstats.Stats(self.cprofile, stream=stream).sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+def active():
+    """
+    The running Profiler, or None when profiling is off.
+    """
+    return _active
+
+class profiling:
+    """
+    Context manager that turns profiling on for its body and yields the Profiler:
+
+        with profiling() as profiler:
+            run()
+        print(format_profile(profiler))
+    """
+    def __init__(self, memory=True, cprofile=False):
+        self.profiler = Profiler(memory, cprofile)
+
+    def __enter__(self):
+        global _active
+        self._previous = _active
+        _active = self.profiler
+        self.profiler.start()
+        return self.profiler
+
+    def __exit__(self, *exc):
+        global _active
+        self.profiler.stop()
+        _active = self._previous
+        return False
+
+def stage(name):
+    """
+    Marks a block as a stage: `with stage("report_writer.render"): ...`.
+    Returns a shared no-op context manager while profiling is off.
+    """
+    if _active is None:
+        return _NULL_STAGE
+    return _active.stage(name)
+
+def profiled(func=None, name=None):
+    """
+    Decorator that runs every call of a function as a stage, named module.qualname
+    unless name is given. Usable bare (@profiled) or with arguments (@profiled(name=...)).
+    """
+    def decorate(func):
+        label = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return func(*args, **kwargs)
+            with _active.stage(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate(func) if func is not None else decorate
+
+def count(rows=0, nbytes=0):
+    """
+    Adds processed rows and bytes to the innermost open stage, or to the total outside
+    any stage (no-op when profiling is off).
+    """
+    if _active is None:
+        return
+    stack = _active.stack
+    if not stack:
+        return
+    with _active.lock:
+        stats = stack[-1].stats
+        stats.rows += rows
+        stats.bytes += nbytes
+
+def format_profile(profiler):
+    """
+    The stage breakdown as a table; nested stages are indented under their caller and
+    their time is included in the caller's.
+    """
+    labels = [("  " * (len(path) - 1) + path[-1], profiler.stages[path]) for path in profiler.ordered()]
+    labels.append(("(total)", profiler.total))
+    width = max(len(label) for label, _ in labels) + 2
+
+    def row(label, stats):
+        peak = f"{stats.peak_bytes / 2 ** 20:>10.1f}" if profiler.memory else f"{'-':>10}"
+        return (f"{label:<{width}}{stats.calls:>7}{stats.wall:>10.3f}{stats.cpu:>10.3f}"
+                f"{stats.rows:>12,}{stats.bytes:>15,}{peak}")
+
+    lines = [f"{'Stage':<{width}}{'Calls':>7}{'Wall s':>10}{'CPU s':>10}{'Rows':>12}{'Bytes':>15}{'Peak MiB':>10}"]
+    lines += [row(label, stats) for label, stats in labels]
+    return "\n".join(lines)
+
+
+# What This File Covers
+# Function	Use
+# profiled	Decorator marking a function as a stage (a global check per call when profiling is off)
+# stage()	Context manager marking a block as a stage
+# count()	Adds rows/bytes processed to the innermost open stage
+# profiling	Turns profiling on for a block and yields the Profiler
+# Profiler	Per-stage wall/CPU time, rows, bytes and peak traced memory; optional cProfile run
+# format_profile()	Stage breakdown table printed by --profile
+
+# Notes
+# Peak memory is measured with tracemalloc.reset_peak() at each stage start; the parent's peak is
+# carried over when a nested stage ends, so every stage reports its own high-water mark.
+# CPU time of a stage is its thread's CPU time (the total is the whole process's); work done in
+# pool worker processes shows up as wall time only.
+# Each thread has its own stage stack, so concurrent stages (e.g. server workers) nest correctly and
+# are merged by path. Peak memory is only attributed to stages of the thread that started profiling,
+# since tracemalloc's peak is process-wide; cProfile also only sees that thread.
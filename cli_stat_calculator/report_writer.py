@@ -1,81 +1,296 @@
 #This module will take the results from statistical analysis and generate a clean, human-readable .txt report with both the computed values and plain-language interpretations.
+# Results are collected once in a Report object and rendered from there to text, JSON or a columnar
+# NumPy table (.npz), so writing a report never recomputes a statistic. Each report is rendered into
+# memory and written with a single call to a temporary file that is then renamed over the target.
 
+import io
+import json
+import math
+import os
+import stat
+import tempfile
 from datetime import datetime
 
+from profile_module import count, profiled, stage
+
+FORMATS = ("text", "json", "npz")
+EXTENSIONS = {".txt": "text", ".json": "json", ".npz": "npz"}
+
+# Statistic name -> (label, plain-language meaning) for the text report.
+DESCRIPTIONS = {
+    "count": ("Count", None),
+    "missing": ("Missing", "Cells that were empty or not numeric"),
+    "mean": ("Mean", "Average of dataset"),
+    "median": ("Median", "Middle value"),
+    "mode": ("Mode", "Most frequent value"),
+    "std": ("Standard Deviation", "Spread of data"),
+    "variance": ("Variance", "Variability measure"),
+    "skewness": ("Skewness", "Asymmetry (positive = right-skewed)"),
+    "kurtosis": ("Kurtosis", "Tailedness (high = heavy tails)"),
+    "min": ("Minimum", None),
+    "max": ("Maximum", None),
+    "q1": ("First Quartile", None),
+    "q3": ("Third Quartile", None),
+    "iqr": ("Interquartile Range", None),
+    "distinct": ("Distinct Values", None),
+}
+
+def interpret_correlation(value):
+    if value is None or math.isnan(value):
+        return "Undefined"
+    if abs(value) >= 0.7:
+        return "Strong correlation"
+    if abs(value) >= 0.4:
+        return "Moderate correlation"
+    if abs(value) >= 0.2:
+        return "Weak correlation"
+    return "Very weak or no correlation"
+
+def interpret_p_value(p_value, alpha=0.05):
+    if p_value is None or math.isnan(p_value):
+        return "Undefined"
+    if p_value < alpha:
+        return "Reject the null hypothesis (significant result)"
+    return "Fail to reject the null hypothesis (not significant)"
+
+class Report:
+    def __init__(self, title="STATISTICAL ANALYSIS REPORT", source=None):
+        """
+        Container for already computed results: descriptive statistics per column,
+        correlations and hypothesis tests. Renderers only read from it.
+        """
+        self.title = title
+        self.source = source
+        self.created = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.descriptive = {}
+        self.correlations = []
+        self.tests = []
+
+    def add_descriptive(self, column, statistics, frequencies=None, histogram=None):
+        """
+        statistics: {name: value}, e.g. StatisticsCalculator.summary() or ColumnSummary.as_dict().
+        frequencies ({value: count}) and histogram (text) are optional extras for the text report.
+        """
+        self.descriptive[column] = {"statistics": dict(statistics), "frequencies": frequencies,
+                                    "histogram": histogram}
+        return self
+
+    def add_correlation(self, column1, column2, value, method="pearson"):
+        self.correlations.append({"columns": [column1, column2], "method": method, "value": value})
+        return self
+
+    def add_correlation_matrix(self, columns, matrix, method="pearson"):
+        """
+        Adds every pair of the upper triangle of a correlation matrix.
+        """
+        for i, first in enumerate(columns):
+            for j in range(i + 1, len(columns)):
+                self.add_correlation(first, columns[j], float(matrix[i][j]), method)
+        return self
+
+    def add_test(self, test_type, statistic, p_value, alpha=0.05, **details):
+        """
+        details: anything else worth recording (columns, degrees of freedom, ...).
+        """
+        self.tests.append(dict(details, test=test_type, statistic=statistic, p_value=p_value, alpha=alpha))
+        return self
+
+    @classmethod
+    def from_batch_result(cls, result):
+        """
+        Builds a report from one job result of batch_module.run_job_spec().
+        """
+        report = cls(source=result.get("file"))
+        for column, statistics in (result.get("descriptive") or {}).items():
+            report.add_descriptive(column, statistics)
+        for item in result.get("correlations") or []:
+            if "matrix" in item:
+                report.add_correlation_matrix(item["columns"], item["matrix"], item["method"])
+            else:
+                report.add_correlation(*item["columns"], item["value"], item["method"])
+        for item in result.get("tests") or []:
+            details = {key: value for key, value in item.items() if key not in ("type", "statistic", "p_value")}
+            report.add_test(item["type"], item.get("statistic"), item.get("p_value"), **details)
+        return report
+
+    def as_dict(self):
+        return {
+            "title": self.title,
+            "source": self.source,
+            "created": self.created,
+            "descriptive": self.descriptive,
+            "correlations": self.correlations,
+            "tests": self.tests,
+        }
+
+def _format(value, digits=2):
+    if value is None:
+        return "n/a"
+    if isinstance(value, float):
+        return "nan" if math.isnan(value) else f"{value:.{digits}f}"
+    return str(value)
+
+def render_text(report):
+    """
+    The human-readable report as one string.
+    """
+    lines = [report.title, "=" * len(report.title), f"Date: {report.created}"]
+    if report.source:
+        lines.append(f"Source: {report.source}")
+    lines.append("")
+
+    for column, section in report.descriptive.items():
+        if len(report.descriptive) > 1 or column is not None:
+            lines += [f"COLUMN: {column}", "-" * (8 + len(str(column)))]
+        for name, value in section["statistics"].items():
+            label, meaning = DESCRIPTIONS.get(name, (name, None))
+            lines.append(f"{label}: {_format(value)}" + (f" → {meaning}" if meaning else ""))
+        if section["frequencies"]:
+            lines += ["", "FREQUENCY DISTRIBUTION", "-----------------------"]
+            lines += [f"{value}: {count}" for value, count in section["frequencies"].items()]
+        if section["histogram"]:
+            lines += ["", "HISTOGRAM (Text-Based)", "----------------------", section["histogram"].rstrip("\n")]
+        lines.append("")
+
+    if report.correlations:
+        lines += ["CORRELATIONS", "------------"]
+        for item in report.correlations:
+            first, second = item["columns"]
+            lines.append(f"{first} & {second} ({item['method']}): {_format(item['value'], 4)}"
+                         f" → {interpret_correlation(item['value'])}")
+        lines.append("")
+
+    if report.tests:
+        lines += ["HYPOTHESIS TESTS", "----------------"]
+        for item in report.tests:
+            subject = item.get("columns") or item.get("column")
+            if isinstance(subject, list):
+                subject = ", ".join(map(str, subject))
+            lines.append(f"Test Type: {item['test']}" + (f" ({subject})" if subject else ""))
+            if item.get("statistic") is not None:
+                lines.append(f"Test Statistic: {_format(item['statistic'], 4)}")
+            if item.get("p_value") is not None:
+                lines.append(f"P-Value: {_format(item['p_value'], 4)}")
+                lines.append(f"Interpretation: {interpret_p_value(item['p_value'], item['alpha'])}")
+                lines.append(f"Alpha (Significance Level): {item['alpha']}")
+            lines.append("")
+
+    lines.append("END OF REPORT")
+    return "\n".join(lines) + "\n"
+
+def render_json(report):
+    from batch_module import to_jsonable
+
+    return json.dumps(to_jsonable(report.as_dict()), indent=2) + "\n"
+
+def render_npz(report):
+    """
+    Columnar binary table: one array per field, e.g. descriptive.column, descriptive.mean,
+    tests.p_value. Loads with numpy.load() without pickle; missing numbers are NaN.
+    """
+    import numpy as np
+
+    def numeric(values):
+        out = []
+        for value in values:
+            try:
+                out.append(float(value))
+            except (TypeError, ValueError):
+                out.append(math.nan)
+        return np.array(out, dtype=float)
+
+    arrays = {}
+    columns = list(report.descriptive)
+    if columns:
+        arrays["descriptive.column"] = np.array([str(c) for c in columns])
+        names = list(dict.fromkeys(name for section in report.descriptive.values() for name in section["statistics"]))
+        for name in names:
+            arrays[f"descriptive.{name}"] = numeric(report.descriptive[c]["statistics"].get(name) for c in columns)
+    if report.correlations:
+        arrays["correlations.column1"] = np.array([str(item["columns"][0]) for item in report.correlations])
+        arrays["correlations.column2"] = np.array([str(item["columns"][1]) for item in report.correlations])
+        arrays["correlations.method"] = np.array([item["method"] for item in report.correlations])
+        arrays["correlations.value"] = numeric(item["value"] for item in report.correlations)
+    if report.tests:
+        arrays["tests.test"] = np.array([item["test"] for item in report.tests])
+        arrays["tests.subject"] = np.array([json.dumps(item.get("columns") or item.get("column")) for item in report.tests])
+        for name in ("statistic", "p_value", "alpha"):
+            arrays[f"tests.{name}"] = numeric(item.get(name) for item in report.tests)
+
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return buffer.getvalue()
+
+RENDERERS = {"text": render_text, "json": render_json, "npz": render_npz}
+
+def _file_mode(path):
+    """
+    Mode for a rewritten file: the existing file's, or what open() would give under the umask.
+    """
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        from file_handler import new_file_mode
+
+        return new_file_mode()
+
+@profiled
+def write_report(report, path, fmt=None):
+    """
+    Renders the report once and writes it atomically. The format comes from fmt or,
+    failing that, the file extension (.txt, .json, .npz; anything else is text).
+    Missing parent directories are created.
+    """
+    fmt = fmt or EXTENSIONS.get(os.path.splitext(path)[1].lower(), "text")
+    if fmt not in RENDERERS:
+        raise ValueError(f"Unknown report format '{fmt}'; use one of {', '.join(FORMATS)}.")
+    with stage(f"report_writer.render_{fmt}"):
+        content = RENDERERS[fmt](report)
+        data = content.encode("utf-8") if isinstance(content, str) else content
+
+    with stage("report_writer.write_file"):
+        count(nbytes=len(data))
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                os.fchmod(fd, _file_mode(path))  # mkstemp creates files as 0600
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    return path
+
 class ReportWriter:
     @staticmethod
     def write_descriptive_report(filepath, stats_obj):
         """
         Writes a descriptive statistics report to a .txt file.
         """
-        with open(filepath, 'w') as f:
-            f.write("STATISTICAL ANALYSIS REPORT\n")
-            f.write("===========================\n")
-            f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-
-            f.write(f"Count: {len(stats_obj.data)}\n")
-            f.write(f"Mean: {stats_obj.mean():.2f} → Average of dataset\n")
-            f.write(f"Median: {stats_obj.median()} → Middle value\n")
-            f.write(f"Mode: {stats_obj.mode()} → Most frequent value\n")
-            f.write(f"Standard Deviation: {stats_obj.standard_deviation():.2f} → Spread of data\n")
-            f.write(f"Variance: {stats_obj.variance():.2f} → Variability measure\n")
-            f.write(f"Skewness: {stats_obj.skewness():.2f} → Asymmetry (positive = right-skewed)\n")
-            f.write(f"Kurtosis: {stats_obj.kurtosis():.2f} → Tailedness (high = heavy tails)\n")
-
-            f.write("\nFREQUENCY DISTRIBUTION\n")
-            f.write("-----------------------\n")
-            for value, count in stats_obj.frequency_distribution().items():
-                f.write(f"{value}: {count}\n")
-
-            f.write("\nHISTOGRAM (Text-Based)\n")
-            f.write("----------------------\n")
-            f.write(stats_obj.text_histogram())
-
-            f.write("\nEND OF REPORT\n")
+        report = Report().add_descriptive(None, stats_obj.summary(), stats_obj.frequency_distribution(),
+                                          stats_obj.text_histogram())
+        return write_report(report, filepath, "text")
 
     @staticmethod
     def write_correlation_report(filepath, column1, column2, value):
-        with open(filepath, 'w') as f:
-            f.write("CORRELATION ANALYSIS REPORT\n")
-            f.write("===========================\n")
-            f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            f.write(f"Columns Compared: {column1} & {column2}\n")
-            f.write(f"Pearson Correlation Coefficient: {value:.4f}\n")
-
-            if abs(value) >= 0.7:
-                interpretation = "Strong correlation"
-            elif abs(value) >= 0.4:
-                interpretation = "Moderate correlation"
-            elif abs(value) >= 0.2:
-                interpretation = "Weak correlation"
-            else:
-                interpretation = "Very weak or no correlation"
-
-            f.write(f"Interpretation: {interpretation}\n")
-            f.write("\nEND OF REPORT\n")
+        report = Report("CORRELATION ANALYSIS REPORT").add_correlation(column1, column2, value)
+        return write_report(report, filepath, "text")
 
     @staticmethod
     def write_hypothesis_test_report(filepath, test_type, test_stat, p_value, alpha=0.05):
-        with open(filepath, 'w') as f:
-            f.write("HYPOTHESIS TESTING REPORT\n")
-            f.write("==========================\n")
-            f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            f.write(f"Test Type: {test_type}\n")
-            f.write(f"Test Statistic: {test_stat:.4f}\n")
-            f.write(f"P-Value: {p_value:.4f}\n")
-
-            if p_value < alpha:
-                decision = "Reject the null hypothesis (significant result)"
-            else:
-                decision = "Fail to reject the null hypothesis (not significant)"
-
-            f.write(f"Interpretation: {decision}\n")
-            f.write(f"Alpha (Significance Level): {alpha}\n")
-            f.write("\nEND OF REPORT\n")
+        report = Report("HYPOTHESIS TESTING REPORT").add_test(test_type, test_stat, p_value, alpha)
+        return write_report(report, filepath, "text")
 
 
 # What Each Method Does
 # Method	Description
+# Report	Holds computed results (descriptive, correlations, tests); from_batch_result() adapts batch output
+# render_text()	Human-readable report with plain-language meanings
+# render_json()	Machine-readable report (strict JSON, NaN -> null)
+# render_npz()	Columnar NumPy table across many columns/tests
+# write_report()	Renders once, creates the directory and writes atomically (temp file + rename)
 # write_descriptive_report()	Saves full statistical summary with histogram and meanings
 # write_correlation_report()	Logs correlation result and explains strength
 # write_hypothesis_test_report()	Stores t-test or chi-square result with interpretation based on p-value
@@ -88,4 +303,4 @@ class ReportWriter:
 
 # Time-stamped reports
 
-# Plain language explanation of statistical results
\ No newline at end of file
+# Plain language explanation of statistical results
@@ -0,0 +1,406 @@
+# This module implements the warm-dataset server: a long-running process on localhost that keeps
+# NumPy/SciPy imported, the parsed columns of recently used CSV files in memory and the results of
+# recent queries, so scripts that query the same files over and over skip the start-up, parse and
+# compute costs. Queries are batch jobs (see batch_module.py) sent as JSON over HTTP; a bounded
+# pool of worker threads answers them, and everything held in memory shares one LRU byte budget.
+# Every request must carry a random token that the server writes to a file only its user can read.
+
+import hmac
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MEMORY_BYTES = 1024 ** 3
+MAX_BODY_BYTES = 16 * 1024 ** 2  # Job specs are small; larger request bodies get a 413
+TOKEN_DIR = os.path.join(os.path.expanduser("~"), ".cache", "cli_stat_calculator-server")
+TOKEN_HEADER = "X-Stats-Token"
+
+def default_token_file(port=DEFAULT_PORT):
+    return os.path.join(TOKEN_DIR, f"token-{port}")
+
+def write_token(token_file):
+    """
+    Writes a new random token to token_file with mode 0600 (its directory 0700) and returns it.
+    """
+    token = secrets.token_urlsafe(32)
+    os.makedirs(os.path.dirname(os.path.abspath(token_file)), mode=0o700, exist_ok=True)
+    fd = os.open(token_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_NOFOLLOW", 0), 0o600)
+    with os.fdopen(fd, "w") as f:
+        os.fchmod(fd, 0o600)  # An existing file keeps its mode through O_CREAT
+        f.write(token + "\n")
+    return token
+
+def read_token(token_file):
+    with open(token_file) as f:
+        return f.read().strip()
+
+def file_version(filepath):
+    """
+    (absolute path, size, mtime, inode) of a file: a stat() call, so checking that
+    resident data is still current costs microseconds. A rewritten file gets a new version.
+    """
+    info = os.stat(filepath)
+    return os.path.abspath(filepath), info.st_size, info.st_mtime_ns, info.st_ino
+
+def _column_bytes(column):
+    if isinstance(column, tuple):
+        return sum(part.nbytes for part in column)
+    return sum(sys.getsizeof(cell) + 8 for cell in column)  # List of strings
+
+class WarmStore:
+    def __init__(self, max_bytes=DEFAULT_MEMORY_BYTES):
+        """
+        Parsed columns, headers and encoded query results in one least-recently-used map,
+        evicted once their estimated size exceeds max_bytes. Every entry records the file
+        version it was built from and is dropped when the file changes.
+        """
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (version, value, size)
+        self._lock = threading.Lock()
+        self._file_locks = {}
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, version, value, size):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return  # Would evict everything else and still not fit
+            self._entries[key] = (version, value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def discard(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def _remove(self, key):
+        self.bytes -= self._entries.pop(key)[2]
+
+    def file_lock(self, path):
+        """
+        One lock per file, so concurrent misses on the same file parse it once.
+        """
+        with self._lock:
+            return self._file_locks.setdefault(path, threading.Lock())
+
+    def header(self, filepath, version):
+        from file_handler import CSVReader
+
+        header = self.get(("header", version[0]), version)
+        if header is None:
+            header = CSVReader.read_header(filepath)
+            self.put(("header", version[0]), version, header, sum(len(name) + 57 for name in header))
+        return header
+
+    def load_columns(self, filepath, version, numeric, text=()):
+        """
+        Same result as CSVReader.load_columns(filepath, numeric, text_columns=text),
+        parsing only the columns that are not resident yet (in one pass over the file).
+        Numeric arrays are made read-only, since concurrent queries share them.
+        """
+        from file_handler import CSVReader
+
+        path = version[0]
+        data = {}
+        missing = self._resident(path, version, [(name, "numeric") for name in numeric] +
+                                 [(name, "text") for name in text], data)
+        if not missing:
+            return data
+
+        with self.file_lock(path):
+            missing = self._resident(path, version, missing, data)  # Another worker may have parsed them
+            if missing:
+                parsed = CSVReader.load_columns(
+                    filepath, [name for name, kind in missing if kind == "numeric"],
+                    text_columns=[name for name, kind in missing if kind == "text"])
+                for name, kind in missing:
+                    column = parsed[name]
+                    if kind == "numeric":
+                        for part in column:
+                            part.flags.writeable = False
+                    self.put((kind, path, name), version, column, _column_bytes(column))
+                    data[name] = column
+        return data
+
+    def _resident(self, path, version, wanted, data):
+        """
+        Copies the resident columns of wanted [(name, kind)] into data; returns the rest.
+        """
+        missing = []
+        for name, kind in wanted:
+            column = self.get((kind, path, name), version)
+            if column is None:
+                missing.append((name, kind))
+            else:
+                data[name] = column
+        return missing
+
+    def status(self):
+        with self._lock:
+            kinds = {}
+            for key in self._entries:
+                kinds[key[0]] = kinds.get(key[0], 0) + 1
+            return {"bytes": self.bytes, "max_bytes": self.max_bytes, "entries": kinds,
+                    "hits": self.hits, "misses": self.misses}
+
+class StatsService:
+    def __init__(self, store=None):
+        """
+        Answers batch-style queries from the warm store. A repeated query on an unchanged
+        file is answered from its cached, already encoded result.
+        """
+        self.store = store or WarmStore()
+        self.started = time.time()
+        self.queries = 0
+        self._lock = threading.Lock()
+
+    def preload(self, filepath):
+        """
+        Parses every column of a file ahead of the first query. Columns without a
+        single number are kept as text instead (categories for chi-square or group-by).
+        """
+        version = file_version(filepath)
+        header = self.store.header(filepath, version)
+        data = self.store.load_columns(filepath, version, header)
+        text = [name for name in header if not data[name][1].any()]
+        if text:
+            for name in text:
+                self.store.discard(("numeric", version[0], name))
+            self.store.load_columns(filepath, version, [], text)
+
+    def run_job(self, job):
+        """
+        One job -> (encoded JSON result, ok). Mirrors batch_module.run_job().
+        """
+        from batch_module import plan_columns, run_analyses, to_jsonable
+
+        try:
+            filepath = job["file"]
+            version = file_version(filepath)
+        except Exception as e:
+            return json.dumps({"file": job.get("file"), "errors": [str(e)]}).encode(), False
+        key = ("result", version[0], json.dumps(job, sort_keys=True))
+        cached = self.store.get(key, version)
+        if cached is not None:
+            return cached
+
+        try:
+            header = self.store.header(filepath, version)
+            numeric, text = plan_columns(job, header)
+            result = run_analyses(job, header, self.store.load_columns(filepath, version, numeric, text))
+        except Exception as e:
+            result = {"file": filepath, "errors": [str(e)]}
+        encoded = (json.dumps(to_jsonable(result)).encode(), not result["errors"])
+        if file_version(filepath) == version:  # Not rewritten while we were reading it
+            self.store.put(key, version, encoded, len(encoded[0]) + len(key[2]) + 200)
+        return encoded
+
+    def query(self, spec):
+        """
+        Runs {"jobs": [...]} (or a single job) and returns the encoded
+        {"results": [...], "ok": bool} body, as `batch` would print it.
+        """
+        jobs = spec.get("jobs", [spec]) if isinstance(spec, dict) else None
+        if not isinstance(jobs, list) or not all(isinstance(job, dict) for job in jobs):
+            raise ValueError("Query must be a job or contain a list of jobs under 'jobs'.")
+        with self._lock:
+            self.queries += 1
+        parts = [self.run_job(job) for job in jobs]
+        ok = all(part_ok for _, part_ok in parts)
+        return b'{"results": [' + b", ".join(body for body, _ in parts) + b'], "ok": ' + \
+            (b"true" if ok else b"false") + b"}"
+
+    def status(self):
+        return dict(self.store.status(), queries=self.queries, uptime_seconds=time.time() - self.started)
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so a client can send many queries on one connection
+
+    def _authorized(self):
+        token = self.headers.get(TOKEN_HEADER, "").encode()
+        if hmac.compare_digest(token, self.server.token.encode()):
+            return True
+        self._reply(401, b'{"error": "missing or wrong token"}', close=True)
+        return False
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        if self.path == "/status":
+            self._reply(200, json.dumps(self.server.service.status()).encode())
+        else:
+            self._reply(404, b'{"error": "not found"}')
+
+    def do_POST(self):
+        # Checked before the body is read, so unauthenticated or oversized requests cost nothing
+        if not self._authorized():
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self._reply(400, b'{"error": "invalid Content-Length"}', close=True)
+            return
+        if not 0 <= length <= MAX_BODY_BYTES:
+            self._reply(413, json.dumps({"error": f"request body over {MAX_BODY_BYTES} bytes"}).encode(),
+                        close=True)
+            return
+        body = self.rfile.read(length)
+        if self.path == "/shutdown":
+            self._reply(200, b'{"ok": true}')
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+        if self.path != "/query":
+            self._reply(404, b'{"error": "not found"}')
+            return
+        try:
+            self._reply(200, self.server.service.query(json.loads(body)))
+        except ValueError as e:  # Includes malformed JSON
+            self._reply(400, json.dumps({"error": str(e)}).encode())
+
+    def _reply(self, code, body, close=False):
+        """
+        close=True ends the connection after the reply, for requests whose body was not read.
+        """
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if close:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Quiet: scripts poll this server
+
+class StatsServer(HTTPServer):
+    def __init__(self, address, service, token, workers=None):
+        """
+        HTTP server whose connections are handled by a fixed pool of worker threads
+        (http.server's ThreadingMixIn would start an unbounded thread per connection).
+        Requests without the given token in their X-Stats-Token header get a 401.
+        """
+        self.service = service
+        self.token = token
+        self.pool = ThreadPoolExecutor(max_workers=workers or min(8, os.cpu_count() or 1))
+        super().__init__(address, _Handler)
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, max_bytes=DEFAULT_MEMORY_BYTES, preload=(),
+          token_file=None):
+    """
+    Runs the server until interrupted or until POST /shutdown. Imports NumPy and SciPy
+    up front so no query pays for them. The access token is written to token_file
+    (default: default_token_file(port)) and removed again when the server stops.
+    """
+    import numpy  # noqa: F401
+    import scipy.stats  # noqa: F401
+
+    service = StatsService(WarmStore(max_bytes))
+    for filepath in preload:
+        service.preload(filepath)
+    server = StatsServer((host, port), service, secrets.token_urlsafe(32), workers)
+    token_file = token_file or default_token_file(server.server_address[1])
+    try:
+        server.token = write_token(token_file)
+        print(f"Serving on http://{server.server_address[0]}:{server.server_address[1]} "
+              f"(token in {token_file})", flush=True)
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            if read_token(token_file) == server.token:  # Not replaced by a newer server
+                os.remove(token_file)
+        except OSError:
+            pass
+
+def request(path, payload=None, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=None, token=None):
+    """
+    Client side: GET (payload None) or POST a JSON payload; returns (status, body bytes).
+    The token defaults to the one in default_token_file(port). Uses only the standard
+    library, so the client starts without NumPy.
+    """
+    import http.client
+
+    if token is None:
+        token = read_token(default_token_file(port))
+    headers = {TOKEN_HEADER: token}
+    connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        if payload is None:
+            connection.request("GET", path, headers=headers)
+        else:
+            headers["Content-Type"] = "application/json"
+            connection.request("POST", path, json.dumps(payload).encode(), headers)
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+# What This File Covers
+# Class / Function	Use
+# WarmStore	LRU map of parsed columns, headers and encoded results under one byte budget
+# file_version()	stat()-based key that invalidates resident data when a file changes
+# StatsService.query()	Runs batch jobs over resident columns; repeated queries are answered from cache
+# StatsServer	HTTP server with a fixed worker-thread pool
+# serve()	Starts the server (the `serve` subcommand)
+# request()	Minimal client used by the `client` subcommand
+# write_token() / read_token()	Access token shared through a file only the server's user can read
+
+# Endpoints
+# POST /query	Body: a batch job or {"jobs": [...]}; reply: {"results": [...], "ok": bool}
+# GET /status	Memory use, entry counts, cache hits/misses, query count, uptime
+# POST /shutdown	Stops the server
+# Every endpoint answers 401 unless the X-Stats-Token header holds the server's token; the token
+# is checked before a request body is read, and bodies over MAX_BODY_BYTES get a 413.
+
+# Notes
+# The server binds to 127.0.0.1 by default and reads any file path it is sent, with the
+# permissions of the user running it. Other local users cannot query or stop it without the token
+# file (mode 0600), but the token travels in plain HTTP; do not expose it on a shared network interface.
+# File paths in queries should be absolute (the client resolves them like `batch` does).
+# A job's "report" target is ignored here: only `batch` writes report files.
+# Identical queries on an unchanged file return the cached result, so a bootstrap or permutation
+# test without a "seed" repeats its first answer until the entry is evicted.
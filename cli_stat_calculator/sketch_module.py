@@ -0,0 +1,540 @@
+# This module contains small, mergeable data sketches that summarize a column in bounded memory.
+# They let streaming and chunk-parallel pipelines report order statistics (median, percentiles, IQR)
+# without keeping every value in RAM.
+
+import hashlib
+import math
+import random
+
+import numpy as np
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+def _mix64(h):
+    """
+    splitmix64 finalizer applied element-wise to a uint64 array.
+    """
+    with np.errstate(over='ignore'):
+        h = h ^ (h >> np.uint64(30))
+        h = h * np.uint64(0xBF58476D1CE4E5B9)
+        h = h ^ (h >> np.uint64(27))
+        h = h * np.uint64(0x94D049BB133111EB)
+        return h ^ (h >> np.uint64(31))
+
+def hash_values(values):
+    """
+    Stable 64-bit hashes for a sequence of values (independent of PYTHONHASHSEED,
+    so sketches built in different processes can be merged).
+    Numbers are hashed from their float64 bit pattern in one vectorized step;
+    other values are hashed from their string form with BLAKE2b.
+    """
+    arr = np.asarray(values)
+    if arr.dtype.kind in 'biuf':
+        bits = (arr.astype(float) + 0.0).view(np.uint64)  # + 0.0 folds -0.0 into 0.0
+        return _mix64(bits)
+    return np.array([int.from_bytes(hashlib.blake2b(str(v).encode(), digest_size=8).digest(), 'little')
+                     for v in values], dtype=np.uint64)
+
+class KLLSketch:
+    def __init__(self, k=200, seed=0):
+        """
+        KLL quantile sketch (Karnin, Lang & Liberty).
+        k controls accuracy: memory is O(k) items and the rank error shrinks roughly as 1/k.
+        While no more than about k values have been added the sketch is exact.
+        seed makes the random compaction choices reproducible.
+        """
+        if k < 8:
+            raise ValueError("k must be at least 8.")
+        self.k = k
+        self.count = 0
+        self.compactors = [[]]
+        self._rng = random.Random(seed)
+        self._size = 0
+        self._max_size = self._capacity(0)
+
+    def _capacity(self, level):
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _grow(self):
+        self.compactors.append([])
+        self._max_size = sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def _compress(self):
+        """
+        Halves the first over-full level: its sorted items are thinned to every other
+        one (random offset) and promoted one level up with twice the weight.
+        """
+        for h in range(len(self.compactors)):
+            items = self.compactors[h]
+            if len(items) < self._capacity(h):
+                continue
+            if h + 1 >= len(self.compactors):
+                self._grow()
+            items.sort()
+            leftover = [items.pop()] if len(items) % 2 else []
+            offset = 1 if self._rng.random() < 0.5 else 0
+            self.compactors[h + 1].extend(items[offset::2])
+            self.compactors[h] = leftover
+            self._size = sum(len(c) for c in self.compactors)
+            if self._size < self._max_size:
+                break
+
+    def update(self, x):
+        """
+        Adds a single value.
+        """
+        self.compactors[0].append(float(x))
+        self._size += 1
+        self.count += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def update_many(self, values):
+        """
+        Adds an iterable or NumPy array of values.
+        Large batches are sorted once with NumPy and thinned with a random stride of
+        2**h, which is what h rounds of compaction would do to a sorted buffer; the
+        survivors go straight to level h with weight 2**h.
+        """
+        values = np.asarray(values if hasattr(values, "dtype") else list(values), dtype=float).ravel()
+        if values.size > 2 * self.k:
+            values = np.sort(values)
+            level = int(math.log2(values.size / self.k))
+            stride = 2 ** level
+            usable = (values.size // stride) * stride
+            while len(self.compactors) <= level:
+                self._grow()
+            offset = self._rng.randrange(stride)
+            promoted = values[offset:usable:stride]
+            self.compactors[level].extend(promoted.tolist())
+            self._size += len(promoted)
+            self.count += usable
+            values = values[usable:]
+            while self._size >= self._max_size:
+                self._compress()
+
+        values = values.tolist()
+        pos = 0
+        while pos < len(values):
+            room = max(1, self._max_size - self._size)
+            part = values[pos:pos + room]
+            self.compactors[0].extend(part)
+            self._size += len(part)
+            self.count += len(part)
+            pos += len(part)
+            if self._size >= self._max_size:
+                self._compress()
+        return self
+
+    def merge(self, other):
+        """
+        Combines another sketch (built with the same k) into this one.
+        """
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for h, items in enumerate(other.compactors):
+            self.compactors[h].extend(items)
+        self.count += other.count
+        self._size = sum(len(c) for c in self.compactors)
+        while self._size >= self._max_size:
+            self._compress()
+        return self
+
+    def get_state(self):
+        """
+        Plain arrays describing the sketch (for checkpoints that must not use pickle).
+        """
+        version, internal, gauss = self._rng.getstate()
+        return {
+            "k": np.int64(self.k),
+            "count": np.int64(self.count),
+            "items": np.array([x for c in self.compactors for x in c], dtype=float),
+            "lengths": np.array([len(c) for c in self.compactors], dtype=np.int64),
+            "rng": np.array((version,) + internal, dtype=np.int64),
+            "rng_gauss": np.float64(np.nan if gauss is None else gauss),
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        sketch = cls(int(state["k"]))
+        sketch.count = int(state["count"])
+        items = state["items"].tolist()
+        bounds = np.concatenate([[0], np.cumsum(state["lengths"])]).tolist()
+        sketch.compactors = [items[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+        rng, gauss = state["rng"].tolist(), float(state["rng_gauss"])
+        sketch._rng.setstate((rng[0], tuple(rng[1:]), None if math.isnan(gauss) else gauss))
+        sketch._size = len(items)
+        sketch._max_size = sum(sketch._capacity(h) for h in range(len(sketch.compactors)))
+        return sketch
+
+    @property
+    def is_exact(self):
+        """
+        True while no compaction has happened, i.e. every value is still stored.
+        """
+        return len(self.compactors) == 1
+
+    def rank_error(self):
+        """
+        Approximate normalized rank error of quantile() (0 while the sketch is exact).
+        """
+        return 0.0 if self.is_exact else 2.296 / self.k ** 0.9723
+
+    def quantile(self, q):
+        """
+        Returns the value at quantile q (0 <= q <= 1).
+        Exact sketches interpolate linearly like numpy.quantile; otherwise the weighted
+        retained items are searched for the first one whose cumulative weight reaches q.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1.")
+        if self.count == 0:
+            raise ValueError("Sketch is empty.")
+        if self.is_exact:
+            return float(np.quantile(self.compactors[0], q))
+
+        items = np.concatenate([np.asarray(c, dtype=float) for c in self.compactors])
+        weights = np.concatenate([np.full(len(c), 2.0 ** h) for h, c in enumerate(self.compactors)])
+        order = np.argsort(items, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        idx = int(np.searchsorted(cumulative, q * cumulative[-1], side="left"))
+        return float(items[order][min(idx, len(items) - 1)])
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def iqr(self):
+        return self.quantile(0.75) - self.quantile(0.25)
+
+
+class HyperLogLog:
+    def __init__(self, precision=14):
+        """
+        HyperLogLog distinct-value counter with 2**precision one-byte registers.
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18.")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update_hashes(self, hashes):
+        p = np.uint64(self.precision)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.intp)
+        rest = (hashes << p) & _MASK64
+        # Position of the leftmost 1-bit in the remaining 64 - p bits
+        bit_length = np.zeros(len(rest), dtype=np.int64)
+        nonzero = rest > 0
+        approx = np.floor(np.log2(rest[nonzero].astype(float))).astype(np.int64) + 1
+        too_high = (np.uint64(1) << (approx - 1).astype(np.uint64)) > rest[nonzero]
+        bit_length[nonzero] = approx - too_high
+        rho = (65 - bit_length).clip(max=64 - self.precision + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rho)
+        return self
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        """
+        Estimated number of distinct values (with the small-range correction).
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(float)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def relative_error(self):
+        return 1.04 / math.sqrt(len(self.registers))
+
+
+class CountMinSketch:
+    def __init__(self, width=2048, depth=5):
+        """
+        Count-Min sketch: estimated counts never undercount and overcount by at most
+        e / width * total with probability 1 - exp(-depth).
+        """
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+        self._seeds = _mix64(np.arange(1, depth + 1, dtype=np.uint64))
+
+    def _columns(self, hashes):
+        return [(_mix64(hashes ^ seed) % np.uint64(self.width)).astype(np.intp) for seed in self._seeds]
+
+    def update_hashes(self, hashes, counts):
+        counts = np.asarray(counts, dtype=np.int64)
+        for row, columns in enumerate(self._columns(hashes)):
+            self.table[row] += np.bincount(columns, weights=counts, minlength=self.width).astype(np.int64)
+        self.total += int(counts.sum())
+        return self
+
+    def estimate_hashes(self, hashes):
+        rows = [self.table[row][columns] for row, columns in enumerate(self._columns(hashes))]
+        return np.min(rows, axis=0)
+
+    def merge(self, other):
+        self.table += other.table
+        self.total += other.total
+        return self
+
+    def error_bound(self):
+        """
+        Maximum expected overcount of any single estimate.
+        """
+        return math.e / self.width * self.total
+
+
+class SpaceSaving:
+    def __init__(self, capacity=1000):
+        """
+        Top-k heavy-hitter summary (Space-Saving, in its weighted and mergeable form).
+        At most `capacity` values are tracked. counts[value] is an upper bound on the
+        value's true count and counts[value] - errors[value] a lower bound; any untracked
+        value occurs at most `error` times. A new value takes the slot of the smallest
+        entry and inherits its count as error, so the summary never ends up empty.
+        """
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.error = 0
+
+    def update_counts(self, keys, counts):
+        """
+        Adds pre-aggregated (value, count) pairs, e.g. from numpy.unique on a chunk.
+        """
+        keys = list(keys)
+        counts = np.asarray(counts, dtype=np.int64)
+        floor = 0
+        if len(keys) > self.capacity:
+            # Reduce the chunk to a summary of its own first, so only `capacity` values reach Python
+            order = np.argpartition(counts, len(counts) - self.capacity - 1)
+            floor = int(counts[order[len(counts) - self.capacity - 1]])
+            keep = order[len(counts) - self.capacity:]
+            keys = [keys[i] for i in keep]
+            counts = counts[keep]
+        self._combine(dict(zip(keys, counts.tolist())), {}, floor)
+        return self
+
+    def merge(self, other):
+        self._combine(other.counts, other.errors, other.error)
+        return self
+
+    def _combine(self, counts, errors, floor):
+        """
+        Adds another summary whose untracked values occur at most `floor` times: a value
+        missing from one side is counted with that side's floor (and the floor as error).
+        """
+        combined = {}
+        combined_errors = {}
+        for key in self.counts.keys() | counts.keys():
+            combined[key] = self.counts.get(key, self.error) + counts.get(key, floor)
+            combined_errors[key] = self.errors.get(key, self.error) + errors.get(key, floor)
+        self.error += floor
+        if len(combined) > self.capacity:
+            ranked = sorted(combined, key=combined.get, reverse=True)
+            # The largest count that has to go becomes the bound for every untracked value
+            self.error = max(self.error, combined[ranked[self.capacity]])
+            for key in ranked[self.capacity:]:
+                del combined[key], combined_errors[key]
+        self.counts = combined
+        self.errors = combined_errors
+
+    def top(self, n=None):
+        """
+        Returns [(value, upper_bound_count), ...] ordered by count, largest first.
+        """
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:n]
+
+
+class FrequencyCounter:
+    def __init__(self, threshold=100000, capacity=1000, width=2048, depth=5, precision=14):
+        """
+        Value counter that is exact (a plain dict) until more than `threshold` distinct
+        values have been seen, then switches to fixed-memory sketches: Space-Saving for
+        the top `capacity` values, Count-Min for point counts and HyperLogLog for the
+        number of distinct values. threshold=None keeps it exact forever.
+        """
+        self.threshold = threshold
+        self.total = 0
+        self.exact = {}
+        self.approximate = False
+        self._settings = (capacity, width, depth, precision)
+        self.top_k = self.count_min = self.distinct_sketch = None
+
+    def update_many(self, values):
+        """
+        Counts an iterable or NumPy array of values. Each chunk is aggregated first
+        (numpy.unique for arrays), so the sketches see one update per distinct value.
+        """
+        if hasattr(values, "dtype"):
+            keys, counts = np.unique(np.asarray(values, dtype=float) + 0.0, return_counts=True)
+            keys = keys.tolist()
+        else:
+            chunk = {}
+            for value in values:
+                chunk[value] = chunk.get(value, 0) + 1
+            keys, counts = list(chunk), list(chunk.values())
+        self.total += int(sum(counts))
+
+        if not self.approximate:
+            for key, count in zip(keys, counts):
+                self.exact[key] = self.exact.get(key, 0) + int(count)
+            if self.threshold is not None and len(self.exact) > self.threshold:
+                self._switch()
+        elif keys:
+            self._feed(keys, counts)
+        return self
+
+    def _switch(self):
+        capacity, width, depth, precision = self._settings
+        self.top_k = SpaceSaving(capacity)
+        self.count_min = CountMinSketch(width, depth)
+        self.distinct_sketch = HyperLogLog(precision)
+        self.approximate = True
+        exact, self.exact = self.exact, {}
+        self._feed(list(exact), list(exact.values()))
+
+    def _feed(self, keys, counts):
+        hashes = hash_values(keys)
+        self.distinct_sketch.update_hashes(hashes)
+        self.count_min.update_hashes(hashes, counts)
+        self.top_k.update_counts(keys, counts)
+
+    def merge(self, other):
+        if not other.approximate and not self.approximate:
+            self.total += other.total
+            for key, count in other.exact.items():
+                self.exact[key] = self.exact.get(key, 0) + count
+            if self.threshold is not None and len(self.exact) > self.threshold:
+                self._switch()
+            return self
+        if not self.approximate:
+            self._switch()
+        if not other.approximate:
+            self.total += other.total
+            if other.exact:
+                self._feed(list(other.exact), list(other.exact.values()))
+            return self
+        self.total += other.total
+        self.top_k.merge(other.top_k)
+        self.count_min.merge(other.count_min)
+        self.distinct_sketch.merge(other.distinct_sketch)
+        return self
+
+    def get_state(self):
+        """
+        Plain arrays describing the counter (numeric values only; for checkpoints
+        that must not use pickle).
+        """
+        capacity, width, depth, precision = self._settings
+        state = {
+            "settings": np.array([-1 if self.threshold is None else self.threshold,
+                                  capacity, width, depth, precision], dtype=np.int64),
+            "total": np.int64(self.total),
+            "exact_keys": np.array(list(self.exact), dtype=float),
+            "exact_counts": np.array(list(self.exact.values()), dtype=np.int64),
+        }
+        if self.approximate:
+            state.update({
+                "top_keys": np.array(list(self.top_k.counts), dtype=float),
+                "top_counts": np.array(list(self.top_k.counts.values()), dtype=np.int64),
+                "top_errors": np.array(list(self.top_k.errors.values()), dtype=np.int64),
+                "top_error": np.int64(self.top_k.error),
+                "count_min": self.count_min.table,
+                "count_min_total": np.int64(self.count_min.total),
+                "registers": self.distinct_sketch.registers,
+            })
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        threshold, capacity, width, depth, precision = state["settings"].tolist()
+        counter = cls(None if threshold < 0 else threshold, capacity, width, depth, precision)
+        counter.total = int(state["total"])
+        counter.exact = dict(zip(state["exact_keys"].tolist(), state["exact_counts"].tolist()))
+        if "registers" in state:
+            counter.approximate = True
+            counter.top_k = SpaceSaving(capacity)
+            counter.top_k.counts = dict(zip(state["top_keys"].tolist(), state["top_counts"].tolist()))
+            counter.top_k.errors = dict(zip(state["top_keys"].tolist(), state["top_errors"].tolist()))
+            counter.top_k.error = int(state["top_error"])
+            counter.count_min = CountMinSketch(width, depth)
+            counter.count_min.table = np.array(state["count_min"], dtype=np.int64)
+            counter.count_min.total = int(state["count_min_total"])
+            counter.distinct_sketch = HyperLogLog(precision)
+            counter.distinct_sketch.registers = np.array(state["registers"], dtype=np.uint8)
+        return counter
+
+    def distinct(self):
+        return self.distinct_sketch.count() if self.approximate else len(self.exact)
+
+    def estimate(self, value):
+        """
+        Count of one value (an upper bound once the counter is approximate).
+        """
+        if not self.approximate:
+            return self.exact.get(value, 0)
+        return int(self.count_min.estimate_hashes(hash_values([value]))[0])
+
+    def most_common(self, n=None):
+        """
+        Returns [(value, count), ...], largest first. Exact ties keep first-seen order.
+        """
+        if self.approximate:
+            return self.top_k.top(n)
+        ranked = sorted(self.exact.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:n]
+
+    def mode(self):
+        """
+        Most frequent value (the tracked value with the largest upper-bound count once
+        approximate). Raises ValueError when nothing has been counted.
+        """
+        if self.total == 0:
+            raise ValueError("No values have been counted, so there is no mode.")
+        if self.approximate:
+            return self.top_k.top(1)[0][0]
+        # Like statistics.mode, ties go to the value seen first
+        return max(self.exact, key=self.exact.get)
+
+    def distribution(self):
+        """
+        {value: count} ordered by value: every value when exact, the tracked heavy
+        hitters (with upper-bound counts) when approximate.
+        """
+        items = self.exact.items() if not self.approximate else self.top_k.top()
+        return dict(sorted(items))
+
+    def error_bounds(self):
+        """
+        Describes how far reported numbers may be from the truth (all zero when exact).
+        """
+        if not self.approximate:
+            return {"exact": True, "count_error": 0, "distinct_relative_error": 0.0}
+        return {
+            "exact": False,
+            "count_error": max(self.top_k.error, int(math.ceil(self.count_min.error_bound()))),
+            "distinct_relative_error": self.distinct_sketch.relative_error(),
+        }
+
+
+# What This File Covers
+# Class	Use
+# KLLSketch	Mergeable quantile sketch: median, percentiles and IQR in O(k) memory
+# HyperLogLog	Distinct-value estimate in 2**precision bytes
+# CountMinSketch	Point-count estimates with a one-sided error bound
+# SpaceSaving	Top-k heavy hitters with per-value error bounds
+# FrequencyCounter	Exact counts that switch to the sketches above past a distinct-value threshold
+# get_state() / from_state()	KLLSketch and FrequencyCounter as plain arrays (pickle-free checkpoints)
+
+# Accuracy
+# FrequencyCounter.error_bounds() reports the count and distinct-value error once approximate.
+# rank_error() ~ 2.3 / k^0.97, e.g. about 1.3% of the rank for the default k=200.
+# Small inputs (up to about k values) are answered exactly.
@@ -1,86 +1,667 @@
 # This module is where all the key statistical calculations will be performed. 
 
-import statistics
+# NumPy and the sketches are imported where they are used, so the light statistics
+# (count, mean, variance, standard deviation) run in pure Python without loading NumPy.
+
 import math
-from scipy.stats import skew, kurtosis
+import numbers
+import shutil
+
+from profile_module import count, profiled
+
+class MomentAccumulator:
+    """
+    Streaming accumulator for count, mean and the 2nd, 3rd and 4th central moments.
+    Values are folded in one numerically stable pass (Welford/Terriberry update), so
+    memory stays constant no matter how long the column is. Two accumulators built
+    over separate chunks can be combined with merge().
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def update(self, x):
+        """
+        Adds a single value.
+        """
+        x = float(x)
+        n1 = self.count
+        self.count = n = n1 + 1
+        delta = x - self.mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+        self.mean += delta_n
+        self.m4 += term1 * delta_n2 * (n * n - 3 * n + 3) + 6 * delta_n2 * self.m2 - 4 * delta_n * self.m3
+        self.m3 += term1 * delta_n * (n - 2) - 3 * delta_n * self.m2
+        self.m2 += term1
+        if x < self.minimum:
+            self.minimum = x
+        if x > self.maximum:
+            self.maximum = x
+
+    def update_many(self, values):
+        """
+        Adds every value from an iterable. NumPy arrays are reduced in one vectorized step.
+        """
+        if hasattr(values, "dtype"):
+            return self.update_array(values)
+        for x in values:
+            self.update(x)
+        return self
+
+    def update_array(self, values):
+        """
+        Reduces a NumPy array to its moments and merges them in.
+        """
+        import numpy as np
+
+        arr = np.asarray(values, dtype=float).ravel()
+        if arr.size == 0:
+            return self
+        part = MomentAccumulator()
+        part.count = int(arr.size)
+        part.mean = float(arr.mean())
+        centered = arr - part.mean
+        squared = centered * centered
+        part.m2 = float(squared.sum())
+        part.m3 = float((squared * centered).sum())
+        part.m4 = float((squared * squared).sum())
+        part.minimum = float(arr.min())
+        part.maximum = float(arr.max())
+        return self.merge(part)
+
+    def merge(self, other):
+        """
+        Combines another accumulator into this one (Pebay's pairwise formulas).
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean = other.count, other.mean
+            self.m2, self.m3, self.m4 = other.m2, other.m3, other.m4
+            self.minimum, self.maximum = other.minimum, other.maximum
+            return self
+
+        na, nb = self.count, other.count
+        n = na + nb
+        delta = other.mean - self.mean
+        delta2 = delta * delta
+        m2 = self.m2 + other.m2 + delta2 * na * nb / n
+        m3 = (self.m3 + other.m3
+              + delta * delta2 * na * nb * (na - nb) / (n * n)
+              + 3 * delta * (na * other.m2 - nb * self.m2) / n)
+        m4 = (self.m4 + other.m4
+              + delta2 * delta2 * na * nb * (na * na - na * nb + nb * nb) / (n ** 3)
+              + 6 * delta2 * (na * na * other.m2 + nb * nb * self.m2) / (n * n)
+              + 4 * delta * (na * other.m3 - nb * self.m3) / n)
+        self.count = n
+        self.mean += delta * nb / n
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    def get_state(self):
+        import numpy as np
+
+        return {"count": np.int64(self.count),
+                "moments": np.array([self.mean, self.m2, self.m3, self.m4, self.minimum, self.maximum])}
+
+    @classmethod
+    def from_state(cls, state):
+        acc = cls()
+        acc.count = int(state["count"])
+        acc.mean, acc.m2, acc.m3, acc.m4, acc.minimum, acc.maximum = state["moments"].tolist()
+        return acc
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """
+        Builds an accumulator from an iterable of value chunks,
+        e.g. CSVReader.iter_numeric_chunks(), without holding the whole column.
+        """
+        acc = cls()
+        for chunk in chunks:
+            acc.update_many(chunk)
+        return acc
+
+    def variance(self):
+        """
+        Sample variance (n - 1 denominator), matching statistics.variance.
+        """
+        if self.count < 2:
+            raise ValueError("Variance requires at least two data points.")
+        return self.m2 / (self.count - 1)
+
+    def standard_deviation(self):
+        return math.sqrt(self.variance())
+
+    def skewness(self):
+        """
+        Biased sample skewness, matching scipy.stats.skew defaults.
+        """
+        if self.count == 0 or self.m2 == 0:
+            return math.nan
+        return math.sqrt(self.count) * self.m3 / self.m2 ** 1.5
+
+    def kurtosis(self):
+        """
+        Biased excess (Fisher) kurtosis, matching scipy.stats.kurtosis defaults.
+        """
+        if self.count == 0 or self.m2 == 0:
+            return math.nan
+        return self.count * self.m4 / (self.m2 * self.m2) - 3.0
+
+
+class CoMomentAccumulator:
+    """
+    Streaming accumulator for the co-moment of a pair of columns: count, both means,
+    both sums of squared deviations and the sum of cross deviations.
+    Chunks are combined with the pairwise (Chan et al.) update, so Pearson r can be
+    maintained over appended rows without revisiting earlier ones.
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2_x = 0.0
+        self.m2_y = 0.0
+        self.c_xy = 0.0
+
+    def update_arrays(self, x, y):
+        """
+        Adds a chunk of pairs given as two equal-length float arrays (complete pairs only).
+        """
+        n = len(x)
+        if n == 0:
+            return self
+        chunk = CoMomentAccumulator()
+        chunk.count = n
+        chunk.mean_x, chunk.mean_y = float(x.mean()), float(y.mean())
+        dx, dy = x - chunk.mean_x, y - chunk.mean_y
+        chunk.m2_x, chunk.m2_y, chunk.c_xy = float(dx @ dx), float(dy @ dy), float(dx @ dy)
+        return self.merge(chunk)
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+        na, nb = self.count, other.count
+        n = na + nb
+        dx, dy = other.mean_x - self.mean_x, other.mean_y - self.mean_y
+        self.m2_x += other.m2_x + dx * dx * na * nb / n
+        self.m2_y += other.m2_y + dy * dy * na * nb / n
+        self.c_xy += other.c_xy + dx * dy * na * nb / n
+        self.mean_x += dx * nb / n
+        self.mean_y += dy * nb / n
+        self.count = n
+        return self
+
+    def get_state(self):
+        import numpy as np
+
+        return {"count": np.int64(self.count),
+                "moments": np.array([self.mean_x, self.mean_y, self.m2_x, self.m2_y, self.c_xy])}
+
+    @classmethod
+    def from_state(cls, state):
+        acc = cls()
+        acc.count = int(state["count"])
+        acc.mean_x, acc.mean_y, acc.m2_x, acc.m2_y, acc.c_xy = state["moments"].tolist()
+        return acc
+
+    def pearson(self):
+        """
+        Pearson correlation of the pairs seen so far (NaN if undefined).
+        """
+        if self.count < 2 or self.m2_x == 0 or self.m2_y == 0:
+            return math.nan
+        return self.c_xy / math.sqrt(self.m2_x * self.m2_y)
+
+
+# Columns with at most this many distinct values get one histogram line per value.
+MAX_DISCRETE_LINES = 30
+
+def bin_edges(minimum, maximum, count, rule="auto", iqr=None, bins=None, width=None, max_bins=100):
+    """
+    Returns histogram bin edges for data spanning [minimum, maximum].
+    rule: "sturges" (log2(n) + 1 bins), "fd" (Freedman-Diaconis width 2*IQR/n^(1/3)),
+    "fixed" (bins of the given width) or "auto" (fd when an IQR is available, else sturges).
+    An explicit bins count overrides the rule. The number of bins is capped at max_bins.
+    """
+    import numpy as np
+
+    if count == 0 or not math.isfinite(minimum) or not math.isfinite(maximum):
+        raise ValueError("Cannot bin an empty column.")
+    if maximum == minimum:
+        return np.array([minimum - 0.5, maximum + 0.5])
+
+    span = maximum - minimum
+    if bins is None:
+        if rule == "auto":
+            rule = "fd" if iqr else "sturges"
+        if rule == "sturges":
+            bins = int(math.ceil(math.log2(count))) + 1
+        elif rule == "fd":
+            if not iqr:
+                raise ValueError("Freedman-Diaconis binning needs a positive IQR.")
+            bins = int(math.ceil(span / (2 * iqr / count ** (1 / 3))))
+        elif rule == "fixed":
+            if not width or width <= 0:
+                raise ValueError("Fixed-width binning needs a positive bin width.")
+            bins = int(math.ceil(span / width))
+        else:
+            raise ValueError(f"Unknown binning rule '{rule}'.")
+    bins = max(1, min(int(bins), max_bins))
+    return np.linspace(minimum, maximum, bins + 1)
+
+class Histogram:
+    """
+    Counts over fixed bin edges. Chunks can be added with update() and partial
+    histograms over the same edges combined with merge(), so it works on streams.
+    """
+    def __init__(self, edges):
+        import numpy as np
+
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+
+    def update(self, values, weights=None):
+        import numpy as np
+
+        counts, _ = np.histogram(np.asarray(values, dtype=float), bins=self.edges, weights=weights)
+        self.counts += np.rint(counts).astype(np.int64)
+        return self
+
+    def merge(self, other):
+        self.counts += other.counts
+        return self
+
+    def render(self, width=None):
+        """
+        Renders one line per bin, with bars scaled to fit `width` columns
+        (default: the terminal width). The text is built with a single join.
+        """
+        labels = [f"{lo:.4g} - {hi:.4g}" for lo, hi in zip(self.edges[:-1], self.edges[1:])]
+        return _render_bars(labels, self.counts.tolist(), width)
+
+def _render_bars(labels, counts, width=None):
+    """
+    Joins "label: bar count" lines. Bars keep one block per count unless the largest
+    would not fit in the available width, in which case all bars are scaled down.
+    """
+    if not counts:
+        return ""
+    width = width or shutil.get_terminal_size((80, 24)).columns
+    label_width = max(len(label) for label in labels)
+    count_width = len(str(max(counts)))
+    room = max(10, width - label_width - count_width - 4)
+    peak = max(counts)
+    scale = min(1.0, room / peak) if peak else 1.0
+    lines = [f"{label:>{label_width}}: {'█' * int(round(count * scale))} {count}"
+             if scale < 1 else f"{label:>{label_width}}: {'█' * count}"
+             for label, count in zip(labels, counts)]
+    return "\n".join(lines) + "\n"
+
+class ColumnSummary:
+    """
+    Mergeable partial statistics for one column: moments, min/max, counts of
+    valid and missing cells, a quantile sketch (k sets its accuracy) and a
+    frequency counter that falls back to sketches on high-cardinality data.
+    Summaries of separate chunks combine with merge().
+    """
+    def __init__(self, k=200):
+        from sketch_module import KLLSketch, FrequencyCounter
+
+        self.moments = MomentAccumulator()
+        self.quantiles = KLLSketch(k)
+        self.frequencies = FrequencyCounter()
+        self.missing = 0
+
+    @profiled
+    def update(self, values, valid):
+        """
+        Adds a chunk given as a float array and its validity mask.
+        """
+        count(rows=len(valid))
+        present = values[valid]
+        self.moments.update_array(present)
+        self.quantiles.update_many(present)
+        self.frequencies.update_many(present)
+        self.missing += int(len(valid) - valid.sum())
+        return self
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.quantiles.merge(other.quantiles)
+        self.frequencies.merge(other.frequencies)
+        self.missing += other.missing
+        return self
+
+    def get_state(self):
+        """
+        The summary as a flat {name: array} dict without Python objects, so it can be
+        saved with numpy.savez and loaded with allow_pickle=False.
+        """
+        import numpy as np
+
+        state = {"missing": np.int64(self.missing)}
+        for part, obj in (("moments", self.moments), ("quantiles", self.quantiles), ("frequencies", self.frequencies)):
+            state.update({f"{part}.{key}": value for key, value in obj.get_state().items()})
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        from sketch_module import KLLSketch, FrequencyCounter
+
+        def part(name):
+            return {key[len(name) + 1:]: value for key, value in state.items() if key.startswith(name + ".")}
+
+        summary = cls()
+        summary.moments = MomentAccumulator.from_state(part("moments"))
+        summary.quantiles = KLLSketch.from_state(part("quantiles"))
+        summary.frequencies = FrequencyCounter.from_state(part("frequencies"))
+        summary.missing = int(state["missing"])
+        return summary
+
+    @property
+    def count(self):
+        return self.moments.count
+
+    def histogram(self, rule="auto", bins=None, width=None):
+        """
+        Approximate histogram built from the streaming min/max and the quantile sketch:
+        each retained sketch item is counted with its weight, so no values are reread.
+        """
+        import numpy as np
+
+        m = self.moments
+        iqr = self.quantiles.iqr() if m.count else None
+        hist = Histogram(bin_edges(m.minimum, m.maximum, m.count, rule, iqr, bins, width))
+        for level, items in enumerate(self.quantiles.compactors):
+            if items:
+                hist.update(items, weights=np.full(len(items), 2.0 ** level))
+        return hist
+
+    @classmethod
+    def from_chunks(cls, chunks, k=200):
+        """
+        Builds a summary from an iterable of numeric chunks (lists or arrays), e.g.
+        CSVReader.iter_numeric_chunks(), holding one chunk at a time. NaN and infinite
+        values are counted as missing.
+        """
+        import numpy as np
+
+        summary = cls(k)
+        for chunk in chunks:
+            values = np.asarray(chunk, dtype=float)
+            summary.update(values, np.isfinite(values))
+        return summary
+
+    def summary(self):
+        """
+        The statistics of StatisticsCalculator.summary() from the streamed state.
+        Median and quartiles come from the quantile sketch: exact for small columns,
+        within quantiles.rank_error() of the true rank otherwise.
+        """
+        m = self.moments
+        if m.count == 0:
+            raise ValueError("No numeric data to summarize.")
+        row = self.as_dict(frequencies=True)
+        keys = ("count", "mean", "median", "mode", "std", "variance", "skewness", "kurtosis", "min", "max", "q1", "q3")
+        row["variance"] = m.variance() if m.count > 1 else math.nan
+        return {key: row[key] for key in keys}
+
+    def text_histogram(self, columns=None):
+        """
+        Like StatisticsCalculator.text_histogram(): one line per value while the counts
+        are exact and few, otherwise binned from the quantile sketch.
+        """
+        freq = self.frequencies.distribution()
+        if len(freq) <= MAX_DISCRETE_LINES and not self.frequencies.approximate:
+            return _render_bars([f"{key:>6}" for key in freq], list(freq.values()), columns)
+        return self.histogram().render(columns)
+
+    def as_dict(self, frequencies=False):
+        """
+        Returns the summary as a plain dictionary of statistics. The mode and the
+        number of distinct values are only added with frequencies=True, so tables
+        and snapshots that never show them do not query the frequency sketches.
+        """
+        m = self.moments
+        row = {
+            "count": m.count,
+            "missing": self.missing,
+            "mean": m.mean if m.count else math.nan,
+            "std": m.standard_deviation() if m.count > 1 else math.nan,
+            "min": m.minimum if m.count else math.nan,
+            "max": m.maximum if m.count else math.nan,
+            "q1": self.quantiles.quantile(0.25) if m.count else math.nan,
+            "median": self.quantiles.median() if m.count else math.nan,
+            "q3": self.quantiles.quantile(0.75) if m.count else math.nan,
+            "skewness": m.skewness(),
+            "kurtosis": m.kurtosis(),
+        }
+        if frequencies:
+            row["mode"] = self.frequencies.mode() if m.count else math.nan
+            row["distinct"] = self.frequencies.distinct()
+        return row
+
 
 class StatisticsCalculator:
-    def __init__(self, data: list[float]):
+    def __init__(self, data: list[float], frequency_threshold=100000):
         """
         Initialize the class with a list of numerical data.
+        Derived quantities (moments, sorted data, value counts, histogram) are computed
+        lazily on first use and memoized, so printing the results and writing a report
+        from the same object costs a single computation.
+        Value counts stay exact up to frequency_threshold distinct values and then
+        switch to fixed-memory sketches (see FrequencyCounter); None keeps them exact.
         """
-        self.data = [float(x) for x in data if isinstance(x, (int, float, str)) and str(x).strip().replace('.', '', 1).isdigit()]
+        self.data = self._clean(data)
         if not self.data:
             raise ValueError("No valid numerical data provided.")
+        self.frequency_threshold = frequency_threshold
+        self._cache = {}
+
+    @staticmethod
+    @profiled
+    def _clean(values):
+        """
+        Keeps finite numbers (including negatives) and numeric strings, as floats.
+        """
+        cleaned = []
+        for x in values:
+            if isinstance(x, bool) or not isinstance(x, (numbers.Real, str)):
+                continue
+            try:
+                value = float(x)
+            except ValueError:
+                continue
+            if math.isfinite(value):
+                cleaned.append(value)
+        count(rows=len(cleaned))
+        return cleaned
+
+    def _cached(self, key, compute):
+        """
+        Returns the memoized value for key, computing it on first request.
+        """
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def append(self, values):
+        """
+        Adds more data points. Cached results are invalidated, except the moments,
+        which are updated with just the new values.
+        """
+        new = self._clean(values)
+        if not new:
+            return
+        self.data.extend(new)
+        moments = self._cache.get("moments")
+        self._cache.clear()
+        if moments is not None:
+            self._cache["moments"] = moments.update_many(new)
+
+    @property
+    def moments(self):
+        """
+        Count, mean and central moments gathered in a single pass over the data.
+        Shared by mean, variance, standard deviation, skewness and kurtosis.
+        """
+        return self._cached("moments", lambda: MomentAccumulator().update_many(self.data))
+
+    @property
+    def sorted_data(self):
+        """
+        The data in ascending order, shared by median and quantiles.
+        """
+        return self._cached("sorted", lambda: sorted(self.data))
+
+    @property
+    def frequencies(self):
+        """
+        Value counter shared by mode and frequency_distribution.
+        Its error_bounds() say whether the counts are exact.
+        """
+        from sketch_module import FrequencyCounter
+
+        return self._cached("counts", lambda: FrequencyCounter(self.frequency_threshold).update_many(self.data))
 
     def mean(self):
-        return statistics.mean(self.data)
+        return self.moments.mean
 
     def median(self):
-        return statistics.median(self.data)
+        ordered = self.sorted_data
+        mid = len(ordered) // 2
+        if len(ordered) % 2:
+            return ordered[mid]
+        return (ordered[mid - 1] + ordered[mid]) / 2
+
+    def quantile(self, q):
+        """
+        Exact quantile by linear interpolation between the two nearest ranks
+        (same convention as numpy.quantile). Uses the shared sorted data.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1.")
+        ordered = self.sorted_data
+        pos = q * (len(ordered) - 1)
+        lower = math.floor(pos)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+    def iqr(self):
+        return self.quantile(0.75) - self.quantile(0.25)
 
     def mode(self):
-        try:
-            return statistics.mode(self.data)
-        except statistics.StatisticsError:
+        if self.frequencies.total == 0:
             return "No unique mode"
+        return self.frequencies.mode()
 
     def standard_deviation(self):
-        return statistics.stdev(self.data)
+        return self.moments.standard_deviation()
 
     def variance(self):
-        return statistics.variance(self.data)
+        return self.moments.variance()
 
     def skewness(self):
-        return skew(self.data)
+        return self.moments.skewness()
 
     def kurtosis(self):
-        return kurtosis(self.data)
+        return self.moments.kurtosis()
 
     def frequency_distribution(self):
-        freq = {}
-        for num in self.data:
-            freq[num] = freq.get(num, 0) + 1
-        return dict(sorted(freq.items()))
-
-    def text_histogram(self):
-        freq = self.frequency_distribution()
-        histogram = ""
-        for key, count in freq.items():
-            histogram += f"{key:>6}: {'█' * count}\n"
-        return histogram
+        return self._cached("frequency", self.frequencies.distribution)
+
+    def histogram(self, rule="auto", bins=None, width=None):
+        """
+        Binned Histogram of the data (see bin_edges() for the rules).
+        """
+        def build():
+            moments = self.moments
+            edges = bin_edges(moments.minimum, moments.maximum, moments.count, rule, self.iqr(), bins, width)
+            return Histogram(edges).update(self.data)
+        return self._cached(("histogram", rule, bins, width), build)
+
+    def text_histogram(self, rule="auto", bins=None, width=None, columns=None):
+        """
+        Text histogram: one line per value for columns with few distinct values,
+        otherwise one line per bin. Bars are scaled to the terminal width (or `columns`),
+        so the output stays bounded in size however large the data is.
+        """
+        def render():
+            freq = self.frequency_distribution()
+            if bins is None and width is None and rule == "auto" and len(freq) <= MAX_DISCRETE_LINES \
+                    and not self.frequencies.approximate:
+                return _render_bars([f"{key:>6}" for key in freq], list(freq.values()), columns)
+            return self.histogram(rule, bins, width).render(columns)
+        return self._cached(("text_histogram", rule, bins, width, columns), render)
+
+    @profiled
+    def summary(self):
+        """
+        Every statistic of the report in one dictionary. Computed once and memoized,
+        so printing and writing the report in several formats recomputes nothing.
+        """
+        def build():
+            n = self.moments.count
+            if n == 0:
+                raise ValueError("No numeric data to summarize.")
+            return {
+                "count": n,
+                "mean": self.mean(),
+                "median": self.median(),
+                "mode": self.mode(),
+                "std": self.standard_deviation() if n > 1 else math.nan,
+                "variance": self.variance() if n > 1 else math.nan,
+                "skewness": self.skewness(),
+                "kurtosis": self.kurtosis(),
+                "min": self.moments.minimum,
+                "max": self.moments.maximum,
+                "q1": self.quantile(0.25),
+                "q3": self.quantile(0.75),
+            }
+        return self._cached("summary", build)
 
     def generate_report(self, filename: str):
         """
         Generates a text report of all statistics and saves to a file.
         """
-        with open(filename, "w") as file:
-            file.write("STATISTICAL ANALYSIS REPORT\n")
-            file.write("===========================\n\n")
-            file.write(f"Count: {len(self.data)}\n")
-            file.write(f"Mean: {self.mean():.2f}\n")
-            file.write(f"Median: {self.median()}\n")
-            file.write(f"Mode: {self.mode()}\n")
-            file.write(f"Standard Deviation: {self.standard_deviation():.2f}\n")
-            file.write(f"Variance: {self.variance():.2f}\n")
-            file.write(f"Skewness: {self.skewness():.2f}\n")
-            file.write(f"Kurtosis: {self.kurtosis():.2f}\n\n")
-            file.write("Frequency Distribution:\n")
-            for k, v in self.frequency_distribution().items():
-                file.write(f"  {k}: {v}\n")
-            file.write("\nText-Based Histogram:\n")
-            file.write(self.text_histogram())
+        from report_writer import ReportWriter
+
+        ReportWriter.write_descriptive_report(filename, self)
 
 
 #             Features in This File
 # Function	Description
+# MomentAccumulator	Single-pass, mergeable count/mean/M2/M3/M4 accumulator
+# CoMomentAccumulator	Single-pass, mergeable co-moment of two columns (Pearson r over appended data)
+# bin_edges() / Histogram	Binning rules and mergeable binned counts with width-aware rendering
+# ColumnSummary	Mergeable per-column partial statistics (moments, min/max, counts, quantile and frequency sketches)
+# get_state() / from_state()	Accumulators and summaries as plain arrays (pickle-free checkpoints)
+# ColumnSummary.from_chunks()	Constant-memory descriptive statistics fed from CSVReader.iter_numeric_chunks()
 # mean()	Average of the dataset
 # median()	Middle value
+# quantile() / iqr()	Exact percentiles and interquartile range
 # mode()	Most frequent value (handles errors)
 # standard_deviation()	Measure of spread
 # variance()	Square of standard deviation
 # skewness()	Measures asymmetry
 # kurtosis()	Measures tailedness
-# frequency_distribution()	Dictionary of value counts
-# text_histogram()	Visualizes frequency distribution using bars
-# generate_report()	Saves the analysis to a file
\ No newline at end of file
+# frequency_distribution()	Dictionary of value counts (heavy hitters only once counts are approximate)
+# text_histogram()	Visualizes frequency distribution using bars (binned and width-scaled for large data)
+# histogram()	Sturges / Freedman-Diaconis / fixed-width binned counts
+# summary()	All report statistics in one memoized dictionary
+# generate_report()	Saves the analysis to a file (rendered by report_writer)
+# append()	Adds data and invalidates memoized results
\ No newline at end of file
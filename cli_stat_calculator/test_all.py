@@ -1,9 +1,32 @@
 #  test_all.py module. This file contains unit tests for your core logic: statistical calculations, correlation, and hypothesis testing. These tests will help ensure your calculator is functioning correctly and handles edge cases.
 
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
-from stats_module import StatisticsCalculator
-from correlation_module import CorrelationAnalyzer
-from hypothesis_module import HypothesisTester
+from unittest import mock
+import numpy as np
+from file_handler import CSVReader, new_file_mode
+from cache_module import ColumnCache
+import parallel_module
+from parallel_module import describe_columns
+from batch_module import load_job_spec, plan_columns, run_job_spec
+import cli_calculator
+from stats_module import StatisticsCalculator, MomentAccumulator, CoMomentAccumulator
+from sketch_module import KLLSketch, FrequencyCounter, HyperLogLog, hash_values
+from correlation_module import CorrelationAnalyzer, CorrelationMatrix, count_inversions, kendall_tau_b
+import resampling_module
+from incremental_module import IncrementalStats
+from follow_module import Follower, RollingWindow, follow
+from groupby_module import GroupedMoments, describe_groups, factorize
+from report_writer import Report, ReportWriter, write_report
+from hypothesis_module import ContingencyTable, HypothesisTester, adjust_p_values
+import profile_module
+from profile_module import count, format_profile, profiling, stage
+from server_module import StatsServer, StatsService, WarmStore, read_token, write_token, request as server_request
 
 class TestStatisticsCalculator(unittest.TestCase):
     def setUp(self):
@@ -19,6 +42,44 @@ class TestStatisticsCalculator(unittest.TestCase):
     def test_mode(self):
         self.assertEqual(self.stats.mode(), 20)
 
+    def test_streamed_summary_matches(self):
+        from stats_module import ColumnSummary
+
+        streamed = ColumnSummary.from_chunks([[10, 20], [20, float("nan")], [30, 40]])
+        expected = self.stats.summary()
+        for key, value in streamed.summary().items():
+            self.assertAlmostEqual(value, expected[key], msg=key)
+        self.assertEqual(streamed.missing, 1)
+
+    def test_cli_descriptive_streams_the_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "d.csv")
+            with open(path, "w") as f:
+                f.write("Score\n10\n20\n20\n30\n40\n")
+            with mock.patch("builtins.input", return_value="n"), \
+                    mock.patch.object(CSVReader, "load_csv", side_effect=AssertionError("loads whole file")), \
+                    mock.patch("sys.stdout", new_callable=io.StringIO) as out:
+                cli_calculator.handle_descriptive_stats(path)
+        self.assertIn("Mean: 24.00", out.getvalue())
+        self.assertIn("Median: 20.0", out.getvalue())
+
+    def test_cli_high_cardinality_column(self):
+        values = np.random.default_rng(9).normal(50, 10, 120000)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "unique.csv")
+            with open(path, "w") as f:
+                f.write("x\n" + "\n".join(repr(v) for v in values.tolist()) + "\n")
+            with mock.patch("builtins.input", return_value="n"), \
+                    mock.patch("sys.stdout", new_callable=io.StringIO) as out:
+                cli_calculator.handle_descriptive_stats(path)
+                cli_calculator.print_column_summaries(describe_columns(path))
+                self.assertEqual(cli_calculator.main(["incremental", path, "--checkpoint",
+                                                      os.path.join(tmp, "ckpt")]), 0)
+            job = run_job_spec({"jobs": [{"file": path, "descriptive": {}}]})
+        self.assertIn("Mode: ", out.getvalue())
+        self.assertEqual(out.getvalue().count("120000"), 2)  # Column table of menu 4 and of incremental
+        self.assertTrue(job["ok"])
+
     def test_standard_deviation(self):
         self.assertAlmostEqual(self.stats.standard_deviation(), 11.40, places=2)
 
@@ -33,6 +94,843 @@ class TestStatisticsCalculator(unittest.TestCase):
         kurt = self.stats.kurtosis()
         self.assertIsInstance(kurt, float)
 
+    def test_results_are_memoized(self):
+        first = self.stats.frequency_distribution()
+        self.stats.median()
+        self.stats.text_histogram()
+        self.assertIs(self.stats.frequency_distribution(), first)
+        self.assertIs(self.stats.sorted_data, self.stats.sorted_data)
+
+    def test_text_histogram_small_data(self):
+        self.assertEqual(self.stats.text_histogram(), "  10.0: █\n  20.0: ██\n  30.0: █\n  40.0: █\n")
+
+    def test_text_histogram_is_binned_and_bounded(self):
+        values = np.random.default_rng(3).normal(50, 10, 20000).tolist()
+        stats = StatisticsCalculator(values)
+        text = stats.text_histogram(columns=60)
+        lines = text.splitlines()
+        self.assertLessEqual(len(lines), 100)
+        self.assertTrue(all(len(line) <= 60 for line in lines))
+        self.assertEqual(sum(int(line.split()[-1]) for line in lines), 20000)
+        self.assertEqual(len(stats.text_histogram(rule="sturges").splitlines()), 16)
+        span = max(values) - min(values)
+        self.assertEqual(len(stats.histogram(rule="fixed", width=25).counts), -(-span // 25))
+
+    def test_append_invalidates_cache(self):
+        self.stats.median()
+        self.stats.frequency_distribution()
+        self.stats.append([40, 40, 50])
+        self.assertEqual(self.stats.median(), 35)
+        self.assertEqual(self.stats.mode(), 40)
+        self.assertAlmostEqual(self.stats.mean(), 250 / 8)
+        self.assertEqual(self.stats.frequency_distribution()[40.0], 3)
+
+class TestMomentAccumulator(unittest.TestCase):
+    def setUp(self):
+        self.data = [2.5, 3.0, 7.25, 1.0, 9.5, 4.0, 4.0, 6.75]
+
+    def test_matches_calculator(self):
+        acc = MomentAccumulator().update_many(self.data)
+        stats = StatisticsCalculator([10, 20, 20, 30, 40])
+        self.assertEqual(acc.count, len(self.data))
+        self.assertAlmostEqual(stats.skewness(), 0.2715, places=4)
+        self.assertAlmostEqual(stats.kurtosis(), -1.0444, places=4)
+        self.assertAlmostEqual(acc.variance(), 8.0179, places=4)
+
+    def test_merge_equals_single_pass(self):
+        whole = MomentAccumulator().update_many(self.data)
+        left = MomentAccumulator().update_many(self.data[:3])
+        right = MomentAccumulator().update_many(self.data[3:])
+        merged = left.merge(right)
+        self.assertEqual(merged.count, whole.count)
+        for name in ("mean", "m2", "m3", "m4", "minimum", "maximum"):
+            self.assertAlmostEqual(getattr(merged, name), getattr(whole, name), places=9)
+
+    def test_from_csv_chunks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "values.csv")
+            with open(path, "w") as f:
+                f.write("value\n" + "\n".join(str(v) for v in self.data) + "\n")
+            acc = MomentAccumulator.from_chunks(CSVReader.iter_numeric_chunks(path, chunk_size=3))
+        self.assertEqual(acc.count, len(self.data))
+        self.assertAlmostEqual(acc.mean, sum(self.data) / len(self.data))
+
+class TestKLLSketch(unittest.TestCase):
+    def test_exact_for_small_inputs(self):
+        sketch = KLLSketch().update_many([10, 20, 20, 30, 40])
+        self.assertTrue(sketch.is_exact)
+        self.assertEqual(sketch.median(), 20)
+        self.assertEqual(sketch.iqr(), 10)
+
+    def test_approximate_quantiles_within_rank_error(self):
+        values = np.random.default_rng(7).lognormal(size=50000)
+        ordered = np.sort(values)
+        halves = np.array_split(values, 2)
+        sketch = KLLSketch(k=100).update_many(halves[0][:7000])
+        sketch.update_many(halves[0][7000:].tolist())
+        sketch.merge(KLLSketch(k=100, seed=3).update_many(halves[1]))
+        self.assertFalse(sketch.is_exact)
+        self.assertEqual(sketch.count, len(values))
+        self.assertLess(sum(len(c) for c in sketch.compactors), 1000)
+        for q in (0.1, 0.5, 0.9):
+            rank = np.searchsorted(ordered, sketch.quantile(q)) / len(values)
+            self.assertLess(abs(rank - q), 3 * sketch.rank_error())
+
+    def test_exact_calculator_quantiles(self):
+        stats = StatisticsCalculator([10, 20, 20, 30, 40])
+        self.assertEqual(stats.quantile(0.25), 20)
+        self.assertEqual(stats.quantile(1), 40)
+        self.assertEqual(stats.iqr(), 10)
+
+class TestFrequencyCounter(unittest.TestCase):
+    def test_exact_below_threshold(self):
+        counter = FrequencyCounter(threshold=10).update_many([3.0, 1.0, 3.0, 2.0, 1.0])
+        self.assertFalse(counter.approximate)
+        self.assertEqual(counter.mode(), 3.0)
+        self.assertEqual(counter.distribution(), {1.0: 2, 2.0: 1, 3.0: 2})
+        self.assertTrue(counter.error_bounds()["exact"])
+
+    def test_switches_to_sketches(self):
+        rng = np.random.default_rng(11)
+        values = np.concatenate([rng.random(20000), np.full(500, 42.0), np.full(300, 7.0)])
+        rng.shuffle(values)
+        counter = FrequencyCounter(threshold=1000, capacity=50)
+        for chunk in np.array_split(values, 8):
+            counter.update_many(chunk)
+        self.assertTrue(counter.approximate)
+        self.assertEqual(counter.mode(), 42.0)
+        bounds = counter.error_bounds()
+        self.assertLessEqual(abs(counter.distinct() - 20002), 3 * bounds["distinct_relative_error"] * 20002)
+        self.assertGreaterEqual(counter.estimate(7.0), 300)
+        self.assertLessEqual(counter.estimate(7.0), 300 + bounds["count_error"])
+        self.assertLessEqual(len(counter.top_k.counts), 50)
+
+    def test_all_unique_values_keep_candidates(self):
+        values = np.random.default_rng(5).normal(size=150000)
+        counter = FrequencyCounter(capacity=100)
+        for chunk in np.array_split(values, 4):
+            counter.update_many(chunk)
+        self.assertTrue(counter.approximate)
+        self.assertEqual(len(counter.top_k.counts), 100)
+        self.assertIn(counter.mode(), set(values.tolist()))
+        for key, count in counter.most_common(5):
+            self.assertGreaterEqual(count, 1)
+            self.assertLessEqual(count - counter.top_k.errors[key], 1)
+        self.assertIn(StatisticsCalculator(values.tolist()).mode(), set(values.tolist()))
+        with self.assertRaises(ValueError):
+            FrequencyCounter().mode()
+
+    def test_merge_matches_single_counter(self):
+        left = FrequencyCounter(threshold=3).update_many(["a", "b", "a", "c", "d"])
+        right = FrequencyCounter(threshold=3).update_many(["a", "e"])
+        merged = left.merge(right)
+        self.assertEqual(merged.total, 7)
+        self.assertEqual(merged.mode(), "a")
+
+    def test_hyperloglog_small_counts(self):
+        sketch = HyperLogLog().update_hashes(hash_values(np.arange(500.0)))
+        self.assertAlmostEqual(sketch.count(), 500, delta=10)
+
+class TestColumnarLoader(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "scores.csv")
+        with open(self.path, "w") as f:
+            f.write("ID,Math,English,Gender\n")
+            f.write("S1,78,82,M\nS2,85,,F\nS3,n/a,70,F\nS4,90,88,M\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_only_requested_columns_are_loaded(self):
+        columns = CSVReader.load_columns(self.path, ["Math", "English"], chunk_rows=3)
+        self.assertEqual(list(columns), ["Math", "English"])
+        values, valid = columns["Math"]
+        self.assertEqual(values.dtype.name, "float64")
+        self.assertEqual(valid.tolist(), [True, True, False, True])
+        self.assertEqual(values[valid].tolist(), [78.0, 85.0, 90.0])
+        self.assertEqual(columns["English"][1].tolist(), [True, False, True, True])
+
+    def test_unknown_column(self):
+        with self.assertRaises(ValueError):
+            CSVReader.load_columns(self.path, ["Science"])
+
+    def test_mmap_loader_matches_csv_loader(self):
+        with open(self.path, "a") as f:
+            f.write("S5, -1.5 ,1e2,F\r\n\n")
+        expected = CSVReader.load_columns(self.path, ["Math", "English"], use_mmap=False)
+        mapped = CSVReader.load_columns_mmap(self.path, ["Math", "English"], window_bytes=16)
+        for name in expected:
+            self.assertEqual(mapped[name][1].tolist(), expected[name][1].tolist())
+            self.assertEqual(mapped[name][0][mapped[name][1]].tolist(),
+                             expected[name][0][expected[name][1]].tolist())
+
+    def test_mmap_loader_quoted_fallback(self):
+        with open(self.path, "a") as f:
+            f.write('"S,5",60,61,M\n')
+        mapped = CSVReader.load_columns_mmap(self.path, ["Math"])
+        self.assertEqual(mapped["Math"][0][-1], 60.0)
+
+    def test_analyzers_accept_parsed_columns(self):
+        columns = CSVReader.load_columns(self.path, ["Math"])
+        tester = HypothesisTester(columns)
+        self.assertEqual(len(tester._clean_column("Math")), 3)
+
+class TestColumnCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "scores.csv")
+        with open(self.path, "w") as f:
+            f.write("Math,English\n78,82\n85,\n90,88\n")
+        self.cache = ColumnCache(os.path.join(self.tmp.name, "cache"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_second_load_is_served_from_cache(self):
+        first = self.cache.load_columns(self.path, ["Math"])
+        self.assertGreater(self.cache.size(), 0)
+        second = self.cache.load_columns(self.path, ["Math"])
+        self.assertIsInstance(second["Math"][0], np.memmap)
+        self.assertEqual(second["Math"][0].tolist(), first["Math"][0].tolist())
+        both = self.cache.load_columns(self.path)
+        self.assertEqual(both["English"][1].tolist(), [True, False, True])
+
+    def test_changed_file_invalidates_entry(self):
+        self.cache.load_columns(self.path, ["Math"])
+        with open(self.path, "a") as f:
+            f.write("60,61\n")
+        reloaded = self.cache.load_columns(self.path, ["Math"])
+        self.assertEqual(reloaded["Math"][0].tolist(), [78.0, 85.0, 90.0, 60.0])
+        self.assertEqual(len(os.listdir(self.cache.directory)), 1)
+
+    def test_eviction_respects_size_cap(self):
+        other = os.path.join(self.tmp.name, "other.csv")
+        with open(other, "w") as f:
+            f.write("Math\n1\n2\n")
+        self.cache.load_columns(self.path, ["Math"])
+        self.cache.max_bytes = 1
+        self.cache.load_columns(other, ["Math"])
+        self.assertEqual(len(os.listdir(self.cache.directory)), 1)
+
+    def test_unfinished_entries_are_counted_and_evicted(self):
+        self.cache.load_columns(self.path, ["Math"])
+        entry = os.path.join(self.cache.directory, os.listdir(self.cache.directory)[0])
+        mode = new_file_mode()
+        self.assertTrue(all(os.stat(os.path.join(entry, f)).st_mode & 0o777 == mode for f in os.listdir(entry)))
+        size = self.cache.size()
+        interrupted = os.path.join(self.cache.directory, "interrupted")
+        os.makedirs(interrupted)
+        with open(os.path.join(interrupted, "x.values.npy"), "wb") as f:
+            f.write(b"0" * 1000)
+        self.assertEqual(self.cache.size(), size + 1000)
+        self.cache.max_bytes = size
+        self.cache._evict()
+        self.assertFalse(os.path.exists(interrupted))
+        self.assertEqual(self.cache.size(), size)
+
+class TestParallelSummary(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "scores.csv")
+        with open(self.path, "w") as f:
+            f.write("ID,Math,English\n")
+            for i in range(200):
+                english = "" if i % 10 == 0 else str(50 + i % 37)
+                f.write(f"S{i},{60 + i % 41},{english}\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_byte_ranges_cover_file(self):
+        ranges = CSVReader.split_byte_ranges(self.path, 7)
+        self.assertGreater(len(ranges), 1)
+        self.assertEqual(ranges[-1][1], os.path.getsize(self.path))
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+
+    def test_per_column_summary_matches_serial(self):
+        columns = CSVReader.load_columns(self.path, ["Math", "English"])
+        with mock.patch.object(parallel_module, "MIN_PARALLEL_BYTES", 0):
+            summaries = describe_columns(self.path, ["Math", "English"], workers=2, chunk_bytes=256)
+        for name, (values, valid) in columns.items():
+            expected = StatisticsCalculator(values[valid].tolist())
+            result = summaries[name].as_dict()
+            self.assertEqual(result["count"], int(valid.sum()))
+            self.assertEqual(result["missing"], int((~valid).sum()))
+            self.assertAlmostEqual(result["mean"], expected.mean())
+            self.assertAlmostEqual(result["std"], expected.standard_deviation())
+            self.assertLessEqual(abs(result["median"] - expected.median()), 1.0)
+        self.assertEqual(summaries["English"].missing, 20)
+
+class TestResampling(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.x = rng.normal(10, 2, 400)
+        self.y = 0.5 * self.x + rng.normal(0, 1, 400)
+
+    def test_bootstrap_mean_matches_standard_error(self):
+        result = resampling_module.bootstrap_ci(self.x, "mean", resamples=4000, seed=1)
+        self.assertAlmostEqual(result["estimate"], self.x.mean())
+        self.assertLess(result["low"], self.x.mean())
+        self.assertGreater(result["high"], self.x.mean())
+        self.assertAlmostEqual(result["std_error"], self.x.std(ddof=1) / 20, delta=0.01)
+
+    def test_discrete_column_uses_exact_count_resampling(self):
+        values = np.arange(20.0).repeat(50)
+        by_index = resampling_module.replicate("median", {"x": values}, 4000, len(values), seed=3)
+        distinct, counts = np.unique(values, return_counts=True)
+        by_counts = resampling_module.replicate(
+            "median_counts", {"values": distinct, "probs": counts / len(values), "n": len(values)},
+            4000, len(distinct), seed=3)
+        np.testing.assert_allclose(np.quantile(by_index, [0.05, 0.5, 0.95]),
+                                   np.quantile(by_counts, [0.05, 0.5, 0.95]))
+
+    def test_seeded_results_do_not_depend_on_workers(self):
+        with mock.patch.object(resampling_module, "MIN_PARALLEL_ELEMENTS", 0):
+            serial = resampling_module.replicate("mean", {"x": self.x}, 300, len(self.x), seed=7,
+                                                 workers=1, batch_elements=40000)
+            pooled = resampling_module.replicate("mean", {"x": self.x}, 300, len(self.x), seed=7,
+                                                 workers=2, batch_elements=40000)
+        np.testing.assert_array_equal(serial, pooled)
+
+    def test_constant_column_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            resampling_module.bootstrap_correlation_ci([1, 1, 1, 1], [1, 2, 3, 4], resamples=50, seed=0)
+        with self.assertRaises(ValueError):
+            resampling_module._interval(np.array([np.nan, np.nan]), 0.0, 0.95)
+
+    def test_correlation_bootstrap_and_permutation(self):
+        r = np.corrcoef(self.x, self.y)[0, 1]
+        result = resampling_module.bootstrap_correlation_ci(self.x, self.y, resamples=2000, seed=0)
+        self.assertAlmostEqual(result["estimate"], r)
+        self.assertTrue(result["low"] < r < result["high"])
+        stat, p_val = resampling_module.permutation_correlation_test(self.x, self.y, resamples=999, seed=0)
+        self.assertAlmostEqual(stat, r)
+        self.assertAlmostEqual(p_val, 0.001)
+
+    def test_permutation_test_matches_scipy(self):
+        from scipy.stats import permutation_test
+        a, b = self.x[:150], self.x[150:] + 0.4
+        stat, p_val = resampling_module.permutation_test(a, b, resamples=9999, seed=0)
+        expected = permutation_test((a, b), lambda u, v: u.mean() - v.mean(), n_resamples=9999, random_state=0)
+        self.assertAlmostEqual(stat, a.mean() - b.mean())
+        self.assertAlmostEqual(p_val, expected.pvalue, delta=0.02)
+
+class TestIncrementalStats(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "log.csv")
+        rng = np.random.default_rng(5)
+        self.rows = np.round(rng.normal(50, 10, (600, 2)), 2)
+        with open(self.path, "w") as f:
+            f.write("X,Y\n" + "".join(f"{x},{y}\n" for x, y in self.rows[:400]))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_comoment_merge_matches_numpy(self):
+        x, y = self.rows[:, 0], self.rows[:, 1]
+        acc = CoMomentAccumulator().update_arrays(x[:150], y[:150])
+        acc.merge(CoMomentAccumulator().update_arrays(x[150:], y[150:]))
+        self.assertAlmostEqual(acc.pearson(), np.corrcoef(x, y)[0, 1])
+
+    def test_append_parses_only_new_rows(self):
+        self.assertEqual(IncrementalStats(self.path).update(), "full")
+        with open(self.path, "a") as f:
+            f.write("".join(f"{x},{y}\n" for x, y in self.rows[400:]) + "1,")  # last row still being written
+
+        stats = IncrementalStats(self.path)
+        self.assertEqual(stats.update(), "append")
+        self.assertEqual(stats.bytes_read, sum(len(f"{x},{y}\n") for x, y in self.rows[400:]))
+        self.assertEqual(stats.summaries["X"].count, 600)
+        self.assertAlmostEqual(stats.summaries["Y"].moments.mean, self.rows[:, 1].mean())
+        self.assertAlmostEqual(stats.correlations()[("X", "Y")], np.corrcoef(self.rows.T)[0, 1])
+        self.assertEqual(IncrementalStats(self.path).update(), "unchanged")
+
+    def test_rewrite_falls_back_to_full_scan(self):
+        IncrementalStats(self.path).update()
+        with open(self.path, "w") as f:
+            f.write("X,Y\n" + "".join(f"{x},{y}\n" for x, y in self.rows[:100]))
+        stats = IncrementalStats(self.path)
+        self.assertEqual(stats.update(), "full")
+        self.assertEqual(stats.summaries["X"].count, 100)
+        # Different column selection cannot reuse the checkpoint either
+        self.assertEqual(IncrementalStats(self.path, ["X"]).update(), "full")
+
+    def test_checkpoint_is_not_a_pickle(self):
+        import pickle
+        import stat
+
+        os.chmod(self.path, 0o644)
+        IncrementalStats(self.path).update()
+        checkpoint = self.path + ".stats-checkpoint"
+        self.assertEqual(stat.S_IMODE(os.stat(checkpoint).st_mode), 0o644)
+        with np.load(checkpoint, allow_pickle=False) as npz:
+            self.assertIn("summary.0.quantiles.items", npz.files)
+
+        class Planted:
+            def __reduce__(self):
+                return (os.remove, (self.path,))
+        Planted.path = self.path
+        with open(checkpoint, "wb") as f:
+            pickle.dump(Planted(), f)
+        self.assertEqual(IncrementalStats(self.path).update(), "full")
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_final_row_without_line_break(self):
+        with open(self.path, "a") as f:
+            f.write("1.5,2.5")
+        stats = IncrementalStats(self.path)
+        stats.update()
+        self.assertEqual(stats.summaries["X"].count, 400)
+        stats = IncrementalStats(self.path)
+        self.assertEqual(stats.update(final=True), "append")
+        self.assertEqual(stats.summaries["X"].count, 401)
+        with open(self.path, "a") as f:
+            f.write("5\n")  # The row is completed: counted once, as 1.5,2.55
+        stats = IncrementalStats(self.path)
+        self.assertEqual(stats.update(), "append")
+        self.assertEqual(stats.summaries["X"].count, 401)
+        self.assertAlmostEqual(stats.summaries["Y"].moments.maximum, max(self.rows[:400, 1].max(), 2.55))
+
+    def test_summary_state_round_trip(self):
+        from stats_module import ColumnSummary
+
+        values = np.random.default_rng(1).normal(size=50000)
+        summary = ColumnSummary().update(values, np.ones(len(values), dtype=bool))
+        summary.frequencies = FrequencyCounter(threshold=10).update_many(values[:100])
+        restored = ColumnSummary.from_state(summary.get_state())
+        self.assertEqual(restored.as_dict(), summary.as_dict())
+        more = np.arange(1000.0)
+        summary.update(more, np.ones(1000, dtype=bool))
+        restored.update(more, np.ones(1000, dtype=bool))
+        self.assertEqual(restored.quantiles.compactors, summary.quantiles.compactors)
+
+class TestFollowMode(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "live.csv")
+        with open(self.path, "w") as f:
+            f.write("A,B\n1,2\n3,5\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_rolling_window_matches_recompute(self):
+        rng = np.random.default_rng(2)
+        x = rng.normal(100, 5, 500)
+        y = 0.3 * x + rng.normal(size=500)
+        window = RollingWindow(25, paired=True)
+        for a, b in zip(x, y):
+            window.add(a, b)
+        xs, ys = x[-25:], y[-25:]
+        snapshot = window.snapshot()
+        self.assertEqual(snapshot["count"], 25)
+        self.assertAlmostEqual(snapshot["mean"], xs.mean())
+        self.assertAlmostEqual(snapshot["std"], xs.std(ddof=1))
+        self.assertEqual((snapshot["min"], snapshot["max"]), (xs.min(), xs.max()))
+        self.assertAlmostEqual(snapshot["median"], np.median(xs))
+        self.assertAlmostEqual(snapshot["r"], np.corrcoef(xs, ys)[0, 1])
+
+    def test_window_median_with_ties_and_trends(self):
+        for data in ([3.0, 1.0, 3.0, 3.0, 2.0, 1.0, 1.0, 3.0] * 20, list(range(200)), list(range(200, 0, -1))):
+            window = RollingWindow(4)
+            for i, value in enumerate(data):
+                window.add(value)
+                self.assertEqual(window.median(), np.median(data[max(0, i - 3):i + 1]))
+            self.assertLessEqual(len(window._low) + len(window._high), 2 * 4 + 2)  # Stale entries are cleared
+
+    def test_poll_waits_for_complete_lines_and_restarts_on_truncation(self):
+        follower = Follower(self.path, "A", "B")
+        follower.poll()
+        self.assertEqual(follower.snapshot()["count"], 2)
+        with open(self.path, "a") as f:
+            f.write("4,4\n6,")
+        follower.poll()
+        self.assertEqual(follower.snapshot()["count"], 3)
+        with open(self.path, "a") as f:
+            f.write("9\n")
+        follower.poll()
+        self.assertAlmostEqual(follower.snapshot()["r"], np.corrcoef([1, 3, 4, 6], [2, 5, 4, 9])[0, 1])
+        with open(self.path, "w") as f:
+            f.write("A,B\n10,1\n")
+        follower.poll()
+        self.assertEqual(follower.snapshot()["count"], 1)
+
+    def test_follow_prints_snapshots(self):
+        import asyncio
+        import io
+        output = io.StringIO()
+        asyncio.run(follow(Follower(self.path, "A", window=10), interval=0.01, poll_interval=0.01,
+                           output=output, refreshes=2))
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[-1].startswith("A: n=2 mean=2.00"))
+
+class TestReportWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.stats = StatisticsCalculator([10, 20, 20, 30, 40, 50, 60])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_descriptive_report_creates_directory_and_reuses_results(self):
+        path = os.path.join(self.tmp.name, "results", "report.txt")
+        summary = self.stats.summary()
+        with mock.patch.object(StatisticsCalculator, "variance", side_effect=AssertionError("recomputed")):
+            self.stats.generate_report(path)
+        with open(path) as f:
+            text = f.read()
+        self.assertIn(f"Mean: {summary['mean']:.2f} → Average of dataset", text)
+        self.assertIn("HISTOGRAM (Text-Based)", text)
+        self.assertTrue(text.endswith("END OF REPORT\n"))
+        self.assertEqual(os.listdir(os.path.dirname(path)), ["report.txt"])  # no temp files left
+
+    def test_json_and_columnar_formats(self):
+        report = Report(source="scores.csv")
+        report.add_descriptive("Math", {"count": 3, "mean": 70.0, "mode": "No unique mode"})
+        report.add_descriptive("English", {"count": 2, "mean": float("nan")})
+        report.add_correlation_matrix(["Math", "English", "Art"], [[1, 0.5, 0.1], [0.5, 1, -0.2], [0.1, -0.2, 1]])
+        report.add_test("one_sample", 2.5, 0.03, column="Math")
+
+        with open(write_report(report, os.path.join(self.tmp.name, "r.json"))) as f:
+            data = json.load(f)
+        self.assertIsNone(data["descriptive"]["English"]["statistics"]["mean"])
+        self.assertEqual(len(data["correlations"]), 3)
+
+        table = np.load(write_report(report, os.path.join(self.tmp.name, "r.npz")))
+        self.assertEqual(table["descriptive.column"].tolist(), ["Math", "English"])
+        self.assertTrue(np.isnan(table["descriptive.mode"]).all())
+        np.testing.assert_allclose(table["correlations.value"], [0.5, 0.1, -0.2])
+        self.assertEqual(table["tests.p_value"].tolist(), [0.03])
+
+    def test_new_file_mode_matches_umask(self):
+        umask = os.umask(0o022)
+        os.umask(umask)
+        self.assertEqual(new_file_mode(), 0o666 & ~umask)
+
+    def test_file_mode_follows_umask_and_target(self):
+        path = os.path.join(self.tmp.name, "mode.txt")
+        write_report(Report(), path)
+        self.assertEqual(os.stat(path).st_mode & 0o777, new_file_mode())
+        os.chmod(path, 0o640)
+        write_report(Report(), path)
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o640)
+
+    def test_legacy_writers(self):
+        path = os.path.join(self.tmp.name, "corr.txt")
+        ReportWriter.write_correlation_report(path, "A", "B", 0.75)
+        with open(path) as f:
+            self.assertIn("Strong correlation", f.read())
+
+class TestGroupBy(unittest.TestCase):
+    def test_factorize_skips_blank_keys(self):
+        codes, keys = factorize(["M", "F", "", "M", None, " F "])
+        self.assertEqual(keys, ["F", "M"])
+        self.assertEqual(codes.tolist(), [1, 0, -1, 1, -1, 0])
+
+    def test_describe_groups_matches_per_group_numpy(self):
+        rng = np.random.default_rng(4)
+        keys = rng.choice(["a", "b", "c", "d"], 300)
+        values = rng.normal(size=300)
+        values[::11] = np.nan
+        data = {"key": keys.tolist(), "value": (values, ~np.isnan(values))}
+        result = describe_groups(data, "key", ["value"])
+        stats = result["columns"]["value"]
+        for i, key in enumerate(result["keys"]):
+            x = values[(keys == key) & ~np.isnan(values)]
+            self.assertEqual(stats["count"][i], len(x))
+            self.assertAlmostEqual(stats["mean"][i], x.mean())
+            self.assertAlmostEqual(stats["variance"][i], x.var(ddof=1))
+            self.assertEqual((stats["min"][i], stats["max"][i]), (x.min(), x.max()))
+            np.testing.assert_allclose([stats["q1"][i], stats["median"][i], stats["q3"][i]],
+                                       np.quantile(x, [0.25, 0.5, 0.75]))
+
+    def test_grouped_moments_merge(self):
+        codes = np.array([0, 1, 0, 2, 1, 0])
+        values = np.array([1.0, 4.0, 3.0, 7.0, 6.0, 8.0])
+        whole = GroupedMoments(3).update(codes, values)
+        parts = GroupedMoments(3).update(codes[:2], values[:2]).merge(GroupedMoments(3).update(codes[2:], values[2:]))
+        np.testing.assert_allclose(parts.mean, whole.mean)
+        np.testing.assert_allclose(parts.m2, whole.m2)
+        self.assertTrue(np.isnan(whole.variance()[2]))
+
+class TestBatchMode(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.tmp.name, "scores.csv"), "w") as f:
+            f.write("ID,Math,English,Gender\n")
+            f.write("S1,78,82,M\nS2,85,79,F\nS3,69,,F\nS4,90,88,M\nS5,-3,60,F\n")
+        self.job = {
+            "file": "scores.csv",
+            "descriptive": {"columns": ["Math"], "statistics": ["count", "mean", "min"]},
+            "correlations": [["Math", "English"]],
+            "tests": [{"type": "one_sample", "column": "Math", "popmean": 50},
+                      {"type": "chi_square", "column": "Gender"}],
+        }
+        self.jobfile = os.path.join(self.tmp.name, "job.json")
+        with open(self.jobfile, "w") as f:
+            json.dump({"jobs": [self.job]}, f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_plan_parses_each_column_once(self):
+        numeric, text = plan_columns(self.job, ["ID", "Math", "English", "Gender"])
+        self.assertEqual(numeric, ["Math", "English"])
+        self.assertEqual(text, ["Gender"])
+        self.job["tests"].append({"type": "one_sample", "column": "Gender"})
+        numeric, text = plan_columns(self.job, ["ID", "Math", "English", "Gender"])
+        self.assertEqual(numeric, ["Math", "English"])
+
+    def test_group_by_job(self):
+        self.job["group_by"] = {"by": "Gender", "columns": ["Math"]}
+        self.assertIn("Gender", plan_columns(self.job, ["ID", "Math", "English", "Gender"])[1])
+        results = run_job_spec({"jobs": [dict(self.job, file=os.path.join(self.tmp.name, "scores.csv"))]})
+        grouped = results["results"][0]["group_by"]
+        self.assertEqual(grouped["keys"], ["F", "M"])
+        self.assertEqual(grouped["columns"]["Math"]["mean"], [(85 + 69 - 3) / 3, 84.0])
+
+    def test_batch_t_tests_job(self):
+        self.job["tests"] = [{"type": "t_tests", "test": "welch", "columns": ["Math", "English"],
+                              "group_column": "Gender", "correction": "bonferroni"}]
+        numeric, text = plan_columns(self.job, ["ID", "Math", "English", "Gender"])
+        self.assertEqual(text, ["Gender"])
+        with open(self.jobfile, "w") as f:
+            json.dump(self.job, f)
+        results = run_job_spec(load_job_spec(self.jobfile))
+        self.assertTrue(results["ok"])
+        rows = results["results"][0]["tests"][0]["results"]
+        self.assertEqual([row["column"] for row in rows], ["Math", "English"])
+        self.assertEqual(rows[0]["groups"], ["F", "M"])
+
+    def test_run_job_spec(self):
+        results = run_job_spec(load_job_spec(self.jobfile))
+        self.assertTrue(results["ok"])
+        job = results["results"][0]
+        self.assertEqual(job["descriptive"]["Math"], {"count": 5, "mean": 63.8, "min": -3.0})
+        self.assertEqual(len(job["tests"]), 2)
+        self.assertIn("p_value", job["tests"][0])
+        self.assertAlmostEqual(job["correlations"][0]["value"],
+                               np.corrcoef([78, 85, 90, -3], [82, 79, 88, 60])[0, 1])
+
+    def test_job_report_targets(self):
+        self.job["report"] = "reports/scores.txt"
+        spec = {"jobs": [self.job, dict(self.job, report={"path": "scores.out", "format": "json"})]}
+        with open(self.jobfile, "w") as f:
+            json.dump(spec, f)
+        results = run_job_spec(load_job_spec(self.jobfile))
+        self.assertTrue(results["ok"])
+        text_path, json_path = (result["report"] for result in results["results"])
+        self.assertEqual(text_path, os.path.join(self.tmp.name, "reports", "scores.txt"))
+        with open(text_path) as f:
+            self.assertIn("END OF REPORT", f.read())
+        with open(json_path) as f:
+            self.assertEqual(json.load(f)["descriptive"]["Math"]["statistics"]["count"], 5)
+        with open(self.jobfile, "w") as f:
+            json.dump(dict(self.job, report={"path": "r.txt", "format": "pdf"}), f)
+        with self.assertRaises(ValueError):
+            load_job_spec(self.jobfile)
+
+    def test_cli_batch_exit_codes(self):
+        output = os.path.join(self.tmp.name, "out.json")
+        self.assertEqual(cli_calculator.main(["batch", self.jobfile, "-o", output, "--no-cache"]), 0)
+        with open(output) as f:
+            self.assertTrue(json.load(f)["ok"])
+        reports = os.path.join(self.tmp.name, "reports")
+        self.assertEqual(cli_calculator.main(["batch", self.jobfile, "-o", output, "--no-cache",
+                                              "--report-dir", reports, "--report-format", "json"]), 0)
+        self.assertEqual(os.listdir(reports), ["0001_scores.json"])
+
+        self.job["tests"].append({"type": "paired", "columns": ["Math", "Gender"]})
+        with open(self.jobfile, "w") as f:
+            json.dump(self.job, f)
+        self.assertEqual(cli_calculator.main(["batch", self.jobfile, "-o", output, "--no-cache"]), 1)
+
+        with open(self.jobfile, "w") as f:
+            f.write("{not json")
+        with mock.patch("sys.stderr"):
+            self.assertEqual(cli_calculator.main(["batch", self.jobfile]), 2)
+
+class TestBenchmarkHarness(unittest.TestCase):
+    def test_generator_and_regression_check(self):
+        import benchmark
+        with tempfile.TemporaryDirectory() as tmp:
+            path = benchmark.generate_csv(os.path.join(tmp, "d.csv"), 500, "narrow", dirty=0.1, chunk_rows=128)
+            data = CSVReader.load_columns(path, ["x0"], text_columns=["group"])
+        self.assertEqual(len(data["x0"][0]), 500)
+        self.assertAlmostEqual(data["x0"][1].mean(), 0.9, delta=0.06)
+        self.assertEqual(len(set(data["group"])), 5)
+
+        baseline = {"results": {"narrow/500": {"load": {"seconds": 0.010, "peak_bytes": 1000},
+                                               "tiny": {"seconds": 0.0001, "peak_bytes": 0}}}}
+        current = {"results": {"narrow/500": {"load": {"seconds": 0.014, "peak_bytes": 1100},
+                                              "tiny": {"seconds": 0.0009, "peak_bytes": 0}}}}
+        self.assertEqual(len(benchmark.compare(current, baseline, threshold=0.25)), 1)
+        self.assertEqual(benchmark.compare(current, baseline, threshold=0.5), [])
+
+class TestProfiling(unittest.TestCase):
+    def test_stages_nest_and_count(self):
+        with profiling() as profiler:
+            with stage("outer"):
+                count(rows=10, nbytes=100)
+                StatisticsCalculator([1, 2, "x", 4]).summary()
+                data = np.ones(200000)
+                del data
+        paths = profiler.ordered()
+        self.assertEqual(paths[0], ("outer",))
+        self.assertIn(("outer", "stats_module.StatisticsCalculator._clean"), paths)
+        outer = profiler.stages[("outer",)]
+        self.assertEqual((outer.calls, outer.rows, outer.bytes), (1, 10, 100))
+        self.assertEqual(profiler.stages[("outer", "stats_module.StatisticsCalculator._clean")].rows, 3)
+        self.assertGreaterEqual(outer.peak_bytes, 200000 * 8)
+        self.assertGreaterEqual(profiler.total.peak_bytes, outer.peak_bytes)
+        self.assertIn("(total)", format_profile(profiler))
+
+    def test_threads_keep_separate_stacks(self):
+        import threading
+        import time
+
+        barrier = threading.Barrier(8)
+
+        def work():
+            with stage("outer"):
+                barrier.wait()
+                with stage("inner"):
+                    count(rows=1)
+                    time.sleep(0.01)
+
+        with profiling() as profiler:
+            threads = [threading.Thread(target=work) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(profiler.ordered(), [("outer",), ("outer", "inner")])
+        self.assertEqual(profiler.stages[("outer",)].calls, 8)
+        self.assertEqual(profiler.stages[("outer", "inner")].rows, 8)
+
+    def test_disabled_is_passthrough(self):
+        self.assertIsNone(profile_module.active())
+        with stage("ignored"):
+            count(rows=5)
+        self.assertEqual(StatisticsCalculator([1, 2, 3]).summary()["mean"], 2.0)
+
+    def test_cli_profile_batch(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "d.csv"), "w") as f:
+                f.write("a,b\n1,2\n2,4\n3,7\n")
+            jobfile = os.path.join(tmp, "job.json")
+            with open(jobfile, "w") as f:
+                json.dump({"file": "d.csv", "correlations": [["a", "b"]]}, f)
+            output, stats = os.path.join(tmp, "out.json"), os.path.join(tmp, "run.pstats")
+            with mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+                code = cli_calculator.main(["--profile-out", stats, "batch", jobfile, "-o", output, "--no-cache"])
+            self.assertEqual(code, 0)
+            self.assertIn("file_handler.CSVReader.load_columns", stderr.getvalue())
+            with open(output) as f:
+                profile = json.load(f)["profile"]
+            self.assertIn("correlation_module.CorrelationAnalyzer.pearson_correlation",
+                          [row["stage"] for row in profile["stages"]])
+            import pstats
+            self.assertGreater(pstats.Stats(stats).total_calls, 0)
+        self.assertIsNone(profile_module.active())
+
+class TestWarmServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "scores.csv")
+        with open(self.path, "w") as f:
+            f.write("Math,English,Gender\n78,82,M\n85,79,F\n69,,F\n90,88,M\n")
+        self.job = {"file": self.path, "descriptive": {"columns": ["Math"]},
+                    "correlations": [["Math", "English"]], "tests": [{"type": "chi_square", "column": "Gender"}]}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_store_lru_and_versions(self):
+        store = WarmStore(max_bytes=100)
+        store.put("a", 1, "A", 60)
+        store.put("b", 1, "B", 30)
+        self.assertEqual(store.get("a", 1), "A")  # "b" is now least recently used
+        store.put("c", 1, "C", 30)
+        self.assertIsNone(store.get("b", 1))
+        self.assertEqual(store.get("c", 1), "C")
+        self.assertIsNone(store.get("a", 2))  # Changed file: entry dropped
+        self.assertEqual(store.bytes, 30)
+
+    def test_service_matches_batch_and_caches(self):
+        service = StatsService()
+        expected = run_job_spec({"jobs": [dict(self.job)]})
+        first = json.loads(service.query({"jobs": [self.job]}))
+        self.assertEqual(first, expected)
+        hits = service.store.hits
+        self.assertEqual(json.loads(service.query(self.job)), expected)
+        self.assertGreater(service.store.hits, hits)
+
+        with open(self.path, "a") as f:
+            f.write("60,70,M\n")
+        os.utime(self.path, ns=(0, os.stat(self.path).st_mtime_ns + 1000))
+        updated = json.loads(service.query(self.job))
+        self.assertEqual(updated["results"][0]["descriptive"]["Math"]["count"], 5)
+
+    def test_http_round_trip(self):
+        import http.client
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        token_file = os.path.join(self.tmp.name, "token")
+        server = StatsServer(("127.0.0.1", 0), StatsService(), write_token(token_file), workers=2)
+        self.assertEqual(os.stat(token_file).st_mode & 0o777, 0o600)
+        token = read_token(token_file)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            port = server.server_address[1]
+            with ThreadPoolExecutor(4) as pool:
+                replies = list(pool.map(lambda _: server_request("/query", self.job, port=port, token=token),
+                                        range(8)))
+            self.assertTrue(all(status == 200 and json.loads(body)["ok"] for status, body in replies))
+            self.assertEqual(server_request("/query", {"jobs": 1}, port=port, token=token)[0], 400)
+            self.assertEqual(server_request("/query", self.job, port=port, token="wrong")[0], 401)
+            self.assertEqual(server_request("/shutdown", {}, port=port, token="")[0], 401)
+            self.assertEqual(server_request("/status", port=port, token="wrong")[0], 401)
+            for token_sent, expected in ((token, 413), ("wrong", 401)):
+                # A huge Content-Length with no body: answered at once, without waiting for the body
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+                connection.putrequest("POST", "/query")
+                connection.putheader("X-Stats-Token", token_sent)
+                connection.putheader("Content-Length", str(10 ** 12))
+                connection.endheaders()
+                self.assertEqual(connection.getresponse().status, expected)
+                connection.close()
+            status = json.loads(server_request("/status", port=port, token=token)[1])
+            self.assertEqual(status["queries"], 8)
+            self.assertEqual(server_request("/shutdown", {}, port=port, token=token)[0], 200)
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+class TestLazyImports(unittest.TestCase):
+    def test_scipy_not_loaded_at_import(self):
+        code = ("import sys, cli_calculator, stats_module, correlation_module, hypothesis_module\n"
+                "s = stats_module.StatisticsCalculator([1, 2, 3])\n"
+                "s.mean(); s.variance()\n"
+                "print(sorted(m for m in ('numpy', 'scipy') if m in sys.modules))")
+        here = os.path.dirname(os.path.abspath(__file__))
+        out = subprocess.run([sys.executable, "-c", code], cwd=here, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "['numpy']")
+
+    def test_pearson_fast_path_matches_scipy(self):
+        corr = CorrelationAnalyzer({"X": [1, 2, 4, 7, 3], "Y": [2, 1, 5, 9, 4]}, "X", "Y")
+        r, p = corr.pearson_test()
+        self.assertAlmostEqual(corr.pearson_correlation(), r, places=12)
+        self.assertIsInstance(p, float)
+
 class TestCorrelationAnalyzer(unittest.TestCase):
     def test_pearson_correlation(self):
         data = {
@@ -43,6 +941,81 @@ class TestCorrelationAnalyzer(unittest.TestCase):
         result = corr.pearson_correlation()
         self.assertAlmostEqual(result, 1.0, places=4)
 
+    def test_missing_values_keep_rows_aligned(self):
+        data = {
+            "X": ["1", "2", "", "4", "5"],
+            "Y": ["2", "n/a", "6", "8", "10"]
+        }
+        corr = CorrelationAnalyzer(data, "X", "Y")
+        self.assertEqual(corr.x.tolist(), [1.0, 4.0, 5.0])
+        self.assertEqual(corr.y.tolist(), [2.0, 8.0, 10.0])
+        self.assertAlmostEqual(corr.pearson_correlation(), 1.0, places=6)
+
+    def test_unequal_row_counts(self):
+        with self.assertRaises(ValueError):
+            CorrelationAnalyzer({"X": [1, 2, 3], "Y": [1, 2]}, "X", "Y")
+
+    def test_rank_correlations_match_scipy(self):
+        from scipy.stats import kendalltau, spearmanr
+
+        rng = np.random.default_rng(3)
+        x = rng.integers(0, 10, 500)
+        y = x + rng.integers(0, 6, 500)
+        corr = CorrelationAnalyzer({"X": x, "Y": y}, "X", "Y")
+        self.assertAlmostEqual(corr.correlation("spearman"), spearmanr(x, y).statistic, places=12)
+        self.assertAlmostEqual(corr.correlation("kendall"), kendalltau(x, y).statistic, places=12)
+        with self.assertRaises(ValueError):
+            corr.correlation("distance")
+
+    def test_count_inversions(self):
+        rng = np.random.default_rng(4)
+        for n in (0, 1, 2, 3, 7, 16, 33, 200):
+            codes = rng.integers(0, 5, n)
+            brute = sum(int(codes[i] > codes[j]) for i in range(n) for j in range(i + 1, n))
+            self.assertEqual(count_inversions(codes), brute)
+
+class TestCorrelationMatrix(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            "X": [1, 2, 3, 4, 5, 6],
+            "Y": [2, 4, 6, 8, 10, 12],
+            "Z": [6, 5, 4, 3, 2, 1],
+            "W": [1, 4, 9, 16, "", 36],
+        }
+
+    def test_pearson_matrix(self):
+        matrix = CorrelationMatrix(self.data, ["X", "Y", "Z"], tile_rows=4).pearson()
+        self.assertEqual(matrix.shape, (3, 3))
+        self.assertAlmostEqual(matrix[0, 1], 1.0)
+        self.assertAlmostEqual(matrix[0, 2], -1.0)
+        self.assertTrue(np.allclose(matrix, matrix.T))
+
+    def test_pairwise_complete_rows(self):
+        matrix = CorrelationMatrix(self.data, tile_rows=2).pearson()
+        x = np.array([1, 2, 3, 4, 6])
+        expected = np.corrcoef(x, x ** 2)[0, 1]
+        self.assertAlmostEqual(matrix[0, 3], expected)
+
+    def test_byte_budget_limits_tile(self):
+        tiled = CorrelationMatrix(self.data, tile_bytes=1).pearson()  # One row per tile
+        np.testing.assert_allclose(tiled, CorrelationMatrix(self.data).pearson())
+
+    def test_spearman_matrix(self):
+        matrix = CorrelationMatrix({"X": [1, 2, 3, 4], "Q": [1, 8, 27, 64], "R": [4, 3, 3, 1]}).spearman()
+        self.assertAlmostEqual(matrix[0, 1], 1.0)
+        self.assertAlmostEqual(matrix[0, 2], -0.9486833, places=6)
+
+    def test_kendall_matrix(self):
+        from scipy.stats import kendalltau
+
+        matrix = CorrelationMatrix(self.data).correlation("kendall")
+        self.assertTrue(np.allclose(matrix, matrix.T))
+        self.assertTrue(np.allclose(np.diag(matrix), 1.0))
+        self.assertAlmostEqual(matrix[0, 2], -1.0)
+        x, w = [1, 2, 3, 4, 6], [1, 4, 9, 16, 36]
+        self.assertAlmostEqual(matrix[0, 3], kendalltau(x, w).statistic)
+        self.assertAlmostEqual(kendall_tau_b([1, 2, 2, 3], [1, 3, 2, 2]), kendalltau([1, 2, 2, 3], [1, 3, 2, 2]).statistic)
+
 class TestHypothesisTester(unittest.TestCase):
     def setUp(self):
         self.data = {
@@ -62,12 +1035,87 @@ class TestHypothesisTester(unittest.TestCase):
         self.assertIsInstance(t_stat, float)
         self.assertIsInstance(p_val, float)
 
+    def test_paired_t_test(self):
+        tester = HypothesisTester({"Before": [5, 7, "", 6, 8], "After": [6, 9, 4, 7, ""]})
+        t_stat, p_val = tester.paired_t_test("Before", "After")
+        self.assertAlmostEqual(t_stat, -4.0, places=6)
+        self.assertIsInstance(p_val, float)
+
+    def test_batch_t_tests_match_scipy(self):
+        from scipy.stats import ttest_1samp, ttest_ind, ttest_rel
+        rng = np.random.default_rng(3)
+        data = {f"m{i}": rng.normal(i * 0.5, 1, 40).tolist() for i in range(3)}
+        data["m0"][5] = ""
+        data["Group"] = ["A", "B"] * 20
+        data["Ref"] = rng.normal(0, 1, 40).tolist()
+        tester = HypothesisTester(data)
+
+        rows = tester.batch_t_tests(["m0", "m1", "m2"], popmean=0.2, correction=None)
+        for row in rows:
+            expected = ttest_1samp(tester._clean_column(row["column"]), 0.2)
+            self.assertAlmostEqual(row["statistic"], expected.statistic)
+            self.assertAlmostEqual(row["p_value"], expected.pvalue)
+
+        group = np.array(data["Group"])
+        for row in tester.batch_t_tests(["m1", "m2"], test="welch", group_column="Group"):
+            values = np.array(data[row["column"]])
+            expected = ttest_ind(values[group == "A"], values[group == "B"], equal_var=False)
+            self.assertAlmostEqual(row["statistic"], expected.statistic)
+            self.assertAlmostEqual(row["p_value"], expected.pvalue)
+
+        row = tester.batch_t_tests(["m1"], test="paired", against="Ref")[0]
+        self.assertAlmostEqual(row["statistic"], ttest_rel(data["m1"], data["Ref"]).statistic)
+
+    def test_adjust_p_values(self):
+        p = [0.01, 0.04, 0.03, float("nan")]
+        np.testing.assert_allclose(adjust_p_values(p, "bonferroni")[:3], [0.03, 0.12, 0.09])
+        np.testing.assert_allclose(adjust_p_values(p, "bh")[:3], [0.03, 0.04, 0.04])
+        self.assertTrue(np.isnan(adjust_p_values(p, "bh")[3]))
+
     def test_chi_square(self):
         observed = self.tester.extract_observed_frequencies("Category")
         chi2, p_val = self.tester.chi_square_test(observed)
         self.assertIsInstance(chi2, float)
         self.assertIsInstance(p_val, float)
 
+    def test_chi_square_goodness_of_fit(self):
+        from scipy.stats import chisquare
+        chi2, p_val = self.tester.chi_square_test({"a": 30, "b": 50, "c": 20}, {"a": 0.25, "b": 0.5, "c": 0.25})
+        expected = chisquare([30, 50, 20], [25, 50, 25])
+        self.assertAlmostEqual(chi2, expected.statistic)
+        self.assertAlmostEqual(p_val, expected.pvalue)
+        # A category expected but never observed counts as zero
+        chi2, _ = self.tester.chi_square_test({"a": 10}, {"a": 0.5, "b": 0.5})
+        self.assertAlmostEqual(chi2, 10.0)
+
+    def test_contingency_table_streaming(self):
+        from scipy.stats import chi2_contingency
+        rng = np.random.default_rng(1)
+        rows = rng.choice(["x", "y", "z"], 500).tolist()
+        cols = rng.choice(["p", "q"], 500).tolist()
+        rows[3], cols[7] = "", " "
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cats.csv")
+            with open(path, "w") as f:
+                f.write("R,C\n" + "".join(f"{r},{c}\n" for r, c in zip(rows, cols)))
+            table = ContingencyTable.from_csv(path, "R", "C", chunk_rows=64)
+
+        whole = ContingencyTable.from_columns(rows, cols)
+        halves = ContingencyTable.from_columns(rows[250:], cols[250:])
+        halves.merge(ContingencyTable.from_columns(rows[:250], cols[:250]))
+        for other in (whole, halves):
+            for r in table.row_labels:
+                for c in table.col_labels:
+                    self.assertEqual(table.counts[table.row_codes[r], table.col_codes[c]],
+                                     other.counts[other.row_codes[r], other.col_codes[c]])
+        self.assertEqual(table.total, 498)
+
+        chi2, p_val, dof = self.tester.chi_square_independence(table)
+        expected = chi2_contingency(table.counts)
+        self.assertAlmostEqual(chi2, expected[0])
+        self.assertAlmostEqual(p_val, expected[1])
+        self.assertEqual(dof, 2)
+
 if __name__ == '__main__':
     unittest.main()
 